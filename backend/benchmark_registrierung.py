@@ -0,0 +1,94 @@
+"""
+Benchmark Registrierungs-Durchsatz: alter Ablauf (register + login) gegen
+register_mit_token (Token direkt aus dem neuen Kunden, nur ein bcrypt-Hash).
+
+Legt Kunden mit E-Mails 'bench-<lauf>-<n>@benchmark.invalid' an und löscht sie danach.
+Aufruf: cd backend && python benchmark_registrierung.py [anzahl] [threads]
+"""
+
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from database import SessionLocal
+from models.adresse import Adresse
+from models.kunde import Kunde
+from services.auth_service import AuthService
+from core.security import passwort_pool
+
+PASSWORT = "benchmark-passwort"
+
+
+def _daten(email: str) -> dict:
+    return {
+        "vorname": "Bench",
+        "nachname": "Mark",
+        "email": email,
+        "password": PASSWORT,
+        "strasse": "Teststraße",
+        "hausnummer": "1",
+        "plz": "12345",
+        "stadt": "Teststadt"
+    }
+
+
+def _alt(email: str):
+    db = SessionLocal()
+    try:
+        svc = AuthService(db)
+        svc.register(**_daten(email))
+        svc.login(login_type="kunde", email=email, password=PASSWORT)
+    finally:
+        db.close()
+
+
+def _neu(email: str):
+    db = SessionLocal()
+    try:
+        AuthService(db).register_mit_token(**_daten(email))
+    finally:
+        db.close()
+
+
+def _messen(name: str, funktion, anzahl: int, threads: int) -> float:
+    lauf = uuid.uuid4().hex[:8]
+    emails = [f"bench-{lauf}-{n}@benchmark.invalid" for n in range(anzahl)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(funktion, emails))
+    dauer = time.perf_counter() - start
+
+    print(f"{name:<22} {anzahl} Registrierungen in {dauer:6.2f}s  ->  {anzahl / dauer:6.1f}/s")
+    return dauer
+
+
+def _aufraeumen():
+    db = SessionLocal()
+    try:
+        kunden = db.query(Kunde.kundenid, Kunde.adressid).filter(Kunde.email.like("bench-%@benchmark.invalid")).all()
+        db.query(Kunde).filter(Kunde.kundenid.in_([k.kundenid for k in kunden])).delete(synchronize_session=False)
+        db.query(Adresse).filter(Adresse.adresseid.in_([k.adressid for k in kunden])).delete(synchronize_session=False)
+        db.commit()
+        print(f"{len(kunden)} Benchmark-Kunden gelöscht")
+    finally:
+        db.close()
+
+
+def benchmark(anzahl: int = 50, threads: int = 8):
+    try:
+        alt = _messen("register + login", _alt, anzahl, threads)
+        neu = _messen("register_mit_token", _neu, anzahl, threads)
+        print(f"Faktor: {alt / neu:.2f}x")
+        print(f"Passwort-Pool: {passwort_pool.metriken()}")
+    finally:
+        _aufraeumen()
+        passwort_pool.beenden()
+
+
+if __name__ == "__main__":
+    benchmark(
+        anzahl=int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        threads=int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -22,8 +22,8 @@ def register_kunde(payload: RegisterRequest, db: Session = Depends(get_db)):
     """
     svc = AuthService(db)
 
-    # Kunde registrieren (Adresse wird automatisch erstellt)
-    kunde = svc.register(
+    # Kunde registrieren (Adresse wird automatisch erstellt), Token direkt aus dem neuen Kunden
+    result = svc.register_mit_token(
         vorname=payload.vorname,
         nachname=payload.nachname,
         email=payload.email,
@@ -38,14 +38,7 @@ def register_kunde(payload: RegisterRequest, db: Session = Depends(get_db)):
         namenskuerzel=payload.namenskuerzel
     )
 
-    # Automatisch einloggen nach Registrierung
-    login_result = svc.login(
-        login_type="kunde",
-        email=payload.email,
-        password=payload.password
-    )
-
-    return TokenResponse(**login_result)
+    return TokenResponse(**result)
 
 
 @router.post("/register/restaurant", response_model=TokenResponse, status_code=201)
@@ -55,8 +48,8 @@ def register_restaurant(payload: RestaurantRegisterRequest, db: Session = Depend
     """
     svc = AuthService(db)
 
-    # Restaurant registrieren (Adresse wird automatisch erstellt)
-    restaurant = svc.register_restaurant(
+    # Restaurant registrieren (Adresse wird automatisch erstellt), Token direkt aus dem neuen Restaurant
+    result = svc.register_restaurant_mit_token(
         name=payload.name,
         email=payload.email,
         password=payload.password,
@@ -70,14 +63,7 @@ def register_restaurant(payload: RestaurantRegisterRequest, db: Session = Depend
         kuechenchef=payload.kuechenchef
     )
 
-    # Automatisch einloggen nach Registrierung
-    login_result = svc.login(
-        login_type="restaurant",
-        email=payload.email,
-        password=payload.password
-    )
-
-    return TokenResponse(**login_result)
+    return TokenResponse(**result)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -99,38 +85,14 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
 @router.get("/me", response_model=MeResponse)
 async def get_current_user_info(current_user = Depends(get_current_user)):
     """
-    Informationen über aktuell eingeloggten User
+    Informationen über aktuell eingeloggten User (Rolle aus dem gecachten Principal)
     """
-    user_type = getattr(current_user, 'user_type', None)
-
-    if user_type == "kunde":
-        from models.kritiker import Kritiker
-        from database import get_db
-
-        db = next(get_db())
-        is_kritiker = db.query(Kritiker).filter(Kritiker.kundenid == current_user.kundenid).first() is not None
-        role = "kritiker" if is_kritiker else "kunde"
-
-        return MeResponse(
-            user_id=current_user.kundenid,
-            user_type="kunde",
-            role=role,
-            email=current_user.email
-        )
-
-    elif user_type == "restaurant":
-        return MeResponse(
-            user_id=current_user.restaurantid,
-            user_type="restaurant",
-            role="restaurant",
-            email=current_user.email
-        )
-
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Unknown user type"
-        )
+    return MeResponse(
+        user_id=current_user.id,
+        user_type=current_user.user_type,
+        role=current_user.role,
+        email=current_user.email
+    )
 
 
 @router.post("/logout")
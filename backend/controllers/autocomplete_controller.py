@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from database import get_db
+from services.autocomplete_service import AutocompleteService, TYPEN
+from schemas.autocomplete_schema import AutocompleteVorschlag
+
+router = APIRouter(prefix="/api/autocomplete", tags=["autocomplete"])
+
+
+@router.get("/", response_model=List[AutocompleteVorschlag])
+def autocomplete(
+        q: str = Query(..., min_length=1, max_length=100),
+        limit: int = Query(8, ge=1, le=25),
+        typ: Optional[List[str]] = Query(None, description="gericht, restaurant, kochstil, label"),
+        db: Session = Depends(get_db)
+):
+    """Prefix-Vorschläge über Gerichte, Restaurants, Kochstile und Labels, nach Beliebtheit sortiert"""
+    if typ:
+        unbekannt = set(typ) - set(TYPEN)
+        if unbekannt:
+            raise HTTPException(status_code=400, detail=f"Unbekannter Typ: {', '.join(sorted(unbekannt))}")
+    return AutocompleteService(db).vorschlaege(q, limit=limit, typen=typ)
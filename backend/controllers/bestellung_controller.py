@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Dict
 from database import get_db
 from schemas import bestellung_schemas as schemas
 from services.bestellung_services import BestellungService
+from services.bestellung_event_service import BestellungEventService
 
 router = APIRouter(prefix="/api/bestellungen", tags=["bestellungen"])
 
@@ -15,6 +17,79 @@ def get_all_bestellung(db: Session = Depends(get_db)):
 def get_bestellungen_by_kunde(kundenid: int, db: Session = Depends(get_db)):
     return BestellungService(db).get_by_kunde(kundenid)
 
+@router.get("/kunde/{kundenid}/historie", response_model=schemas.BestellungHistorieSeite)
+def get_bestellhistorie(
+        kundenid: int,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite"),
+        status: Optional[List[str]] = Query(None, description="z.B. zugestellt, storniert"),
+        db: Session = Depends(get_db)
+):
+    """Bestellhistorie seitenweise, neueste zuerst, mit Restaurantname, Artikelanzahl und Gesamtpreis"""
+    try:
+        return BestellungService(db).get_historie_seite(kundenid, limit=limit, cursor=cursor, status=status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+MAX_BULK_IDS = 500
+
+# GET /api/bestellungen/restaurant/{restaurantid}/aenderungen?seit=0 - Änderungs-Queue per change_seq
+@router.get("/restaurant/{restaurantid}/aenderungen", response_model=schemas.BestellungAenderungenSeite)
+def get_bestellung_aenderungen(
+        restaurantid: int,
+        seit: int = Query(0, ge=0, description="cursor der vorherigen Antwort"),
+        status: Optional[List[str]] = Query(None, description="z.B. bestellt, in_zubereitung"),
+        limit: int = Query(100, ge=1, le=500),
+        db: Session = Depends(get_db)
+):
+    """
+    Neue und geänderte Bestellungen seit dem Cursor, aufsteigend nach change_seq.
+    Mit dem zurückgegebenen cursor erneut aufrufen, solange has_more gesetzt ist.
+    """
+    return BestellungService(db).get_aenderungen(restaurantid, seit=seit, status=status, limit=limit)
+
+# GET /api/bestellungen/restaurant/{restaurantid}/stream - Live-Updates per Server-Sent Events
+@router.get("/restaurant/{restaurantid}/stream")
+async def stream_bestellungen(
+        restaurantid: int,
+        cursor: Optional[int] = Query(None, description="Letzte empfangene Event-ID (change_seq)"),
+        last_event_id: Optional[int] = Header(None),
+):
+    """
+    Neue und geänderte Bestellungen eines Restaurants als text/event-stream.
+    Nach einem Abbruch setzt EventSource automatisch per Last-Event-ID fort.
+    """
+    return StreamingResponse(
+        BestellungEventService.stream(restaurantid, last_event_id if last_event_id is not None else cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# GET /api/bestellungen/totals?ids=1&ids=2 - Gesamtpreise vieler Bestellungen
+# WICHTIG: Muss VOR /{bestellungid} stehen!
+@router.get("/totals", response_model=Dict[int, float])
+def get_order_totals(
+        ids: List[int] = Query(..., description="Bestellungs-IDs"),
+        db: Session = Depends(get_db)
+):
+    """Gesamtpreise als {bestellungid: summe} in einer gruppierten Query"""
+    if len(ids) > MAX_BULK_IDS:
+        raise HTTPException(status_code=400, detail=f"Maximal {MAX_BULK_IDS} IDs pro Anfrage")
+    return BestellungService(db).calculate_totals(ids)
+
+# GET /api/bestellungen/details?ids=1&ids=2 - Details vieler Bestellungen
+# WICHTIG: Muss VOR /{bestellungid} stehen!
+@router.get("/details", response_model=List[schemas.BestellungDetailResponse])
+def get_bestellungen_details(
+        ids: List[int] = Query(..., description="Bestellungs-IDs"),
+        db: Session = Depends(get_db)
+):
+    """Details wie /{bestellungid}/details für viele Bestellungen (Warenkörbe werden übersprungen)"""
+    if len(ids) > MAX_BULK_IDS:
+        raise HTTPException(status_code=400, detail=f"Maximal {MAX_BULK_IDS} IDs pro Anfrage")
+    details = BestellungService(db).get_details_bulk(ids)
+    return [d for d in details if d["status"] != "warenkorb"]
+
 # WICHTIG: Dieser neue Endpunkt muss VOR /{bestellungid} stehen!
 @router.get("/{bestellungid}/details", response_model=schemas.BestellungDetailResponse)
 def get_bestellung_details(bestellungid: int, db: Session = Depends(get_db)):
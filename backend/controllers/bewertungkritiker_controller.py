@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List
 
 from database import get_db
+from core.security import get_current_kritiker
 from services.bewertungkritiker_service import BewertungkritikerService
 from schemas.bewertungkritiker_schema import BewertungkritikerCreate, BewertungkritikerUpdate, BewertungkritikerResponse
 
@@ -36,10 +37,14 @@ def get_bewertungkritiker(bewertungkritiker_id: int, db: Session = Depends(get_d
 @router.post("/", response_model=BewertungkritikerResponse, status_code=status.HTTP_201_CREATED)
 def create_bewertungkritiker(
     bewertungkritiker: BewertungkritikerCreate,
+    claims: Dict[str, Any] = Depends(get_current_kritiker),
     db: Session = Depends(get_db)
 ):
     service = BewertungkritikerService(db)
-    new_bewertungkritiker = service.create(bewertungkritiker.model_dump())
+    new_bewertungkritiker = service.create({
+        **bewertungkritiker.model_dump(),
+        "kritikerid": claims["kritikerid"]
+    })
     return new_bewertungkritiker
 
 # PUT /api/bewertungkritikers/{id} - Update bewertungkritiker
@@ -47,12 +52,14 @@ def create_bewertungkritiker(
 def update_bewertungkritiker(
     bewertungkritiker_id: int,
     bewertungkritiker_update: BewertungkritikerUpdate,
+    claims: Dict[str, Any] = Depends(get_current_kritiker),
     db: Session = Depends(get_db)
 ):
     service = BewertungkritikerService(db)
     updated_bewertungkritiker = service.update(
         bewertungkritiker_id,
-        bewertungkritiker_update.model_dump(exclude_unset=True)
+        bewertungkritiker_update.model_dump(exclude_unset=True),
+        kritikerid=claims["kritikerid"]
     )
     
     if not updated_bewertungkritiker:
@@ -65,9 +72,13 @@ def update_bewertungkritiker(
 
 # DELETE /api/bewertungkritikers/{id} - Delete bewertungkritiker
 @router.delete("/{bewertungkritiker_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_bewertungkritiker(bewertungkritiker_id: int, db: Session = Depends(get_db)):
+def delete_bewertungkritiker(
+    bewertungkritiker_id: int,
+    claims: Dict[str, Any] = Depends(get_current_kritiker),
+    db: Session = Depends(get_db)
+):
     service = BewertungkritikerService(db)
-    success = service.delete(bewertungkritiker_id)
+    success = service.delete(bewertungkritiker_id, kritikerid=claims["kritikerid"])
     
     if not success:
         raise HTTPException(
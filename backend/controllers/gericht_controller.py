@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 
 from services.gericht_service import GerichtService
 from services.labelGericht_service import LabelGerichtService
+from services.facetten_service import FacettenService
 from schemas import gericht_schema as schemas
 from database import get_db
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(prefix="/api/gericht", tags=["gericht"])
 
@@ -16,16 +17,48 @@ def get_all_gericht(db: Session = Depends(get_db)):
 # NEU: Search-Endpoint MUSS vor /{gerichtid} stehen!
 @router.get("/search", response_model=List[schemas.GerichtSearchResponse])
 def search_gerichte(
+        response: Response,
         q: str = Query(..., min_length=1, description="Suchbegriff"),
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
         db: Session = Depends(get_db)
 ):
     """
-    Sucht Gerichte nach Name, Beschreibung oder Kategorie
-    Gibt Restaurant-Informationen mit zurück
+    Sucht Gerichte nach Name, Beschreibung, Kategorie oder Restaurantname
+    Relevanz-sortiert aus dem In-Memory-Index, Gesamtanzahl im Header X-Total-Count
     """
     service = GerichtService(db)
-    results = service.search_with_restaurant(q)
-    return results
+    results = service.search_with_restaurant(q, limit=limit, offset=offset)
+    response.headers["X-Total-Count"] = str(results["total"])
+    return results["items"]
+
+@router.get("/facetten", response_model=schemas.GerichtFacettenResponse)
+def filter_gerichte(
+        label: Optional[List[int]] = Query(None, description="Label-IDs"),
+        label_modus: str = Query("und", description="und = alle Labels, oder = mindestens eins"),
+        kategorie: Optional[List[str]] = Query(None),
+        kochstil: Optional[List[int]] = Query(None, description="Kochstil-IDs des Restaurants"),
+        preis: Optional[List[str]] = Query(None, description="bis_8, 8_12, 12_20, ab_20"),
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+        db: Session = Depends(get_db)
+):
+    """
+    Kombinierte Filter (z.B. vegan + Italienisch + bis 12 €) inkl. Trefferzahlen
+    pro Facettenwert für die Browse-Seite - ein Aufruf statt einer Query pro Filter
+    """
+    try:
+        return FacettenService(db).filtern(
+            label_ids=label,
+            label_modus=label_modus,
+            kategorien=kategorie,
+            kochstil_ids=kochstil,
+            preis_stufen=preis,
+            limit=limit,
+            offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{gerichtid}", response_model=schemas.GerichtResponse)
 def get_by_id(gerichtid: int, db: Session = Depends(get_db)):
@@ -33,7 +66,7 @@ def get_by_id(gerichtid: int, db: Session = Depends(get_db)):
 
 @router.get("/byLabelId/{labelid}", response_model=List[schemas.GerichtResponse])
 def get_by_label_id(labelid: int, db: Session = Depends(get_db)):
-    label_gerichte = LabelGerichtService(db).get_by_gericht_id(labelid)
+    label_gerichte = LabelGerichtService(db).get_by_label_id(labelid)
     gericht_ids = [lg.gerichtid for lg in label_gerichte]
     return GerichtService(db).get_by_id_list(gericht_ids)
 
@@ -169,7 +169,7 @@ def delete_kunde(kunden_id: int, db: Session = Depends(get_db)):
 @router.get("/email/{email}", response_model=KundeResponse)
 def search_kunde_by_email(email: str, db: Session = Depends(get_db)):
     service = KundeService(db)
-    kunde = service.search_by_email(email)
+    kunde = service.get_by_email(email)
 
     if not kunde:
         raise HTTPException(
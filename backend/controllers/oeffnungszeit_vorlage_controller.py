@@ -1,10 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List
 from database import get_db
 from services.oeffnungszeit_vorlage_service import OeffnungszeitVorlageService
 from schemas.oeffnungszeit_vorlage_schema import OeffnungszeitVorlageCreate, OeffnungszeitVorlageUpdate, OeffnungszeitVorlageResponse
-from utils.opening_hours_hash import generate_opening_hours_hash
 
 router = APIRouter(
     prefix="/api/oeffnungszeit-vorlagen",
@@ -39,29 +38,16 @@ def create_vorlage_with_hash(data: dict, db: Session = Depends(get_db)):
 
 # POST /api/oeffnungszeit-vorlagen/update-all-hashes
 @router.post("/update-all-hashes", status_code=200)
-def update_all_hashes(db: Session = Depends(get_db)):
-    """Einmaliges Update aller Vorlagen mit Hashes"""
-    from services.oeffnungszeit_detail_service import OeffnungszeitDetailService
-
+def update_all_hashes(
+        alle: bool = Query(False, description="Auch vorhandene, veraltete Hashes neu schreiben"),
+        db: Session = Depends(get_db)
+):
+    """
+    Hashes aller Vorlagen in einem Durchlauf berechnen (ein Cursor, ein UPDATE)
+    und Vorlagen mit identischen Öffnungszeiten als Duplikat-Gruppen melden
+    """
     service = OeffnungszeitVorlageService(db)
-    detail_service = OeffnungszeitDetailService(db)
-
-    vorlagen = service.get_all()
-    updated = 0
-
-    for vorlage in vorlagen:
-        if not vorlage.hash_signatur:
-            details = detail_service.get_by_vorlage_id(vorlage.oeffnungszeitid)
-            if details:
-                details_list = [{"wochentag": d.wochentag, "oeffnungszeit": d.oeffnungszeit,
-                                 "schliessungszeit": d.schliessungszeit, "ist_geschlossen": d.ist_geschlossen}
-                                for d in details]
-                hash_sig = generate_opening_hours_hash(details_list)
-                vorlage.hash_signatur = hash_sig
-                updated += 1
-
-    db.commit()
-    return {"updated": updated}
+    return service.hashes_neu_berechnen(alle=alle)
 
 # parametrisierten Routen
 
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Dict
+from datetime import datetime
 
 from database import get_db
 from services.restaurant_service import RestaurantService
 from services.restaurant_oeffnungszeit_service import RestaurantOeffnungszeitService
+from services.bewertung_aggregat_service import leere_bewertungen
+from services.menue_snapshot_service import MenueSnapshotService
+from services.oeffnungszeit_index_service import OeffnungszeitIndexService
 from schemas.restaurant_schema import (
     RestaurantCreate,
     RestaurantUpdate,
@@ -15,7 +19,10 @@ from schemas.restaurant_schema import (
     RestaurantOpeningProfileResponse,
     RestaurantBewertungenResponse,
     GerichtHighlightSchema,
-    CustomerFavoriteSchema
+    CustomerFavoriteSchema,
+    RestaurantSeiteResponse,
+    RestaurantHighlightsSchema,
+    OeffnungsstatusSchema
 )
 
 router = APIRouter(
@@ -23,119 +30,153 @@ router = APIRouter(
     tags=["restaurants"]
 )
 
+def _listen_eintrag(r, bewertungen: dict) -> dict:
+    """Restaurant-Karte für Listen (Kochstile müssen eager geladen sein)"""
+    return {
+        "restaurantid": r.restaurantid,
+        "name": r.name,
+        "klassifizierung": r.klassifizierung,
+        "adresseid": r.adresseid,
+        "telefon": r.telefon,
+        "kuechenchef": r.kuechenchef,
+        "email": r.email,
+        "kochstil": [
+            {
+                "stilid": kr.kochstil.stilid,
+                "kochstil": kr.kochstil.kochstil,
+            } for kr in r.kochstil
+        ] if r.kochstil else [],
+        "bewertungen": bewertungen
+    }
+
+
 # GET /api/restaurants - Get all restaurants WITH kochstil AND bewertungen
-# 🚀 OPTIMIERT: Bulk-Bewertungen statt N+1 Queries
+# 🚀 OPTIMIERT: Bewertungen aus vorberechneten Aggregaten statt Rohdaten-Scan
 @router.get("/")
 def get_all_restaurants(db: Session = Depends(get_db)):
     service = RestaurantService(db)
-    restaurants = service.get_all()
+    restaurants = service.get_all_with_kochstil()
 
-    # 🚀 Hole ALLE Bewertungen auf einmal (3 Queries statt N Queries!)
+    # 🚀 Ein PK-Lookup auf bewertung_aggregat_restaurant für alle Restaurants
     restaurant_ids = [r.restaurantid for r in restaurants]
     bulk_bewertungen = service.get_bulk_bewertungen_aggregiert(restaurant_ids)
 
-    result = []
-    for r in restaurants:
-        # Bewertungen aus dem Bulk-Result holen (kein DB-Query mehr!)
-        bewertungen = bulk_bewertungen.get(r.restaurantid, {
-            "durchschnitt_gesamt": 0.0,
-            "anzahl_gesamt": 0,
-            "anzahl_kunden": 0,
-            "anzahl_kritiker": 0,
-            "durchschnitt_kunden": None,
-            "durchschnitt_kritiker": None
-        })
-
-        result.append({
-            "restaurantid": r.restaurantid,
-            "name": r.name,
-            "klassifizierung": r.klassifizierung,
-            "adresseid": r.adresseid,
-            "telefon": r.telefon,
-            "kuechenchef": r.kuechenchef,
-            "email": r.email,
-            "kochstil": [
-                {
-                    "stilid": kr.kochstil.stilid,
-                    "kochstil": kr.kochstil.kochstil,
-                } for kr in r.kochstil
-            ] if r.kochstil else [],
-            "bewertungen": bewertungen
-        })
-
-    return result
+    return [
+        _listen_eintrag(r, bulk_bewertungen.get(r.restaurantid) or leere_bewertungen())
+        for r in restaurants
+    ]
+
+
+# GET /api/restaurants/seite - Paginated + filtered restaurant list
+# WICHTIG: Muss VOR /{restaurantid} stehen!
+@router.get("/seite", response_model=RestaurantSeiteResponse)
+def get_restaurant_seite(
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite"),
+        sortierung: str = Query("name", description="name oder rating"),
+        kochstil: Optional[List[int]] = Query(None, description="Kochstil-IDs (ODER-verknüpft)"),
+        postleitzahl: Optional[str] = None,
+        ort: Optional[str] = None,
+        min_bewertung: Optional[float] = Query(None, ge=0, le=5),
+        klassifizierung: Optional[str] = None,
+        offen: bool = Query(False, description="Nur jetzt geöffnete Restaurants"),
+        db: Session = Depends(get_db)
+):
+    service = RestaurantService(db)
+    try:
+        seite = service.get_seite(
+            limit=limit,
+            cursor=cursor,
+            sortierung=sortierung,
+            kochstil_ids=kochstil,
+            postleitzahl=postleitzahl,
+            ort=ort,
+            min_bewertung=min_bewertung,
+            klassifizierung=klassifizierung,
+            nur_offen=offen
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "items": [_listen_eintrag(r, bewertungen) for r, bewertungen in seite["items"]],
+        "next_cursor": seite["next_cursor"],
+        "has_more": seite["has_more"]
+    }
+
+
+# GET /api/restaurants/offen?zeitpunkt=2025-01-10T19:30 - IDs der geöffneten Restaurants
+# WICHTIG: Muss VOR /{restaurantid} stehen!
+@router.get("/offen", response_model=List[int])
+def get_offene_restaurants(
+        zeitpunkt: Optional[datetime] = Query(None, description="Standard: jetzt (Serverzeit)"),
+        db: Session = Depends(get_db)
+):
+    """Alle zum Zeitpunkt geöffneten Restaurants - ein Bitmap-Test pro Restaurant"""
+    return OeffnungszeitIndexService(db).offen(zeitpunkt)
+
+
+# GET /api/restaurants/oeffnungsstatus?ids=1&ids=2 - "öffnet um 17:00" / "schließt in 20 Min" für Listen-Karten
+# WICHTIG: Muss VOR /{restaurantid} stehen!
+@router.get("/oeffnungsstatus", response_model=Dict[int, OeffnungsstatusSchema])
+def get_oeffnungsstatus_bulk(
+        ids: List[int] = Query(..., description="Restaurant-IDs"),
+        zeitpunkt: Optional[datetime] = Query(None, description="Standard: jetzt (Serverzeit)"),
+        db: Session = Depends(get_db)
+):
+    """
+    Offen/zu sowie nächste Öffnung und Schließung für mehrere Restaurants,
+    aufgelöst aus dem Öffnungszeiten-Index (kein Detail-Laden pro Restaurant)
+    """
+    if len(ids) > 500:
+        raise HTTPException(status_code=400, detail="Maximal 500 Restaurants pro Abfrage")
+
+    return OeffnungszeitIndexService(db).status(dict.fromkeys(ids), zeitpunkt)
+
+
+# GET /api/restaurants/highlights?ids=1&ids=2 - Highlights + Favorites for many restaurants
+# WICHTIG: Muss VOR /{restaurantid} stehen!
+@router.get("/highlights", response_model=Dict[int, RestaurantHighlightsSchema])
+def get_highlights_bulk(
+        ids: List[int] = Query(..., description="Restaurant-IDs"),
+        limit: int = Query(3, ge=1, le=10),
+        db: Session = Depends(get_db)
+):
+    """
+    Kritiker-Highlights und Customer-Favorites für mehrere Restaurants in einem Query
+    """
+    if len(ids) > 100:
+        raise HTTPException(status_code=400, detail="Maximal 100 Restaurants pro Abfrage")
+
+    service = RestaurantService(db)
+    return service.get_highlights_bulk(list(dict.fromkeys(ids)), limit=limit)
 
 
 # GET /api/restaurants/{id} - Get specific restaurant WITH menu AND address
+# 🚀 OPTIMIERT: Vorserialisierter Menü-Snapshot (1 PK-Lookup) mit ETag
 @router.get("/{restaurantid}")
 def get_restaurant(
         restaurantid: int,
+        if_none_match: Optional[str] = Header(None),
         db: Session = Depends(get_db)
 ):
-    service = RestaurantService(db)
-    restaurant = service.get_by_id_with_menu(restaurantid)
+    service = MenueSnapshotService(db)
+    snapshot = service.get_or_build(restaurantid)
 
-    if not restaurant:
+    if not snapshot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Restaurant with id {restaurantid} not found"
         )
 
-    return {
-        "restaurantid": restaurant.restaurantid,
-        "name": restaurant.name,
-        "klassifizierung": restaurant.klassifizierung,
-        "adresseid": restaurant.adresseid,
-        "telefon": restaurant.telefon,
-        "kuechenchef": restaurant.kuechenchef,
-        "email": restaurant.email,
-        "adresse": {
-            "adresseid": restaurant.adresse.adresseid,
-            "straße": restaurant.adresse.straße,
-            "hausnummer": restaurant.adresse.hausnummer,
-            "postleitzahl": restaurant.adresse.postleitzahl,
-            "ort": restaurant.adresse.ort,
-            "land": restaurant.adresse.land
-        } if restaurant.adresse else None,
+    version, dokument = snapshot
+    etag = service.etag(restaurantid, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
-        "kochstil": [
-            {
-                "stilid": kr.kochstil.stilid,
-                "kochstil": kr.kochstil.kochstil,
-            } for kr in restaurant.kochstil
-        ] if restaurant.kochstil else [],
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        "menue": [
-            {
-                "menuid": menu.menuid,
-                "name": menu.name,
-                "restaurantid": menu.restaurantid,
-                "gericht": [
-                    {
-                        "gerichtid": gericht.gerichtid,
-                        "menuid": gericht.menuid,
-                        "name": gericht.name,
-                        "beschreibung": gericht.beschreibung,
-                        "kategorie": gericht.kategorie,
-                        "preis": [
-                            {
-                                "preisid": preis.preisid,
-                                "betrag": float(preis.betrag) if preis.betrag else 0.0,
-                                "gerichtid": preis.gerichtid,
-                                "gueltigvon": preis.gueltigvon.isoformat() if preis.gueltigvon else None,
-                                "gueltigbis": preis.gueltigbis.isoformat() if preis.gueltigbis else None,
-                                "preistyp": preis.preistyp,
-                                "istaktiv": preis.istaktiv
-                            } for preis in (gericht.preis if hasattr(gericht, 'preis') else [])
-                        ]
-                    } for gericht in (
-                        [g for g in menu.gericht if getattr(g, "ist_aktiv", True)]
-                        if hasattr(menu, "gericht") and menu.gericht else []
-                    )
-                ]
-            } for menu in (restaurant.menue if hasattr(restaurant, 'menue') else [])
-        ]
-    }
+    return Response(content=dokument, media_type="application/json", headers=headers)
 
 
 # POST /api/restaurants - Create new restaurant
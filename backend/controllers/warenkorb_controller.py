@@ -1,13 +1,16 @@
 # controllers/warenkorb_controller.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
+from typing import Optional
 from database import get_db
 from services.warenkorb_service import WarenkorbService
+from services.idempotenz_service import IdempotenzService, IdempotenzKonflikt
 from schemas.warenkorb_schema import (
     AddItemRequest,
     UpdateQuantityRequest,
     UpdateSpecialRequestRequest,
     CheckoutRequest,
+    CartBatchRequest,
     CartResponse
 )
 
@@ -16,6 +19,8 @@ router = APIRouter(
     tags=["warenkorb"]
 )
 
+IdempotencyKey = Header(None, max_length=255, description="Retries with the same key return the stored response")
+
 # GET /api/warenkorb/{kundenid} - Get cart
 @router.get("/{kundenid}", response_model=CartResponse)
 def get_cart(kundenid: int, db: Session = Depends(get_db)):
@@ -28,19 +33,46 @@ def get_cart(kundenid: int, db: Session = Depends(get_db)):
 def add_item(
         kundenid: int,
         item: AddItemRequest,
+        idempotency_key: Optional[str] = IdempotencyKey,
         db: Session = Depends(get_db)
 ):
     """Add item to cart"""
     service = WarenkorbService(db)
     try:
-        return service.add_item(
-            kundenid=kundenid,
-            restaurantid=item.restaurantid,
-            gerichtid=item.gerichtid,
-            preisid=item.preisid,
-            menge=item.menge,
-            aenderungswunsch=item.aenderungswunsch
+        return IdempotenzService(db).ausfuehren(
+            kundenid, "items", idempotency_key, item.model_dump(),
+            lambda: service.add_item(
+                kundenid=kundenid,
+                restaurantid=item.restaurantid,
+                gerichtid=item.gerichtid,
+                preisid=item.preisid,
+                menge=item.menge,
+                aenderungswunsch=item.aenderungswunsch
+            )
+        )
+    except IdempotenzKonflikt as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# POST /api/warenkorb/{kundenid}/items/batch - Several changes in one transaction
+@router.post("/{kundenid}/items/batch", response_model=CartResponse)
+def apply_batch(
+        kundenid: int,
+        batch: CartBatchRequest,
+        idempotency_key: Optional[str] = IdempotencyKey,
+        db: Session = Depends(get_db)
+):
+    """Apply add/quantity/notes/remove operations atomically, returns the updated cart"""
+    service = WarenkorbService(db)
+    operationen = [operation.model_dump() for operation in batch.operationen]
+    try:
+        return IdempotenzService(db).ausfuehren(
+            kundenid, "items/batch", idempotency_key, {"operationen": operationen},
+            lambda: service.apply_operations(kundenid, operationen)
         )
+    except IdempotenzKonflikt as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -97,11 +129,13 @@ def clear_cart(kundenid: int, db: Session = Depends(get_db)):
 def checkout(
         kundenid: int,
         checkout_data: CheckoutRequest,
+        idempotency_key: Optional[str] = IdempotencyKey,
         db: Session = Depends(get_db)
 ):
-    """Convert cart to order"""
+    """Convert cart to order; a retried request with the same Idempotency-Key returns the first order"""
     service = WarenkorbService(db)
-    try:
+
+    def ausfuehren():
         order = service.checkout(
             kundenid=kundenid,
             adressid=checkout_data.adressid,
@@ -112,5 +146,12 @@ def checkout(
             "bestellungid": order.bestellungid,
             "status": order.status
         }
+
+    try:
+        return IdempotenzService(db).ausfuehren(
+            kundenid, "checkout", idempotency_key, checkout_data.model_dump(), ausfuehren
+        )
+    except IdempotenzKonflikt as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -10,10 +10,13 @@ from .security import (
     create_access_token,
     decode_token,
     get_current_claims,
+    get_current_kritiker,
     get_current_user,
     get_current_kunde,
     get_current_restaurant,
-    get_current_active_admin
+    get_current_active_admin,
+    Principal,
+    principal_invalidieren
 )
 
 __all__ = [
@@ -23,8 +26,11 @@ __all__ = [
     "create_access_token",
     "decode_token",
     "get_current_claims",
+    "get_current_kritiker",
     "get_current_user",
     "get_current_kunde",
     "get_current_restaurant",
-    "get_current_active_admin"
+    "get_current_active_admin",
+    "Principal",
+    "principal_invalidieren"
 ]
@@ -3,10 +3,12 @@ Core Security Module
 Zentrale Funktionen für Authentifizierung, Password-Hashing und JWT-Tokens
 """
 
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -14,6 +16,8 @@ import os
 from dotenv import load_dotenv
 
 from database import get_db
+from utils.passwort_pool import PasswortPool, PasswortPoolUeberlastet
+from utils.ttl_cache import TTLCache
 
 load_dotenv()
 
@@ -22,15 +26,33 @@ JWT_SECRET = os.getenv("SECRET_KEY", "CHANGE_ME_IN_PRODUCTION")
 JWT_ALG = "HS256"
 JWT_EXPIRE_MIN = 60 * 24  # 1 Tag
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 bearer = HTTPBearer(auto_error=True)
 
+# bcrypt läuft in eigenen Prozessen, damit Login-Spitzen den Request-Threadpool nicht blockieren
+passwort_pool = PasswortPool(
+    groesse=int(os.getenv("PASSWORT_POOL_GROESSE", str(os.cpu_count() or 2))),
+    queue_groesse=int(os.getenv("PASSWORT_POOL_QUEUE", "32")),
+    queue_timeout=float(os.getenv("PASSWORT_POOL_QUEUE_TIMEOUT", "2")),
+    timeout=float(os.getenv("PASSWORT_POOL_TIMEOUT", "10"))
+)
+
 
 # ===== PASSWORD FUNKTIONEN =====
 
+def _pool_ausfuehren(funktion, *args):
+    try:
+        return funktion(*args)
+    except PasswortPoolUeberlastet:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Anmeldung derzeit überlastet, bitte erneut versuchen",
+            headers={"Retry-After": "1"}
+        )
+
+
 def hash_password(password: str) -> str:
-    """Hasht ein Passwort mit bcrypt"""
-    return pwd_context.hash(password)
+    """Hasht ein Passwort mit bcrypt (im Passwort-Pool)"""
+    return _pool_ausfuehren(passwort_pool.hash, password)
 
 
 def get_password_hash(password: str) -> str:
@@ -39,8 +61,8 @@ def get_password_hash(password: str) -> str:
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    """Überprüft ob Passwort mit Hash übereinstimmt"""
-    return pwd_context.verify(password, password_hash)
+    """Überprüft ob Passwort mit Hash übereinstimmt (im Passwort-Pool)"""
+    return _pool_ausfuehren(passwort_pool.verify, password, password_hash)
 
 
 # ===== JWT TOKEN FUNKTIONEN =====
@@ -66,9 +88,16 @@ def create_access_token(claims: Dict[str, Any], expires_delta: Optional[timedelt
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
 
 
+# Verifizierte Claims pro Token (Schlüssel: SHA-256 des Tokens), läuft spätestens mit exp ab
+_claims_cache = TTLCache(
+    max_eintraege=int(os.getenv("JWT_CACHE_GROESSE", "10000")),
+    ttl=JWT_EXPIRE_MIN * 60
+)
+
+
 def decode_token(token: str) -> Dict[str, Any]:
     """
-    Dekodiert JWT Token
+    Dekodiert JWT Token - bereits verifizierte Tokens kommen aus dem Cache
 
     Args:
         token: JWT Token String
@@ -79,36 +108,130 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         HTTPException: Bei ungültigem Token
     """
+    schluessel = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = _claims_cache.get(schluessel)
+    if claims is not None:
+        return dict(claims)
+
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
 
+    exp = claims.get("exp")
+    restlaufzeit = exp - time.time() if exp is not None else None
+    if restlaufzeit is None or restlaufzeit > 0:
+        _claims_cache.set(schluessel, claims, ttl=restlaufzeit)
+    return dict(claims)
+
+
+def jwt_cache_metriken() -> dict:
+    return _claims_cache.metriken()
+
 
 def get_current_claims(creds: HTTPAuthorizationCredentials = Depends(bearer)) -> Dict[str, Any]:
     """FastAPI Dependency: Holt Claims aus Token"""
     return decode_token(creds.credentials)
 
 
-# ===== USER DEPENDENCIES =====
-
-async def get_current_user(
-        creds: HTTPAuthorizationCredentials = Depends(bearer),
+def get_current_kritiker(
+        claims: Dict[str, Any] = Depends(get_current_claims),
         db: Session = Depends(get_db)
-):
+) -> Dict[str, Any]:
     """
-    FastAPI Dependency: Holt aktuellen User (Kunde oder Restaurant) aus Token
-
-    Returns:
-        User-Objekt (Kunde oder Restaurant) mit zusätzlichem Attribut 'user_type'
+    FastAPI Dependency: Nur für Kritiker. Rolle und kritikerid kommen aus den Claims,
+    gegengeprüft gegen den gecachten Principal (bei einem Hit ohne Query): deaktivierte
+    Kunden und entzogene Kritiker-Rollen verlieren den Zugriff sofort, nicht erst mit
+    Ablauf des Tokens.
     """
+    if claims.get("type") != "kunde" or claims.get("role") != "kritiker" or not claims.get("kritikerid"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only critics allowed"
+        )
+    if _get_principal(claims, db).role != "kritiker":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only critics allowed"
+        )
+    return claims
+
+
+# ===== PRINCIPAL (gecachte Identität des Token-Inhabers) =====
+
+@dataclass(frozen=True)
+class Principal:
+    """Kompakte Identität statt voller Kunde-/Restaurant-Zeile"""
+    id: int
+    user_type: str
+    role: str
+    email: str
+    is_active: bool = True
+    is_admin: bool = False
+
+    @property
+    def kundenid(self) -> Optional[int]:
+        return self.id if self.user_type == "kunde" else None
+
+    @property
+    def restaurantid(self) -> Optional[int]:
+        return self.id if self.user_type == "restaurant" else None
+
+
+# Pro Prozess; Änderungen an Kunde/Kritiker/Restaurant invalidieren aktiv, die TTL
+# begrenzt die Verzögerung in anderen Workern
+_principal_cache = TTLCache(
+    max_eintraege=int(os.getenv("PRINCIPAL_CACHE_GROESSE", "10000")),
+    ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+)
+
+
+def principal_invalidieren(user_type: str, user_id: int):
+    """Nach Commit aufrufen, wenn sich Aktivierung, Admin-Flag, Rolle oder Existenz ändern"""
+    _principal_cache.delete((user_type, int(user_id)))
+
+
+def principal_cache_metriken() -> dict:
+    return _principal_cache.metriken()
+
+
+def _principal_laden(db: Session, user_type: str, user_id: int) -> Optional[Principal]:
     from models.kunde import Kunde
+    from models.kritiker import Kritiker
     from models.restaurant import Restaurant
 
-    claims = decode_token(creds.credentials)
+    if user_type == "kunde":
+        row = (
+            db.query(Kunde.kundenid, Kunde.email, Kunde.is_active, Kunde.is_admin, Kritiker.kritikerid)
+            .outerjoin(Kritiker, Kritiker.kundenid == Kunde.kundenid)
+            .filter(Kunde.kundenid == user_id)
+            .first()
+        )
+        if not row:
+            return None
+        return Principal(
+            id=row.kundenid,
+            user_type="kunde",
+            role="kritiker" if row.kritikerid is not None else "kunde",
+            email=row.email,
+            is_active=row.is_active,
+            is_admin=row.is_admin
+        )
+
+    row = (
+        db.query(Restaurant.restaurantid, Restaurant.email)
+        .filter(Restaurant.restaurantid == user_id)
+        .first()
+    )
+    if not row:
+        return None
+    return Principal(id=row.restaurantid, user_type="restaurant", role="restaurant", email=row.email)
+
+
+def _get_principal(claims: Dict[str, Any], db: Session) -> Principal:
     user_type = claims.get("type")
     user_id = claims.get("sub")
 
@@ -117,123 +240,82 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token claims"
         )
+    if user_type not in ("kunde", "restaurant"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown user type"
+        )
 
-    # Je nach User-Typ den entsprechenden User holen
-    if user_type == "kunde":
-        user = db.query(Kunde).filter(Kunde.kundenid == int(user_id)).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Kunde not found"
-            )
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Kunde ist deaktiviert"
-            )
-        # Füge user_type hinzu für später
-        user.user_type = "kunde"
-        return user
-
-    elif user_type == "restaurant":
-        user = db.query(Restaurant).filter(Restaurant.restaurantid == int(user_id)).first()
-        if not user:
+    schluessel = (user_type, int(user_id))
+    principal = _principal_cache.get(schluessel)
+    if principal is None:
+        principal = _principal_laden(db, user_type, int(user_id))
+        if principal is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Restaurant not found"
+                detail="Kunde not found" if user_type == "kunde" else "Restaurant not found"
             )
-        # Füge user_type hinzu für später
-        user.user_type = "restaurant"
-        return user
+        _principal_cache.set(schluessel, principal)
 
-    else:
+    if not principal.is_active:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unknown user type"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Kunde ist deaktiviert"
         )
+    return principal
+
+
+# ===== USER DEPENDENCIES =====
+
+async def get_current_user(
+        creds: HTTPAuthorizationCredentials = Depends(bearer),
+        db: Session = Depends(get_db)
+) -> Principal:
+    """
+    FastAPI Dependency: Holt aktuellen User (Kunde oder Restaurant) aus Token
+
+    Returns:
+        Principal (id, user_type, role, email, is_active, is_admin) - aus dem Cache,
+        nur bei einem Miss eine Query
+    """
+    return _get_principal(decode_token(creds.credentials), db)
 
 
 async def get_current_kunde(
         creds: HTTPAuthorizationCredentials = Depends(bearer),
         db: Session = Depends(get_db)
-):
+) -> Principal:
     """
     FastAPI Dependency: Holt aktuellen Kunde aus Token
     Wirft Fehler wenn User kein Kunde ist
     """
-    from models.kunde import Kunde
-
     claims = decode_token(creds.credentials)
-    user_type = claims.get("type")
-
-    if user_type != "kunde":
+    if claims.get("type") != "kunde":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only customers allowed"
         )
-
-    user_id = claims.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
-
-    kunde = db.query(Kunde).filter(Kunde.kundenid == int(user_id)).first()
-
-    if not kunde:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Kunde not found"
-        )
-
-    if not kunde.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Kunde ist deaktiviert"
-        )
-
-    return kunde
+    return _get_principal(claims, db)
 
 
 async def get_current_restaurant(
         creds: HTTPAuthorizationCredentials = Depends(bearer),
         db: Session = Depends(get_db)
-):
+) -> Principal:
     """
     FastAPI Dependency: Holt aktuelles Restaurant aus Token
     Wirft Fehler wenn User kein Restaurant ist
     """
-    from models.restaurant import Restaurant
-
     claims = decode_token(creds.credentials)
-    user_type = claims.get("type")
-
-    if user_type != "restaurant":
+    if claims.get("type") != "restaurant":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only restaurants allowed"
         )
-
-    user_id = claims.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
-
-    restaurant = db.query(Restaurant).filter(Restaurant.restaurantid == int(user_id)).first()
-
-    if not restaurant:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Restaurant not found"
-        )
-
-    return restaurant
+    return _get_principal(claims, db)
 
 
-async def get_current_active_admin(current_kunde = Depends(get_current_kunde)):
+async def get_current_active_admin(current_kunde: Principal = Depends(get_current_kunde)) -> Principal:
     """
     FastAPI Dependency: Nur für Admin-Kunden
     """
@@ -242,4 +324,4 @@ async def get_current_active_admin(current_kunde = Depends(get_current_kunde)):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Keine Admin-Berechtigung"
         )
-    return current_kunde
\ No newline at end of file
+    return current_kunde
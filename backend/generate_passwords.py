@@ -1,38 +1,144 @@
 """
 Script zum Generieren von Passwort-Hashes für bestehende Restaurants und Kunden
 Verwendet bcrypt wie im Backend
+
+Hasht parallel auf allen Kernen (Prozess-Pool) und schreibt die Hashes gebündelt per
+UPDATE ... FROM (VALUES ...) - entweder direkt in die Datenbank (DATABASE_URL aus .env)
+oder als SQL auf stdout.
+
+Passwort-Schema: restaurant{N}@example.com -> restaurant{N}, kunde{N}@example.com -> kunde{N}
+
+Beispiele:
+    python generate_passwords.py --sql > passwoerter.sql
+    python generate_passwords.py --db --kunden 10000 --rounds 4   # schnelle Testdaten
 """
 
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Tuple
+
 import bcrypt
 
-def hash_password(password: str) -> str:
+BCRYPT_ROUNDS_BACKEND = 12  # Standard von bcrypt.gensalt() / passlib
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS_BACKEND) -> str:
     """Hasht Passwort mit bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _hash_eintrag(eintrag: Tuple[str, str, int]) -> Tuple[str, str]:
+    email, password, rounds = eintrag
+    return email, hash_password(password, rounds)
+
+
+def zugangsdaten(prefix: str, anzahl: int) -> List[Tuple[str, str]]:
+    """(email, passwort) für prefix1 .. prefixN"""
+    return [(f"{prefix}{i}@example.com", f"{prefix}{i}") for i in range(1, anzahl + 1)]
+
 
-def generate_password_updates():
-    """Generiert SQL UPDATE statements mit gehashten Passwörtern"""
+def hashes_erzeugen(daten: List[Tuple[str, str]], rounds: int, workers: int) -> List[Tuple[str, str]]:
+    """bcrypt über alle Kerne verteilen; Reihenfolge bleibt erhalten"""
+    eintraege = [(email, password, rounds) for email, password in daten]
+    chunksize = max(1, len(eintraege) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_hash_eintrag, eintraege, chunksize=chunksize))
 
-    print("-- SQL UPDATE Statements für Restaurant-Passwörter")
-    print("-- Passwort-Schema: 'restaurant{N}' (z.B. restaurant5)\n")
 
-    # Restaurants: restaurant1@example.com -> Passwort: restaurant1
-    for i in range(1, 61):  # Anpassen je nach Anzahl
-        email = f"restaurant{i}@example.com"
-        password = f"restaurant{i}"
-        hashed = hash_password(password)
+def _bloecke(liste: List, groesse: int) -> Iterable[List]:
+    for i in range(0, len(liste), groesse):
+        yield liste[i:i + groesse]
 
-        print(f"UPDATE restaurant SET passwordhash = '{hashed}' WHERE email = '{email}';")
 
-    print("\n\n-- SQL UPDATE Statements für Kunden-Passwörter")
-    print("-- Passwort-Schema: 'kunde{N}' (z.B. kunde1)\n")
+def _sql_literal(wert: str) -> str:
+    return "'" + wert.replace("'", "''") + "'"
 
-    # Kunden: kunde1@example.com -> Passwort: kunde1
-    for i in range(1, 102):  # Anpassen je nach Anzahl
-        email = f"kunde{i}@example.com"
-        password = f"kunde{i}"
-        hashed = hash_password(password)
 
-        print(f"UPDATE kunde SET passwordhash = '{hashed}' WHERE email = '{email}';")
+def sql_ausgeben(tabelle: str, hashes: List[Tuple[str, str]], blockgroesse: int):
+    """Ein UPDATE ... FROM (VALUES ...) pro Block statt eines Statements pro Zeile"""
+    for block in _bloecke(hashes, blockgroesse):
+        werte = ",\n    ".join(f"({_sql_literal(email)}, {_sql_literal(h)})" for email, h in block)
+        print(
+            f"UPDATE {tabelle} AS t SET passwordhash = v.passwordhash\n"
+            f"FROM (VALUES\n    {werte}\n) AS v(email, passwordhash)\n"
+            f"WHERE t.email = v.email;\n"
+        )
+
+
+def in_db_schreiben(tabelle: str, hashes: List[Tuple[str, str]], blockgroesse: int) -> int:
+    """Gebündelt per execute_values in einer Transaktion; Returns: Anzahl aktualisierter Zeilen"""
+    from psycopg2.extras import execute_values
+    from database import engine
+
+    verbindung = engine.raw_connection()
+    try:
+        with verbindung.cursor() as cursor:
+            aktualisiert = 0
+            for block in _bloecke(hashes, blockgroesse):
+                execute_values(
+                    cursor,
+                    f"UPDATE {tabelle} AS t SET passwordhash = v.passwordhash "
+                    f"FROM (VALUES %s) AS v(email, passwordhash) WHERE t.email = v.email",
+                    block,
+                    page_size=blockgroesse
+                )
+                aktualisiert += cursor.rowcount
+        verbindung.commit()
+        return aktualisiert
+    finally:
+        verbindung.close()
+
+
+def generate_password_updates(
+        restaurants: int = 60,
+        kunden: int = 101,
+        rounds: int = BCRYPT_ROUNDS_BACKEND,
+        workers: int = os.cpu_count() or 1,
+        db: bool = False,
+        blockgroesse: int = 1000
+):
+    """Hashes für Restaurants und Kunden erzeugen und als SQL ausgeben oder direkt schreiben"""
+    for tabelle, prefix, anzahl in (("restaurant", "restaurant", restaurants), ("kunde", "kunde", kunden)):
+        if anzahl <= 0:
+            continue
+
+        start = time.perf_counter()
+        hashes = hashes_erzeugen(zugangsdaten(prefix, anzahl), rounds, workers)
+        dauer = time.perf_counter() - start
+        print(f"-- {anzahl} Hashes für {tabelle} in {dauer:.2f}s (cost {rounds}, {workers} Prozesse)", file=sys.stderr)
+
+        if db:
+            aktualisiert = in_db_schreiben(tabelle, hashes, blockgroesse)
+            print(f"-- {tabelle}: {aktualisiert} Zeilen aktualisiert", file=sys.stderr)
+        else:
+            print(f"-- Passwort-Schema für {tabelle}: '{prefix}{{N}}' (z.B. {prefix}1)\n")
+            sql_ausgeben(tabelle, hashes, blockgroesse)
+
 
 if __name__ == "__main__":
-    generate_password_updates()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Passwort-Hashes für Demo-/Testdaten erzeugen")
+    parser.add_argument("--restaurants", type=int, default=60, help="Anzahl restaurant{N}@example.com")
+    parser.add_argument("--kunden", type=int, default=101, help="Anzahl kunde{N}@example.com")
+    parser.add_argument("--rounds", type=int, default=BCRYPT_ROUNDS_BACKEND,
+                        help="bcrypt-Cost (4-31); kleiner = schneller, nur für Testdaten")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Anzahl Prozesse")
+    parser.add_argument("--blockgroesse", type=int, default=1000, help="Zeilen pro UPDATE")
+    modus = parser.add_mutually_exclusive_group()
+    modus.add_argument("--sql", action="store_true", help="SQL auf stdout ausgeben (Standard)")
+    modus.add_argument("--db", action="store_true", help="Direkt in die Datenbank schreiben")
+    args = parser.parse_args()
+
+    if not 4 <= args.rounds <= 31:
+        parser.error("--rounds muss zwischen 4 und 31 liegen")
+
+    generate_password_updates(
+        restaurants=args.restaurants,
+        kunden=args.kunden,
+        rounds=args.rounds,
+        workers=max(1, args.workers),
+        db=args.db,
+        blockgroesse=max(1, args.blockgroesse)
+    )
@@ -1,6 +1,11 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from database import SessionLocal
+
 from controllers import restaurant_controller, menue_controller, bestellposition_controller, warenkorb_controller
 from controllers import adresse_controller, oeffnungszeit_detail_controller, bestellung_controller
 from controllers import restaurant_oeffnungszeit_controller
@@ -9,14 +14,47 @@ from controllers import kunde_controller
 from controllers import gericht_controller, kritiker_controller, kochstil_controller, kochstilrestaurant_controller
 from controllers import label_controller, labelGericht_controller, lieferant_controller, preis_controller
 from controllers import bewertungkritiker_controller, oeffnungszeit_vorlage_controller
-from controllers import auth_controller
+from controllers import auth_controller, autocomplete_controller
+from services.gericht_suche_service import GerichtSucheService
+from services.autocomplete_service import AutocompleteService
+from services.facetten_service import FacettenService
+from services.oeffnungszeit_index_service import OeffnungszeitIndexService
+from services.idempotenz_service import IdempotenzService
+from core.security import passwort_pool, principal_cache_metriken, jwt_cache_metriken
+
+logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # In-Memory-Indizes beim Start aufbauen (sonst beim ersten Zugriff).
+    # Jeder Schritt einzeln, damit ein Fehler die übrigen nicht verhindert.
+    schritte = [
+        ("Gerichtsuche", lambda db: GerichtSucheService(db).aufbauen()),
+        ("Autocomplete", lambda db: AutocompleteService(db).aufbauen()),
+        ("Facetten", lambda db: FacettenService(db).aufbauen()),
+        ("Öffnungszeiten", lambda db: OeffnungszeitIndexService(db).aufbauen()),
+        ("Idempotenz-Aufräumen", lambda db: IdempotenzService(db).abgelaufene_loeschen()),
+    ]
+    db = SessionLocal()
+    try:
+        for name, schritt in schritte:
+            try:
+                schritt(db)
+            except Exception:
+                db.rollback()
+                logger.exception("Index-Aufbau beim Start fehlgeschlagen: %s", name)
+    finally:
+        db.close()
+    yield
+    passwort_pool.beenden()
+
 # Create FastAPI app
 app = FastAPI(
     title="Food Delivery API",
     description="Backend API for food delivery application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for React frontend
@@ -26,6 +64,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count"],
 )
 
 app.include_router(auth_controller.router)
@@ -49,6 +88,7 @@ app.include_router(preis_controller.router)
 app.include_router(bewertungkritiker_controller.router)
 app.include_router(oeffnungszeit_vorlage_controller.router)
 app.include_router(warenkorb_controller.router)
+app.include_router(autocomplete_controller.router)
 
 # Root endpoint
 @app.get("/")
@@ -62,4 +102,9 @@ def root():
 # Health check
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "passwort_pool": passwort_pool.metriken(),
+        "principal_cache": principal_cache_metriken(),
+        "jwt_cache": jwt_cache_metriken()
+    }
\ No newline at end of file
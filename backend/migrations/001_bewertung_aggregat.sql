@@ -0,0 +1,36 @@
+-- Vorberechnete Bewertungs-Aggregate pro Gericht und Restaurant
+-- Danach einmalig befüllen: python rebuild_bewertung_aggregat.py
+
+CREATE TABLE IF NOT EXISTS bewertung_aggregat_gericht (
+    gerichtid       INTEGER PRIMARY KEY REFERENCES gericht(gerichtid) ON DELETE CASCADE,
+    restaurantid    INTEGER REFERENCES restaurant(restaurantid) ON DELETE SET NULL,
+    anzahl_kunden   INTEGER NOT NULL DEFAULT 0,
+    summe_kunden    INTEGER NOT NULL DEFAULT 0,
+    anzahl_kritiker INTEGER NOT NULL DEFAULT 0,
+    summe_kritiker  INTEGER NOT NULL DEFAULT 0,
+    min_rating      INTEGER,
+    max_rating      INTEGER,
+    sterne_1        INTEGER NOT NULL DEFAULT 0,
+    sterne_2        INTEGER NOT NULL DEFAULT 0,
+    sterne_3        INTEGER NOT NULL DEFAULT 0,
+    sterne_4        INTEGER NOT NULL DEFAULT 0,
+    sterne_5        INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS ix_bewertung_aggregat_gericht_restaurantid
+    ON bewertung_aggregat_gericht (restaurantid);
+
+CREATE TABLE IF NOT EXISTS bewertung_aggregat_restaurant (
+    restaurantid    INTEGER PRIMARY KEY REFERENCES restaurant(restaurantid) ON DELETE CASCADE,
+    anzahl_kunden   INTEGER NOT NULL DEFAULT 0,
+    summe_kunden    INTEGER NOT NULL DEFAULT 0,
+    anzahl_kritiker INTEGER NOT NULL DEFAULT 0,
+    summe_kritiker  INTEGER NOT NULL DEFAULT 0,
+    min_rating      INTEGER,
+    max_rating      INTEGER,
+    sterne_1        INTEGER NOT NULL DEFAULT 0,
+    sterne_2        INTEGER NOT NULL DEFAULT 0,
+    sterne_3        INTEGER NOT NULL DEFAULT 0,
+    sterne_4        INTEGER NOT NULL DEFAULT 0,
+    sterne_5        INTEGER NOT NULL DEFAULT 0
+);
@@ -0,0 +1,12 @@
+-- Indizes für die paginierte Restaurant-Liste (GET /api/restaurants/seite)
+
+-- Keyset-Sortierung nach Name (name, restaurantid)
+CREATE INDEX IF NOT EXISTS ix_restaurant_name_id ON restaurant (name, restaurantid);
+CREATE INDEX IF NOT EXISTS ix_restaurant_klassifizierung ON restaurant (klassifizierung);
+
+-- selectinload der Kochstile pro Seite (PK beginnt mit stilid)
+CREATE INDEX IF NOT EXISTS ix_kochstilrestaurant_restaurantid ON kochstilrestaurant (restaurantid);
+
+-- Filter nach Postleitzahl / Ort
+CREATE INDEX IF NOT EXISTS ix_adresse_postleitzahl ON adresse (postleitzahl);
+CREATE INDEX IF NOT EXISTS ix_adresse_ort_lower ON adresse (lower(ort));
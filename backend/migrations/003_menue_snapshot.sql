@@ -0,0 +1,9 @@
+-- Vorgerenderte Restaurant-Detail-Dokumente (GET /api/restaurants/{id})
+-- Wird beim ersten Abruf befüllt, keine Datenmigration nötig
+
+CREATE TABLE IF NOT EXISTS menue_snapshot (
+    restaurantid INTEGER PRIMARY KEY REFERENCES restaurant(restaurantid) ON DELETE CASCADE,
+    version      INTEGER NOT NULL DEFAULT 1,
+    dokument     BYTEA,
+    erstellt_am  TIMESTAMPTZ
+);
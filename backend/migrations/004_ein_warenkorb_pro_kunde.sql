@@ -0,0 +1,60 @@
+-- Höchstens ein aktiver Warenkorb pro Kunde (Voraussetzung für das Upsert in
+-- WarenkorbService.get_or_create_cart). Vorhandene Duplikate werden zusammengeführt.
+
+BEGIN;
+
+-- Pro Kunde bleibt der älteste Warenkorb mit Positionen (sonst der älteste) erhalten
+CREATE TEMP TABLE warenkorb_merge ON COMMIT DROP AS
+SELECT
+    b.bestellungid AS alt_id,
+    first_value(b.bestellungid) OVER w AS neu_id,
+    first_value(b.restaurantid) OVER w AS neu_restaurantid,
+    b.restaurantid AS alt_restaurantid
+FROM bestellung b
+WHERE b.status = 'warenkorb'
+WINDOW w AS (
+    PARTITION BY b.kundenid
+    ORDER BY EXISTS (SELECT 1 FROM bestellposition p WHERE p.bestellungid = b.bestellungid) DESC,
+             b.bestellungid
+);
+
+DELETE FROM warenkorb_merge WHERE alt_id = neu_id;
+
+-- Positionen aus demselben Restaurant wandern in den verbleibenden Warenkorb,
+-- gleiche Gericht/Preis-Kombinationen werden dabei addiert
+UPDATE bestellposition ziel
+SET menge = ziel.menge + quelle.menge
+FROM (
+    SELECT m.neu_id, p.gerichtid, p.preisid, sum(p.menge) AS menge
+    FROM bestellposition p
+    JOIN warenkorb_merge m ON m.alt_id = p.bestellungid
+    WHERE m.alt_restaurantid IS NOT DISTINCT FROM m.neu_restaurantid
+    GROUP BY m.neu_id, p.gerichtid, p.preisid
+) quelle
+WHERE ziel.bestellungid = quelle.neu_id
+  AND ziel.gerichtid = quelle.gerichtid
+  AND ziel.preisid = quelle.preisid;
+
+-- Übrige Kombinationen einmal pro Gericht/Preis anlegen (mehrere alte Warenkörbe
+-- können dieselbe Kombination enthalten)
+INSERT INTO bestellposition (bestellungid, gerichtid, preisid, menge, aenderungswunsch)
+SELECT m.neu_id, p.gerichtid, p.preisid, sum(p.menge),
+       left(string_agg(DISTINCT p.aenderungswunsch, '; '), 255)
+FROM bestellposition p
+JOIN warenkorb_merge m ON m.alt_id = p.bestellungid
+WHERE m.alt_restaurantid IS NOT DISTINCT FROM m.neu_restaurantid
+  AND NOT EXISTS (
+      SELECT 1 FROM bestellposition z
+      WHERE z.bestellungid = m.neu_id AND z.gerichtid = p.gerichtid AND z.preisid = p.preisid
+  )
+GROUP BY m.neu_id, p.gerichtid, p.preisid;
+
+-- Alte Positionen (übernommen oder anderes Restaurant) verwerfen
+DELETE FROM bestellposition p USING warenkorb_merge m WHERE p.bestellungid = m.alt_id;
+DELETE FROM bestellung b USING warenkorb_merge m WHERE b.bestellungid = m.alt_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_bestellung_warenkorb_kunde
+    ON bestellung (kundenid)
+    WHERE status = 'warenkorb';
+
+COMMIT;
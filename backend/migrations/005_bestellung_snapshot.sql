@@ -0,0 +1,14 @@
+-- Beim Checkout eingefrorene Bestell-Dokumente (GET /api/bestellungen/{id}/details)
+-- Ältere Bestellungen werden beim ersten Detail-Abruf nachträglich eingefroren
+
+CREATE TABLE IF NOT EXISTS bestellung_snapshot (
+    bestellungid      INTEGER PRIMARY KEY REFERENCES bestellung(bestellungid) ON DELETE CASCADE,
+    kundenid          INTEGER NOT NULL,
+    restaurantid      INTEGER,
+    gesamtpreis       NUMERIC(10, 2) NOT NULL,
+    anzahl_positionen INTEGER NOT NULL,
+    dokument          BYTEA NOT NULL,
+    erstellt_am       TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_bestellung_snapshot_kundenid ON bestellung_snapshot (kundenid);
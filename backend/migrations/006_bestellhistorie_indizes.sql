@@ -0,0 +1,7 @@
+-- Indizes für die paginierte Bestellhistorie (GET /api/bestellungen/kunde/{id}/historie)
+
+-- Keyset über bestellungid absteigend pro Kunde
+CREATE INDEX IF NOT EXISTS ix_bestellung_kundenid_bestellungid ON bestellung (kundenid, bestellungid DESC);
+
+-- Summen über die Positionen einer Bestellung (FK ist in Postgres nicht automatisch indiziert)
+CREATE INDEX IF NOT EXISTS ix_bestellposition_bestellungid ON bestellposition (bestellungid);
@@ -0,0 +1,31 @@
+-- Fortlaufende Änderungsnummer pro Bestellung für "was hat sich seit Cursor X geändert"
+-- (GET /api/bestellungen/restaurant/{id}/aenderungen und Event-IDs des SSE-Streams)
+
+BEGIN;
+
+CREATE SEQUENCE IF NOT EXISTS bestellung_change_seq;
+
+ALTER TABLE bestellung
+    ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval('bestellung_change_seq');
+
+-- Bei jeder Änderung einer echten Bestellung (nicht Warenkorb) neu vergeben.
+-- Der Advisory-Lock hält bis zum Commit: Nummern werden damit in Commit-Reihenfolge
+-- sichtbar und ein Poller kann keine Änderung hinter seinem Cursor verpassen.
+CREATE OR REPLACE FUNCTION bestellung_change_seq_setzen() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('bestellung_change_seq'));
+    NEW.change_seq := nextval('bestellung_change_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_bestellung_change_seq ON bestellung;
+CREATE TRIGGER tr_bestellung_change_seq
+    BEFORE INSERT OR UPDATE ON bestellung
+    FOR EACH ROW
+    WHEN (NEW.status IS DISTINCT FROM 'warenkorb')
+    EXECUTE FUNCTION bestellung_change_seq_setzen();
+
+CREATE INDEX IF NOT EXISTS ix_bestellung_restaurantid_change_seq ON bestellung (restaurantid, change_seq);
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- Idempotency-Keys für Checkout und Warenkorb-POSTs (Header Idempotency-Key)
+-- Wiederholte Requests bekommen die gespeicherte Antwort, ohne erneut ausgeführt zu werden
+
+CREATE TABLE IF NOT EXISTS idempotenz_schluessel (
+    kundenid    INTEGER      NOT NULL,
+    endpunkt    VARCHAR(50)  NOT NULL,
+    schluessel  VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64)  NOT NULL,
+    status_code INTEGER,
+    antwort     BYTEA,
+    erstellt_am TIMESTAMPTZ  NOT NULL,
+    ablauf_am   TIMESTAMPTZ  NOT NULL,
+    PRIMARY KEY (kundenid, endpunkt, schluessel)
+);
+
+CREATE INDEX IF NOT EXISTS ix_idempotenz_schluessel_ablauf_am ON idempotenz_schluessel (ablauf_am);
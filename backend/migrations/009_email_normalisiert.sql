@@ -0,0 +1,29 @@
+-- E-Mails in normalisierter Form (getrimmt, kleingeschrieben) speichern, damit Login
+-- und Dubletten-Prüfung per Gleichheit den Unique-Index auf email nutzen statt ILIKE-Scan.
+-- Bricht ab, falls sich zwei Konten nur in Groß-/Kleinschreibung unterscheiden -
+-- diese vorher manuell zusammenführen.
+
+BEGIN;
+
+DO $$
+DECLARE
+    konflikte TEXT;
+BEGIN
+    SELECT string_agg(e, ', ') INTO konflikte FROM (
+        SELECT lower(btrim(email)) AS e FROM kunde GROUP BY 1 HAVING count(*) > 1
+        UNION ALL
+        SELECT lower(btrim(email)) AS e FROM restaurant GROUP BY 1 HAVING count(*) > 1
+    ) d;
+    IF konflikte IS NOT NULL THEN
+        RAISE EXCEPTION 'E-Mails kollidieren nach Normalisierung: %', konflikte;
+    END IF;
+END $$;
+
+UPDATE kunde SET email = lower(btrim(email)) WHERE email <> lower(btrim(email));
+UPDATE restaurant SET email = lower(btrim(email)) WHERE email <> lower(btrim(email));
+
+-- Neue Zeilen dürfen nur noch normalisiert ankommen
+ALTER TABLE kunde ADD CONSTRAINT ck_kunde_email_normalisiert CHECK (email = lower(btrim(email)));
+ALTER TABLE restaurant ADD CONSTRAINT ck_restaurant_email_normalisiert CHECK (email = lower(btrim(email)));
+
+COMMIT;
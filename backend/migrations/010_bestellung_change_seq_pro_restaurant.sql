@@ -0,0 +1,30 @@
+-- change_seq-Trigger aus 007: Advisory-Lock pro Restaurant statt global und Art der
+-- letzten Änderung (change_typ) mitschreiben, damit nachgeholte SSE-Events neue
+-- Bestellungen ('neu') von Änderungen ('geaendert') unterscheiden.
+--
+-- Der Cursor wird nur pro Restaurant gelesen (restaurantid, change_seq > X); es reicht,
+-- dass Nummern innerhalb eines Restaurants in Commit-Reihenfolge sichtbar werden.
+-- Checkouts und Statuswechsel verschiedener Restaurants warten nicht mehr aufeinander.
+
+BEGIN;
+
+ALTER TABLE bestellung
+    ADD COLUMN IF NOT EXISTS change_typ VARCHAR(10) NOT NULL DEFAULT 'geaendert';
+
+CREATE OR REPLACE FUNCTION bestellung_change_seq_setzen() RETURNS trigger AS $$
+BEGIN
+    -- Zwei-Schlüssel-Form, damit andere Advisory-Locks nicht kollidieren;
+    -- ohne restaurantid (NULL) wird nicht gesperrt, solche Zeilen liest kein Cursor
+    PERFORM pg_advisory_xact_lock(hashtext('bestellung_change_seq'), NEW.restaurantid);
+    NEW.change_seq := nextval('bestellung_change_seq');
+    -- Checkout ist das UPDATE aus dem Warenkorb heraus
+    IF TG_OP = 'INSERT' OR OLD.status = 'warenkorb' THEN
+        NEW.change_typ := 'neu';
+    ELSE
+        NEW.change_typ := 'geaendert';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
@@ -0,0 +1,42 @@
+-- Restaurant-Liste (GET /api/restaurants/seite) nach Bewertung per Index statt Full-Scan:
+-- Durchschnitt als gespeicherte, von Postgres gepflegte Spalte im Restaurant-Aggregat,
+-- und jedes Restaurant hat eine Aggregat-Zeile (ohne Bewertungen: Durchschnitt 0),
+-- damit Sortierung und min_bewertung ohne Outer Join auskommen.
+-- Dazu Keyset nach coalesce(name, '') - NULL-Namen würden sonst Zeilen überspringen.
+
+BEGIN;
+
+ALTER TABLE bewertung_aggregat_restaurant
+    ADD COLUMN IF NOT EXISTS durchschnitt DOUBLE PRECISION NOT NULL GENERATED ALWAYS AS (
+        CASE WHEN anzahl_kunden + anzahl_kritiker > 0
+             THEN (summe_kunden + summe_kritiker)::DOUBLE PRECISION / (anzahl_kunden + anzahl_kritiker)
+             ELSE 0
+        END
+    ) STORED;
+
+INSERT INTO bewertung_aggregat_restaurant (restaurantid)
+SELECT restaurantid FROM restaurant
+ON CONFLICT (restaurantid) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bewertung_aggregat_restaurant_anlegen() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO bewertung_aggregat_restaurant (restaurantid) VALUES (NEW.restaurantid)
+    ON CONFLICT (restaurantid) DO NOTHING;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_bewertung_aggregat_restaurant_anlegen ON restaurant;
+CREATE TRIGGER tr_bewertung_aggregat_restaurant_anlegen
+    AFTER INSERT ON restaurant
+    FOR EACH ROW
+    EXECUTE FUNCTION bewertung_aggregat_restaurant_anlegen();
+
+-- Keyset "rating": durchschnitt absteigend, restaurantid aufsteigend
+CREATE INDEX IF NOT EXISTS ix_bewertung_aggregat_restaurant_durchschnitt
+    ON bewertung_aggregat_restaurant (durchschnitt DESC, restaurantid);
+
+-- Keyset "name": coalesce(name, '') aufsteigend, restaurantid aufsteigend
+CREATE INDEX IF NOT EXISTS ix_restaurant_name_coalesce_id ON restaurant ((coalesce(name, '')), restaurantid);
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- Idempotency-Keys: im selben Commit wie die geschützte Aktion als ausgeführt markieren.
+-- Solche Reservierungen werden nie übernommen, auch wenn die gespeicherte Antwort fehlt
+-- (Absturz zwischen Aktion und Antwort) - sonst liefe z.B. ein Checkout doppelt.
+
+ALTER TABLE idempotenz_schluessel
+    ADD COLUMN IF NOT EXISTS ausgefuehrt BOOLEAN NOT NULL DEFAULT false;
+
+-- Bestehende Einträge mit Antwort sind ausgeführt
+UPDATE idempotenz_schluessel SET ausgefuehrt = true WHERE antwort IS NOT NULL;
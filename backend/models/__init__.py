@@ -26,6 +26,10 @@ from models.kochstilrestaurant import KochstilRestaurant
 from models.oeffnungszeit_vorlage import OeffnungszeitVorlage
 from models.oeffnungszeit_detail import OeffnungszeitDetail
 from models.restaurant_oeffnungszeit import RestaurantOeffnungszeit
+from models.bewertung_aggregat import BewertungAggregatGericht, BewertungAggregatRestaurant
+from models.menue_snapshot import MenueSnapshot
+from models.bestellung_snapshot import BestellungSnapshot
+from models.idempotenz_schluessel import IdempotenzSchluessel
 
 
 # Export all models
@@ -48,7 +52,12 @@ __all__ = [
     'KochstilRestaurant',
     'OeffnungszeitVorlage',
     'OeffnungszeitDetail',
-    'RestaurantOeffnungszeit'
+    'RestaurantOeffnungszeit',
+    'BewertungAggregatGericht',
+    'BewertungAggregatRestaurant',
+    'MenueSnapshot',
+    'BestellungSnapshot',
+    'IdempotenzSchluessel'
 ]
 
 
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary, DateTime, Numeric
+from database import Base
+
+
+class BestellungSnapshot(Base):
+    __tablename__ = 'bestellung_snapshot'
+
+    bestellungid = Column(Integer, ForeignKey('bestellung.bestellungid', ondelete='CASCADE'), primary_key=True)
+    kundenid = Column(Integer, nullable=False, index=True)
+    restaurantid = Column(Integer)
+    gesamtpreis = Column(Numeric(10, 2), nullable=False)
+    anzahl_positionen = Column(Integer, nullable=False)
+    # Beim Checkout eingefrorenes JSON: Restaurant, Lieferadresse, Positionen mit Einzelpreisen
+    dokument = Column(LargeBinary, nullable=False)
+    erstellt_am = Column(DateTime(timezone=True))
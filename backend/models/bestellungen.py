@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, FetchedValue
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -18,6 +18,10 @@ class Bestellungen(Base):
     adresse = relationship("Adresse", back_populates="bestellungen")
 
     status= Column(String(50), nullable=False)
+    # Von der DB vergeben (Sequenz + Trigger, Migration 007) - bei jeder Änderung neu
+    change_seq = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    # Art der letzten Änderung ('neu' = Checkout, sonst 'geaendert'), Trigger aus Migration 010
+    change_typ = Column(String(10), nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
 
     def to_dict(self):
         """Wandelt das Objekt in ein Dictionary um."""
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Computed, Float, Integer, ForeignKey
+from database import Base
+
+
+class _BewertungAggregatSpalten:
+    """Gemeinsame Zähler für Gericht- und Restaurant-Aggregate"""
+    anzahl_kunden = Column(Integer, nullable=False, default=0, server_default="0")
+    summe_kunden = Column(Integer, nullable=False, default=0, server_default="0")
+    anzahl_kritiker = Column(Integer, nullable=False, default=0, server_default="0")
+    summe_kritiker = Column(Integer, nullable=False, default=0, server_default="0")
+    min_rating = Column(Integer)
+    max_rating = Column(Integer)
+
+    # Histogramm über alle Bewertungen (Kunden + Kritiker) pro Stern
+    sterne_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    sterne_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    sterne_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    sterne_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    sterne_5 = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class BewertungAggregatGericht(_BewertungAggregatSpalten, Base):
+    __tablename__ = 'bewertung_aggregat_gericht'
+
+    gerichtid = Column(Integer, ForeignKey('gericht.gerichtid', ondelete='CASCADE'), primary_key=True)
+    restaurantid = Column(Integer, ForeignKey('restaurant.restaurantid', ondelete='SET NULL'), index=True)
+
+
+class BewertungAggregatRestaurant(_BewertungAggregatSpalten, Base):
+    __tablename__ = 'bewertung_aggregat_restaurant'
+
+    restaurantid = Column(Integer, ForeignKey('restaurant.restaurantid', ondelete='CASCADE'), primary_key=True)
+    # Von Postgres gepflegt (Migration 011) - Sortierung/Filter der Restaurant-Liste per Index
+    durchschnitt = Column(Float, Computed(
+        "CASE WHEN anzahl_kunden + anzahl_kritiker > 0 "
+        "THEN (summe_kunden + summe_kritiker)::DOUBLE PRECISION / (anzahl_kunden + anzahl_kritiker) "
+        "ELSE 0 END",
+        persisted=True
+    ), nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Boolean, Integer, String, LargeBinary, DateTime
+from database import Base
+
+
+class IdempotenzSchluessel(Base):
+    __tablename__ = 'idempotenz_schluessel'
+
+    kundenid = Column(Integer, primary_key=True)
+    endpunkt = Column(String(50), primary_key=True)
+    schluessel = Column(String(255), primary_key=True)
+    # SHA-256 über den Request-Body: gleicher Schlüssel mit anderem Body wird abgelehnt
+    fingerprint = Column(String(64), nullable=False)
+    # NULL solange der erste Request noch läuft
+    status_code = Column(Integer)
+    antwort = Column(LargeBinary)
+    # Im Commit der Aktion gesetzt: ab dann wird die Reservierung nie mehr übernommen
+    ausgefuehrt = Column(Boolean, nullable=False, default=False, server_default="false")
+    erstellt_am = Column(DateTime(timezone=True), nullable=False)
+    ablauf_am = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from database import Base
+from utils.email_norm import email_normalisieren
 
 class Kunde(Base):
     __tablename__ = 'kunde'
@@ -24,6 +25,11 @@ class Kunde(Base):
     bestellungen = relationship("Bestellungen", back_populates="kunde")
     bewertungen = relationship("Bewertung", back_populates="kunde")
 
+    @validates("email")
+    def _email_normalisieren(self, key, email):
+        # Gespeichert wird nur die normalisierte Form (Unique-Index, Login per Gleichheit)
+        return email_normalisieren(email)
+
 
     def to_dict(self):
         return {
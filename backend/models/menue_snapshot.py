@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary, DateTime
+from database import Base
+
+
+class MenueSnapshot(Base):
+    __tablename__ = 'menue_snapshot'
+
+    restaurantid = Column(Integer, ForeignKey('restaurant.restaurantid', ondelete='CASCADE'), primary_key=True)
+    # Wird bei jeder Änderung an Menü/Gericht/Preis/Kochstil des Restaurants erhöht
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Fertig serialisiertes JSON, NULL = invalidiert
+    dokument = Column(LargeBinary)
+    erstellt_am = Column(DateTime(timezone=True))
@@ -8,7 +8,7 @@ class OeffnungszeitDetail(Base):
     
     detailid = Column(Integer, primary_key=True, autoincrement=True)
     oeffnungszeitid = Column(Integer, ForeignKey('oeffnungszeit_vorlage.oeffnungszeitid'), nullable=False)
-    wochentag = Column(Integer, nullable=False)  # 0=Monday, 6=Sunday
+    wochentag = Column(Integer, nullable=False)  # 1=Monday, 7=Sunday
     oeffnungszeit = Column(Time)
     schliessungszeit = Column(Time)
     ist_geschlossen = Column(Boolean, default=False)
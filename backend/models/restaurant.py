@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from database import Base
+from utils.email_norm import email_normalisieren
 
 class Restaurant(Base):
     __tablename__ = 'restaurant'
@@ -22,6 +23,11 @@ class Restaurant(Base):
     kochstil = relationship("KochstilRestaurant", back_populates="restaurant", lazy="select")
     oeffnungszeiten = relationship("RestaurantOeffnungszeit", back_populates="restaurant")
 
+    @validates("email")
+    def _email_normalisieren(self, key, email):
+        # Gespeichert wird nur die normalisierte Form (Unique-Index, Login per Gleichheit)
+        return email_normalisieren(email)
+
     def to_dict(self):
         return {
             "restaurantid": self.restaurantid,
@@ -0,0 +1,20 @@
+"""
+Script zum Neuaufbau der Bewertungs-Aggregate (bewertung_aggregat_gericht/_restaurant)
+Gleicht Drift zwischen Rohdaten (bewertung, bewertungkritiker) und Aggregaten ab
+"""
+
+from database import SessionLocal
+from services.bewertung_aggregat_service import BewertungAggregatService
+
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        result = BewertungAggregatService(db).rebuild()
+        print(f"Aggregate neu aufgebaut: {result['gerichte']} Gerichte, {result['restaurants']} Restaurants")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()
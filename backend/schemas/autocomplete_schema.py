@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AutocompleteVorschlag(BaseModel):
+    typ: str  # gericht | restaurant | kochstil | label
+    id: int
+    text: str
+    restaurantid: Optional[int] = None
+    popularitaet: int = 0
@@ -33,6 +33,39 @@ class BestellungResponse(BaseModel):
         from_attributes = True
 
 
+# ===== BESTELLHISTORIE (Keyset-Pagination) =====
+class BestellungHistorieItem(BaseModel):
+    bestellungid: int
+    status: str
+    kundenid: int
+    restaurantid: Optional[int] = None
+    restaurantname: Optional[str] = None
+    lieferantid: Optional[int] = None
+    adressid: Optional[int] = None
+    anzahl_positionen: int
+    gesamtpreis: float
+
+class BestellungHistorieSeite(BaseModel):
+    items: List[BestellungHistorieItem]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+class BestellungAenderung(BaseModel):
+    bestellungid: int
+    change_seq: int
+    typ: str
+    status: str
+    kundenid: int
+    restaurantid: Optional[int] = None
+    lieferantid: Optional[int] = None
+    adressid: Optional[int] = None
+
+class BestellungAenderungenSeite(BaseModel):
+    items: List[BestellungAenderung]
+    cursor: int
+    has_more: bool
+
+
 # ===== NEUE SCHEMAS FÜR DETAIL-ANSICHT =====
 class GerichtDetail(BaseModel):
     gerichtid: int
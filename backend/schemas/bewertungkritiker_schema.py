@@ -2,7 +2,9 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional
 
 # What data comes IN when creating a bewertungkritiker
+# kritikerid kommt aus dem Token des eingeloggten Kritikers
 class BewertungkritikerCreate(BaseModel):
+    gerichtid: int
     rating: int
 
 # What data comes IN when updating
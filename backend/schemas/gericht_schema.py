@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List, Dict
 
 class GerichtCreate(BaseModel):
     menuid: int
@@ -29,6 +29,25 @@ class GerichtSearchResponse(BaseModel):
     kategorie: Optional[str] = None
     restaurantid: int
     restaurantname: str
+    score: Optional[float] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FacettenWert(BaseModel):
+    wert: str
+    name: str
+    anzahl: int
+
+class GerichtFacettenItem(BaseModel):
+    gerichtid: int
+    name: Optional[str] = None
+    kategorie: Optional[str] = None
+    restaurantid: int
+    restaurantname: Optional[str] = None
+    preis: Optional[float] = None
+
+class GerichtFacettenResponse(BaseModel):
+    total: int
+    items: List[GerichtFacettenItem]
+    facetten: Dict[str, List[FacettenWert]]
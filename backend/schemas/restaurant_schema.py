@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
+from datetime import datetime
 
 # Existing schemas
 class RestaurantCreate(BaseModel):
@@ -30,6 +31,12 @@ class RestaurantResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RestaurantSeiteResponse(BaseModel):
+    """Eine Seite der Restaurant-Liste (Keyset-Pagination)"""
+    items: List[dict]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
 # Profile Schemas
 class AdresseSchema(BaseModel):
     straße: Optional[str] = None
@@ -90,6 +97,9 @@ class RestaurantBewertungenResponse(BaseModel):
     anzahl_kritiker: int
     durchschnitt_kunden: Optional[float] = None
     durchschnitt_kritiker: Optional[float] = None
+    min_rating: Optional[int] = None
+    max_rating: Optional[int] = None
+    verteilung: Optional[Dict[int, int]] = None
 
     class Config:
         from_attributes = True
@@ -119,4 +129,17 @@ class CustomerFavoriteSchema(BaseModel):
     beispiel_kommentare: List[str]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class RestaurantHighlightsSchema(BaseModel):
+    """Kritiker-Highlights und Customer-Favorites eines Restaurants (für Listen-Karten)"""
+    kritiker_highlights: List[GerichtHighlightSchema]
+    customer_favorites: List[CustomerFavoriteSchema]
+
+
+class OeffnungsstatusSchema(BaseModel):
+    """Offen/zu und nächste Wechsel eines Restaurants (None: keiner im Suchhorizont)"""
+    ist_offen: bool
+    naechste_oeffnung: Optional[datetime] = None
+    naechste_schliessung: Optional[datetime] = None
@@ -1,6 +1,6 @@
 # schemas/warenkorb_schema.py
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal, Union, Annotated
 
 class AddItemRequest(BaseModel):
     restaurantid: int
@@ -15,6 +15,30 @@ class UpdateQuantityRequest(BaseModel):
 class UpdateSpecialRequestRequest(BaseModel):
     aenderungswunsch: str
 
+# ===== Batch operations =====
+class AddItemOperation(AddItemRequest):
+    op: Literal["add"]
+
+class UpdateQuantityOperation(UpdateQuantityRequest):
+    op: Literal["quantity"]
+    positionid: int
+
+class UpdateSpecialRequestOperation(UpdateSpecialRequestRequest):
+    op: Literal["notes"]
+    positionid: int
+
+class RemoveItemOperation(BaseModel):
+    op: Literal["remove"]
+    positionid: int
+
+CartOperation = Annotated[
+    Union[AddItemOperation, UpdateQuantityOperation, UpdateSpecialRequestOperation, RemoveItemOperation],
+    Field(discriminator="op")
+]
+
+class CartBatchRequest(BaseModel):
+    operationen: List[CartOperation] = Field(..., min_length=1, max_length=50)
+
 class CheckoutRequest(BaseModel):
     adressid: int
     lieferantid: int
@@ -8,11 +8,13 @@ from sqlalchemy import func
 from models.restaurant import Restaurant
 from models.kunde import Kunde
 from models.bestellungen import Bestellungen
+from services.menue_snapshot_service import MenueSnapshotService
 
 
 class AdresseService:
     def __init__(self, db: Session):
         self.db = db
+        self.snapshot_service = MenueSnapshotService(db)
 
     def get_all(self) -> List[Adresse]:
         return self.db.query(Adresse).all()
@@ -59,6 +61,8 @@ class AdresseService:
             for key, value in update_data.items():
                 if value is not None:
                     setattr(adresse, key, value)
+            # Menü-Snapshot enthält die Adresse: neue Version in derselben Transaktion
+            self.snapshot_service.invalidieren_fuer_adresse(adresse_id)
             self.db.commit()
             self.db.refresh(adresse)
             return adresse
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 from fastapi import HTTPException, status
 
 from core.security import verify_password, create_access_token, get_password_hash
+from utils.email_norm import email_normalisieren
 from models.kunde import Kunde
 from models.restaurant import Restaurant
 from models.kritiker import Kritiker
@@ -12,7 +14,7 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
 
-    def register(
+    def _kunde_anlegen(
             self,
             vorname: str,
             nachname: str,
@@ -41,13 +43,14 @@ class AuthService:
             namenskuerzel: Optional - Namenskürzel
 
         Returns:
-            Erstellter Kunde
+            Erstellter Kunde (geflusht, noch nicht committet)
 
         Raises:
             HTTPException: Wenn E-Mail bereits existiert
         """
         # Prüfen ob E-Mail bereits existiert
-        existing_kunde = self.db.query(Kunde).filter(Kunde.email == email).first()
+        email = email_normalisieren(email)
+        existing_kunde = self.db.query(Kunde.kundenid).filter(Kunde.email == email).first()
         if existing_kunde:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -83,12 +86,29 @@ class AuthService:
         )
 
         self.db.add(kunde)
+        self.db.flush()  # kundenid für den Token, Commit macht der Aufrufer
+
+        return kunde
+
+    def register(self, **daten) -> Kunde:
+        """Registriert einen neuen Kunden (Parameter siehe _kunde_anlegen)"""
+        kunde = self._kunde_anlegen(**daten)
         self.db.commit()
         self.db.refresh(kunde)
-
         return kunde
 
-    def register_restaurant(
+    def register_mit_token(self, **daten) -> dict:
+        """
+        Registriert einen Kunden und stellt direkt den Access-Token aus - ohne erneutes
+        Laden per E-Mail und ohne zweites bcrypt-Verify wie beim Login.
+        Ein neuer Kunde ist nie Kritiker, die Rolle ist also immer "kunde".
+        """
+        kunde = self._kunde_anlegen(**daten)
+        token = self.token_ausstellen("kunde", kunde.kundenid, "kunde", kunde.email)
+        self.db.commit()
+        return token
+
+    def _restaurant_anlegen(
             self,
             name: str,
             email: str,
@@ -115,13 +135,14 @@ class AuthService:
             kuechenchef: Optional - Name des Küchenchefs
 
         Returns:
-            Erstelltes Restaurant
+            Erstelltes Restaurant (geflusht, noch nicht committet)
 
         Raises:
             HTTPException: Wenn E-Mail bereits existiert
         """
         # Prüfen ob E-Mail bereits existiert
-        existing_restaurant = self.db.query(Restaurant).filter(Restaurant.email == email).first()
+        email = email_normalisieren(email)
+        existing_restaurant = self.db.query(Restaurant.restaurantid).filter(Restaurant.email == email).first()
         if existing_restaurant:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -154,11 +175,74 @@ class AuthService:
         )
 
         self.db.add(restaurant)
+        self.db.flush()  # restaurantid für den Token, Commit macht der Aufrufer
+
+        return restaurant
+
+    def register_restaurant(self, **daten) -> Restaurant:
+        """Registriert ein neues Restaurant (Parameter siehe _restaurant_anlegen)"""
+        restaurant = self._restaurant_anlegen(**daten)
         self.db.commit()
         self.db.refresh(restaurant)
-
         return restaurant
 
+    def register_restaurant_mit_token(self, **daten) -> dict:
+        """Wie register_mit_token, für Restaurants"""
+        restaurant = self._restaurant_anlegen(**daten)
+        token = self.token_ausstellen("restaurant", restaurant.restaurantid, "restaurant", restaurant.email)
+        self.db.commit()
+        return token
+
+    # ===== ROLLEN =====
+
+    def _kunde_mit_rolle(self, email_norm: str):
+        """Zugangsdaten und Kritiker-Status in einem Roundtrip (Outer Join auf kritiker)"""
+        return (
+            self.db.query(
+                Kunde.kundenid,
+                Kunde.email,
+                Kunde.passwordhash,
+                Kritiker.kritikerid
+            )
+            .outerjoin(Kritiker, Kritiker.kundenid == Kunde.kundenid)
+            .filter(Kunde.email == email_norm)
+            .first()
+        )
+
+    @staticmethod
+    def rolle(kritikerid: Optional[int]) -> str:
+        return "kritiker" if kritikerid is not None else "kunde"
+
+    @staticmethod
+    def token_ausstellen(
+            user_type: str,
+            user_id: int,
+            role: str,
+            email: str,
+            kritikerid: Optional[int] = None
+    ) -> dict:
+        """
+        Access-Token plus Login-Antwort (access_token, role, user_id, user_type).
+        Rolle und ggf. kritikerid stehen im Token - Kritiker-Endpoints brauchen keine Query.
+        """
+        claims = {
+            "sub": str(user_id),
+            "type": user_type,
+            "role": role,
+            "email": email
+        }
+        if kritikerid is not None:
+            claims["kritikerid"] = kritikerid
+        token = create_access_token(claims)
+
+        return {
+            "access_token": token,
+            "role": role,
+            "user_id": user_id,
+            "user_type": user_type,
+            "token_type": "bearer"
+        }
+
     def login(self, login_type: str, email: str, password: str) -> dict:
         """
         Login für Kunde oder Restaurant
@@ -174,14 +258,10 @@ class AuthService:
         Raises:
             HTTPException: Bei ungültigen Credentials oder unbekanntem login_type
         """
-        email_norm = email.lower().strip()
+        email_norm = email_normalisieren(email)
 
         if login_type == "kunde":
-            kunde = (
-                self.db.query(Kunde)
-                .filter(Kunde.email.ilike(email_norm))
-                .first()
-            )
+            kunde = self._kunde_mit_rolle(email_norm)
             if not kunde or not kunde.passwordhash:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -194,30 +274,14 @@ class AuthService:
                     detail="Invalid credentials"
                 )
 
-            # Prüfen ob Kunde auch Kritiker ist
-            is_kritiker = self.db.query(Kritiker).filter(Kritiker.kundenid == kunde.kundenid).first() is not None
-            role = "kritiker" if is_kritiker else "kunde"
-
-            # Token erstellen
-            token = create_access_token({
-                "sub": str(kunde.kundenid),
-                "type": "kunde",
-                "role": role,
-                "email": kunde.email
-            })
-
-            return {
-                "access_token": token,
-                "role": role,
-                "user_id": kunde.kundenid,
-                "user_type": "kunde",
-                "token_type": "bearer"
-            }
+            return self.token_ausstellen(
+                "kunde", kunde.kundenid, self.rolle(kunde.kritikerid), kunde.email, kritikerid=kunde.kritikerid
+            )
 
         elif login_type == "restaurant":
             restaurant = (
                 self.db.query(Restaurant)
-                .filter(Restaurant.email.ilike(email_norm))
+                .filter(Restaurant.email == email_norm)
                 .first()
             )
             if not restaurant or not restaurant.passwordhash:
@@ -232,21 +296,7 @@ class AuthService:
                     detail="Invalid credentials"
                 )
 
-            # Token erstellen
-            token = create_access_token({
-                "sub": str(restaurant.restaurantid),
-                "type": "restaurant",
-                "role": "restaurant",
-                "email": restaurant.email
-            })
-
-            return {
-                "access_token": token,
-                "role": "restaurant",
-                "user_id": restaurant.restaurantid,
-                "user_type": "restaurant",
-                "token_type": "bearer"
-            }
+            return self.token_ausstellen("restaurant", restaurant.restaurantid, "restaurant", restaurant.email)
 
         else:
             raise HTTPException(
@@ -0,0 +1,181 @@
+import os
+import time
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from typing import Iterable, List, Optional
+
+from models.gericht import Gericht
+from models.menue import Menue
+from models.restaurant import Restaurant
+from models.kochstil import Kochstil
+from models.kochstilrestaurant import KochstilRestaurant
+from models.label import Label
+from models.labelGericht import LabelGericht
+from models.bestellungen import Bestellungen
+from models.bestellposition import Bestellposition
+from utils.prefix_index import PrefixIndex
+
+TYPEN = ("gericht", "restaurant", "kochstil", "label")
+
+# Wie beim Such-Index: ein Index pro Prozess, periodisch neu aufgebaut
+AUTOCOMPLETE_MAX_ALTER = int(os.getenv("AUTOCOMPLETE_MAX_ALTER", "300"))
+# Maximales Alter der Ranglisten kurzer Prefixe (Popularität ändert sich bei jedem Checkout)
+AUTOCOMPLETE_KURZ_MAX_ALTER = float(os.getenv("AUTOCOMPLETE_KURZ_MAX_ALTER", "30"))
+
+_index = PrefixIndex(kurz_max_alter=AUTOCOMPLETE_KURZ_MAX_ALTER)
+_aufgebaut_am: Optional[float] = None
+
+
+class AutocompleteService:
+    """
+    Typeahead über Gerichte, Restaurants, Kochstile und Labels.
+    Popularität = bestellte Menge (Gerichte), Anzahl Bestellungen (Restaurants),
+    summiert über die zugeordneten Gerichte bzw. Restaurants (Labels, Kochstile).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ===== POPULARITÄT (Subqueries über abgeschlossene Bestellungen) =====
+
+    def _gericht_mengen(self):
+        return (
+            select(Bestellposition.gerichtid, func.sum(Bestellposition.menge).label("anzahl"))
+            .join(Bestellungen, Bestellungen.bestellungid == Bestellposition.bestellungid)
+            .where(Bestellungen.status != "warenkorb")
+            .group_by(Bestellposition.gerichtid)
+            .subquery()
+        )
+
+    def _restaurant_bestellungen(self):
+        return (
+            select(Bestellungen.restaurantid, func.count().label("anzahl"))
+            .where(Bestellungen.status != "warenkorb", Bestellungen.restaurantid.isnot(None))
+            .group_by(Bestellungen.restaurantid)
+            .subquery()
+        )
+
+    # ===== EINTRÄGE =====
+
+    def _gerichte(self, gerichtid: Optional[int] = None) -> List[dict]:
+        mengen = self._gericht_mengen()
+        query = (
+            self.db.query(
+                Gericht.gerichtid,
+                Gericht.name,
+                Menue.restaurantid,
+                func.coalesce(mengen.c.anzahl, 0)
+            )
+            .join(Menue, Gericht.menuid == Menue.menuid)
+            .outerjoin(mengen, mengen.c.gerichtid == Gericht.gerichtid)
+            .filter(Gericht.ist_aktiv == True)
+        )
+        if gerichtid is not None:
+            query = query.filter(Gericht.gerichtid == gerichtid)
+        return [
+            {"typ": "gericht", "id": gid, "text": name, "restaurantid": rid, "popularitaet": int(anzahl)}
+            for gid, name, rid, anzahl in query.all() if name
+        ]
+
+    def _restaurants(self, restaurantid: Optional[int] = None) -> List[dict]:
+        bestellungen = self._restaurant_bestellungen()
+        query = (
+            self.db.query(Restaurant.restaurantid, Restaurant.name, func.coalesce(bestellungen.c.anzahl, 0))
+            .outerjoin(bestellungen, bestellungen.c.restaurantid == Restaurant.restaurantid)
+        )
+        if restaurantid is not None:
+            query = query.filter(Restaurant.restaurantid == restaurantid)
+        return [
+            {"typ": "restaurant", "id": rid, "text": name, "restaurantid": rid, "popularitaet": int(anzahl)}
+            for rid, name, anzahl in query.all() if name
+        ]
+
+    def _kochstile(self, stilid: Optional[int] = None) -> List[dict]:
+        bestellungen = self._restaurant_bestellungen()
+        query = (
+            self.db.query(Kochstil.stilid, Kochstil.kochstil, func.coalesce(func.sum(bestellungen.c.anzahl), 0))
+            .outerjoin(KochstilRestaurant, KochstilRestaurant.stilid == Kochstil.stilid)
+            .outerjoin(bestellungen, bestellungen.c.restaurantid == KochstilRestaurant.restaurantid)
+            .group_by(Kochstil.stilid, Kochstil.kochstil)
+        )
+        if stilid is not None:
+            query = query.filter(Kochstil.stilid == stilid)
+        return [
+            {"typ": "kochstil", "id": sid, "text": name, "restaurantid": None, "popularitaet": int(anzahl)}
+            for sid, name, anzahl in query.all() if name
+        ]
+
+    def _labels(self, labelid: Optional[int] = None) -> List[dict]:
+        mengen = self._gericht_mengen()
+        query = (
+            self.db.query(Label.labelid, Label.labelname, func.coalesce(func.sum(mengen.c.anzahl), 0))
+            .outerjoin(LabelGericht, LabelGericht.labelid == Label.labelid)
+            .outerjoin(mengen, mengen.c.gerichtid == LabelGericht.gerichtid)
+            .group_by(Label.labelid, Label.labelname)
+        )
+        if labelid is not None:
+            query = query.filter(Label.labelid == labelid)
+        return [
+            {"typ": "label", "id": lid, "text": name, "restaurantid": None, "popularitaet": int(anzahl)}
+            for lid, name, anzahl in query.all() if name
+        ]
+
+    # ===== AUFBAU =====
+
+    def aufbauen(self) -> int:
+        """Index komplett aus der DB aufbauen (4 Queries)"""
+        global _aufgebaut_am
+        _index.replace_all(self._gerichte() + self._restaurants() + self._kochstile() + self._labels())
+        _aufgebaut_am = time.monotonic()
+        return len(_index)
+
+    def _sicherstellen(self):
+        if _aufgebaut_am is None or time.monotonic() - _aufgebaut_am > AUTOCOMPLETE_MAX_ALTER:
+            self.aufbauen()
+
+    # ===== INKREMENTELLE UPDATES (nach Commit aufrufen) =====
+
+    def _aktualisieren(self, typ: str, id: int, eintraege: List[dict]):
+        if _aufgebaut_am is None:
+            return
+        if eintraege:
+            _index.upsert(eintraege[0])
+        else:
+            _index.remove(typ, id)
+
+    def gericht_aktualisieren(self, gerichtid: int):
+        self._aktualisieren("gericht", gerichtid, self._gerichte(gerichtid))
+
+    def restaurant_aktualisieren(self, restaurantid: int):
+        self._aktualisieren("restaurant", restaurantid, self._restaurants(restaurantid))
+
+    def kochstil_aktualisieren(self, stilid: int):
+        self._aktualisieren("kochstil", stilid, self._kochstile(stilid))
+
+    def label_aktualisieren(self, labelid: int):
+        self._aktualisieren("label", labelid, self._labels(labelid))
+
+    def entfernen(self, typ: str, id: int):
+        _index.remove(typ, id)
+
+    def bestellung_gezaehlt(self, bestellungid: int):
+        """Popularität von Gerichten und Restaurant nach einem Checkout erhöhen (1 Query)"""
+        if _aufgebaut_am is None:
+            return
+        positionen = (
+            self.db.query(Bestellposition.gerichtid, func.sum(Bestellposition.menge), Bestellungen.restaurantid)
+            .join(Bestellungen, Bestellungen.bestellungid == Bestellposition.bestellungid)
+            .filter(Bestellposition.bestellungid == bestellungid)
+            .group_by(Bestellposition.gerichtid, Bestellungen.restaurantid)
+            .all()
+        )
+        for gerichtid, menge, _ in positionen:
+            _index.add_popularitaet("gericht", gerichtid, int(menge or 0))
+        if positionen and positionen[0][2] is not None:
+            _index.add_popularitaet("restaurant", positionen[0][2], 1)
+
+    # ===== ABFRAGE =====
+
+    def vorschlaege(self, prefix: str, limit: int = 8, typen: Optional[Iterable[str]] = None) -> List[dict]:
+        self._sicherstellen()
+        return _index.top_k(prefix, k=limit, typen=typen)
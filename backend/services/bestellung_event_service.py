@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+from typing import AsyncIterator, Optional
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from models.bestellungen import Bestellungen
+from utils.event_hub import EventHub
+
+# Ein Hub pro Prozess: Events erreichen nur Streams im selben Worker
+SSE_KEEPALIVE_SEKUNDEN = int(os.getenv("SSE_KEEPALIVE_SEKUNDEN", "15"))
+# Max. Anzahl Änderungen pro DB-Read; beim Wiederaufsetzen darüber: 'reset'
+SSE_NACHHOLEN_MAX = 500
+
+_hub = EventHub()
+
+
+def _sse(event: str, daten: dict, event_id: Optional[int] = None) -> str:
+    zeilen = []
+    if event_id is not None:
+        zeilen.append(f"id: {event_id}")
+    zeilen.append(f"event: {event}")
+    zeilen.append(f"data: {json.dumps(daten, ensure_ascii=False, separators=(',', ':'))}")
+    return "\n".join(zeilen) + "\n\n"
+
+
+class BestellungEventService:
+    """Push-Kanal für neue und geänderte Bestellungen pro Restaurant (Server-Sent Events)"""
+
+    # ===== VERÖFFENTLICHEN (nach Commit aufrufen) =====
+
+    @staticmethod
+    def veroeffentlichen(bestellung: Bestellungen, typ: str) -> Optional[int]:
+        """
+        typ: 'neu' (Checkout) oder 'geaendert' (Status/Lieferant)
+        Weckt die Streams des Restaurants; gesendet wird, was sie danach aus der DB lesen
+        """
+        if bestellung.restaurantid is None:
+            return None
+        return _hub.publish(bestellung.restaurantid, {
+            "typ": typ,
+            "bestellungid": bestellung.bestellungid,
+            "restaurantid": bestellung.restaurantid,
+            "status": bestellung.status,
+            "lieferantid": bestellung.lieferantid
+        }, event_id=bestellung.change_seq)
+
+    @staticmethod
+    def _aus_db_lesen(restaurantid: int, cursor: Optional[int]) -> dict:
+        """Änderungen seit cursor; ohne cursor nur den aktuellen Stand als Startpunkt"""
+        from services.bestellung_services import BestellungService
+
+        db = SessionLocal()
+        try:
+            service = BestellungService(db)
+            if cursor is None:
+                return {"items": [], "cursor": service.get_aenderungs_cursor(restaurantid), "has_more": False}
+            return service.get_aenderungen(restaurantid, seit=cursor, limit=SSE_NACHHOLEN_MAX)
+        finally:
+            db.close()
+
+    # ===== STREAM =====
+
+    @staticmethod
+    async def stream(restaurantid: int, cursor: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        SSE-Stream: erst verpasste Events seit cursor (Last-Event-ID), dann live.
+
+        Gesendet wird immer aus der DB (get_aenderungen ab dem Cursor), ein Live-Event
+        ist nur der Anstoß dazu. veroeffentlichen läuft nach dem Commit in beliebigen
+        Threads - change_seq 11 kann vor 10 ankommen. Pro Restaurant werden change_seqs
+        aber in Commit-Reihenfolge vergeben (Migration 010): ist 11 sichtbar, ist es 10
+        auch. Events gehen so lückenlos und geordnet raus, und die Last-Event-ID ist
+        immer ein sicherer Cursor, auch über Worker hinweg.
+        Sind beim Wiederaufsetzen mehr als SSE_NACHHOLEN_MAX Änderungen offen, kommt
+        ein 'reset'-Event - der Client lädt dann seine Bestellliste einmal neu.
+        """
+        # Erst abonnieren, dann den Startpunkt lesen: kein Commit fällt dazwischen durch
+        abo = _hub.subscribe(restaurantid)
+        lesen = BestellungEventService._aus_db_lesen
+        try:
+            yield "retry: 3000\n\n"
+            seite = await run_in_threadpool(lesen, restaurantid, cursor)
+            if seite["has_more"]:
+                yield _sse("reset", {"restaurantid": restaurantid})
+                seite = await run_in_threadpool(lesen, restaurantid, None)
+
+            while True:
+                for item in seite["items"]:
+                    yield _sse("bestellung", {
+                        "id": item["change_seq"],
+                        "typ": item["typ"],
+                        "bestellungid": item["bestellungid"],
+                        "restaurantid": item["restaurantid"],
+                        "status": item["status"],
+                        "lieferantid": item["lieferantid"]
+                    }, item["change_seq"])
+                cursor = seite["cursor"]
+
+                if not seite["has_more"]:
+                    try:
+                        event = await asyncio.wait_for(abo.queue.get(), timeout=SSE_KEEPALIVE_SEKUNDEN)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        seite = {"items": [], "cursor": cursor, "has_more": False}
+                        continue
+                    if event is None:
+                        break  # zu langsam - Client verbindet sich mit Last-Event-ID neu
+                    # Weitere Anstöße zusammenfassen, ein DB-Read deckt sie alle ab
+                    while not abo.queue.empty():
+                        if abo.queue.get_nowait() is None:
+                            return
+                seite = await run_in_threadpool(lesen, restaurantid, cursor)
+        finally:
+            _hub.unsubscribe(abo)
+
+    @staticmethod
+    def anzahl_verbindungen() -> int:
+        return _hub.anzahl_abos()
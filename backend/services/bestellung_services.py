@@ -1,20 +1,21 @@
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
 from models.bestellungen import Bestellungen
 from models.bestellposition import Bestellposition
+from models.lieferant import Lieferant
 from models.preis import Preis
-from models.gericht import Gericht
 from models.restaurant import Restaurant
-from models.lieferant import Lieferant
-from models.adresse import Adresse
-from typing import List, Optional, Type
-from schemas.bestellung_schemas import (
-    RestaurantDetail, LieferantDetail, AdresseDetail,
-    BestellpositionDetail, GerichtDetail, PreisDetail
-)
+from models.bestellung_snapshot import BestellungSnapshot
+from services.bestellung_snapshot_service import BestellungSnapshotService
+from services.bestellung_event_service import BestellungEventService
+from utils.pagination import encode_cursor, decode_cursor
+from typing import Dict, List, Optional, Type
+from schemas.bestellung_schemas import LieferantDetail
 
 class BestellungService:
     def __init__(self, db: Session):
         self.db = db
+        self.snapshot_service = BestellungSnapshotService(db)
 
     def create(self, bestellung_data: dict) -> Bestellungen:
         new_bestellung = Bestellungen(**bestellung_data)
@@ -44,9 +45,89 @@ class BestellungService:
 
         self.db.commit()
         self.db.refresh(bestellung)
+        BestellungEventService.veroeffentlichen(bestellung, "geaendert")
         return bestellung
 
+    def get_aenderungs_cursor(self, restaurantid: int) -> int:
+        """Aktuelle change_seq eines Restaurants (Startpunkt ohne Cursor), Index-Lookup"""
+        return self.db.query(func.max(Bestellungen.change_seq)).filter(
+            Bestellungen.restaurantid == restaurantid,
+            Bestellungen.status != 'warenkorb'
+        ).scalar() or 0
+
+    def get_aenderungen(
+            self,
+            restaurantid: int,
+            seit: int = 0,
+            status: Optional[List[str]] = None,
+            limit: int = 100
+    ) -> dict:
+        """
+        Geänderte Bestellungen eines Restaurants seit change_seq 'seit' (Index
+        restaurantid, change_seq) - kostet O(Änderungen) statt alle Bestellungen zu listen.
+
+        Der Status-Filter läuft im WHERE vor dem LIMIT, damit Seiten voll sind und
+        has_more stimmt; der Cursor ist die change_seq der letzten gelieferten Änderung.
+        Returns: {"items", "cursor", "has_more"}
+        """
+        query = self.db.query(Bestellungen).filter(
+            Bestellungen.restaurantid == restaurantid,
+            Bestellungen.change_seq > seit,
+            Bestellungen.status != 'warenkorb'
+        )
+        if status:
+            query = query.filter(Bestellungen.status.in_(status))
+
+        rows = query.order_by(Bestellungen.change_seq).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "items": [
+                {
+                    "bestellungid": b.bestellungid,
+                    "change_seq": b.change_seq,
+                    "typ": b.change_typ,
+                    "status": b.status,
+                    "kundenid": b.kundenid,
+                    "restaurantid": b.restaurantid,
+                    "lieferantid": b.lieferantid,
+                    "adressid": b.adressid
+                }
+                for b in rows
+            ],
+            "cursor": rows[-1].change_seq if rows else seit,
+            "has_more": has_more
+        }
+
+    def calculate_totals(self, bestellung_ids: List[int]) -> Dict[int, float]:
+        """
+        Gesamtpreise vieler Bestellungen in einer Query: SUM(menge * betrag) pro
+        bestellungid, eingefrorene Snapshot-Summen haben Vorrang
+        """
+        rows = (
+            self.db.query(
+                Bestellungen.bestellungid,
+                func.coalesce(
+                    BestellungSnapshot.gesamtpreis,
+                    func.coalesce(func.sum(Bestellposition.menge * Preis.betrag), 0)
+                )
+            )
+            .outerjoin(BestellungSnapshot, BestellungSnapshot.bestellungid == Bestellungen.bestellungid)
+            .outerjoin(Bestellposition, Bestellposition.bestellungid == Bestellungen.bestellungid)
+            .outerjoin(Preis, Preis.preisid == Bestellposition.preisid)
+            .filter(Bestellungen.bestellungid.in_(bestellung_ids))
+            .group_by(Bestellungen.bestellungid, BestellungSnapshot.gesamtpreis)
+            .all()
+        )
+        return {bestellungid: round(float(total), 2) for bestellungid, total in rows}
+
     def calculate_total(self, bestellungid: int) -> float:
+        snapshot = self.db.get(BestellungSnapshot, bestellungid)
+        if snapshot:
+            return float(snapshot.gesamtpreis)
+
         positionen = self.db.query(Bestellposition).filter(
             Bestellposition.bestellungid == bestellungid
         ).all()
@@ -58,25 +139,160 @@ class BestellungService:
         )
         return round(total, 2)
 
-    def get_by_kunde(self, kundenid: int) -> list[Type[Bestellungen]]:
-        return self.db.query(Bestellungen).filter(
-            Bestellungen.kundenid == kundenid,
-            Bestellungen.status != 'warenkorb'
+    def get_by_kunde(self, kundenid: int) -> list[dict]:
+        """Bestellhistorie inkl. Gesamtpreis aus dem Snapshot (1 Query)"""
+        rows = (
+            self.db.query(Bestellungen, BestellungSnapshot.gesamtpreis)
+            .outerjoin(BestellungSnapshot, BestellungSnapshot.bestellungid == Bestellungen.bestellungid)
+            .filter(
+                Bestellungen.kundenid == kundenid,
+                Bestellungen.status != 'warenkorb'
+            )
+            .all()
+        )
+        return [
+            {
+                "bestellungid": bestellung.bestellungid,
+                "status": bestellung.status,
+                "kundenid": bestellung.kundenid,
+                "restaurantid": bestellung.restaurantid,
+                "adressid": bestellung.adressid,
+                "lieferantid": bestellung.lieferantid,
+                "gesamtpreis": float(gesamtpreis) if gesamtpreis is not None else None
+            }
+            for bestellung, gesamtpreis in rows
+        ]
+
+    def get_historie_seite(
+            self,
+            kundenid: int,
+            limit: int = 20,
+            cursor: Optional[str] = None,
+            status: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Eine Seite der Bestellhistorie, neueste zuerst (Keyset auf bestellungid)
+
+        Restaurantname, Anzahl Artikel und Gesamtpreis kommen aus einer gruppierten
+        Query - Snapshot-Werte haben Vorrang, ältere Bestellungen werden aus den
+        Positionen summiert. Eine Seite kostet damit genau 1 Query.
+
+        Raises:
+            ValueError: Bei ungültigem Cursor
+        """
+        summe = func.coalesce(func.sum(Bestellposition.menge * Preis.betrag), 0)
+        anzahl = func.coalesce(func.sum(Bestellposition.menge), 0)
+
+        query = (
+            self.db.query(
+                Bestellungen.bestellungid,
+                Bestellungen.status,
+                Bestellungen.kundenid,
+                Bestellungen.restaurantid,
+                Bestellungen.lieferantid,
+                Bestellungen.adressid,
+                Restaurant.name.label("restaurantname"),
+                func.coalesce(BestellungSnapshot.anzahl_positionen, anzahl).label("anzahl_positionen"),
+                func.coalesce(BestellungSnapshot.gesamtpreis, summe).label("gesamtpreis")
+            )
+            .outerjoin(Restaurant, Restaurant.restaurantid == Bestellungen.restaurantid)
+            .outerjoin(BestellungSnapshot, BestellungSnapshot.bestellungid == Bestellungen.bestellungid)
+            .outerjoin(Bestellposition, Bestellposition.bestellungid == Bestellungen.bestellungid)
+            .outerjoin(Preis, Preis.preisid == Bestellposition.preisid)
+            .filter(
+                Bestellungen.kundenid == kundenid,
+                Bestellungen.status != 'warenkorb'
+            )
+        )
+
+        if status:
+            query = query.filter(Bestellungen.status.in_(status))
+
+        if cursor:
+            try:
+                letzte_id = int(decode_cursor(cursor)["id"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Ungültiger Cursor")
+            query = query.filter(Bestellungen.bestellungid < letzte_id)
+
+        rows = (
+            query
+            .group_by(
+                Bestellungen.bestellungid,
+                Restaurant.name,
+                BestellungSnapshot.anzahl_positionen,
+                BestellungSnapshot.gesamtpreis
+            )
+            .order_by(Bestellungen.bestellungid.desc())
+            .limit(limit + 1)
+            .all()
         )
 
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "items": [
+                {
+                    "bestellungid": row.bestellungid,
+                    "status": row.status,
+                    "kundenid": row.kundenid,
+                    "restaurantid": row.restaurantid,
+                    "restaurantname": row.restaurantname,
+                    "lieferantid": row.lieferantid,
+                    "adressid": row.adressid,
+                    "anzahl_positionen": int(row.anzahl_positionen),
+                    "gesamtpreis": round(float(row.gesamtpreis), 2)
+                }
+                for row in rows
+            ],
+            "next_cursor": encode_cursor({"id": rows[-1].bestellungid}) if has_more else None,
+            "has_more": has_more
+        }
+
     def get_detail_by_id(self, bestellungid: int) -> Optional[dict]:
         """
         Gibt eine Bestellung mit ALLEN Details zurück
+        Positionen, Preise, Restaurant und Adresse aus dem beim Checkout eingefrorenen
+        Snapshot; Status und Lieferant aktuell (1 Query)
         """
-        # Hole die Bestellung
-        bestellung = self.db.query(Bestellungen).filter(
-            Bestellungen.bestellungid == bestellungid
-        ).first()
+        details = self.get_details_bulk([bestellungid])
+        return details[0] if details else None
 
-        if not bestellung:
-            return None
+    def get_details_bulk(self, bestellung_ids: List[int]) -> List[dict]:
+        """
+        Details für viele Bestellungen in fester Anzahl Queries (Reihenfolge wie bestellung_ids):
+        1 Query für Bestellungen + Lieferanten + Snapshots, fehlende Snapshots werden
+        gemeinsam eingefroren (1 Query + 1 Insert)
+        """
+        rows = (
+            self.db.query(Bestellungen, Lieferant, BestellungSnapshot)
+            .outerjoin(Lieferant, Lieferant.lieferantid == Bestellungen.lieferantid)
+            .outerjoin(BestellungSnapshot, BestellungSnapshot.bestellungid == Bestellungen.bestellungid)
+            .filter(Bestellungen.bestellungid.in_(bestellung_ids))
+            .all()
+        )
+
+        fehlend = [
+            bestellung.bestellungid for bestellung, _, snapshot in rows
+            if snapshot is None and bestellung.status != "warenkorb"
+        ]
+        nachgeholt = {}
+        if fehlend:
+            nachgeholt = self.snapshot_service.erstellen_bulk(fehlend)
+            self.db.commit()
+
+        nach_id = {
+            bestellung.bestellungid: self._detail(
+                bestellung, lieferant, snapshot or nachgeholt.get(bestellung.bestellungid)
+            )
+            for bestellung, lieferant, snapshot in rows
+        }
+        return [nach_id[i] for i in dict.fromkeys(bestellung_ids) if i in nach_id]
 
-        if bestellung.status == "warenkorb":
+    def _detail(self, bestellung: Bestellungen, lieferant: Optional[Lieferant],
+                snapshot: Optional[BestellungSnapshot]) -> dict:
+        if bestellung.status == "warenkorb" or snapshot is None:
             return {
                 "bestellungid": bestellung.bestellungid,
                 "kundenid": bestellung.kundenid,
@@ -88,74 +304,14 @@ class BestellungService:
                 "gesamtpreis": 0
             }
 
-        # Hole Restaurant
-        restaurant = self.db.query(Restaurant).filter(
-            Restaurant.restaurantid == bestellung.restaurantid
-        ).first()
-
-        # Hole Lieferant
-        lieferant = self.db.query(Lieferant).filter(
-            Lieferant.lieferantid == bestellung.lieferantid
-        ).first()
-
-        # Hole Adresse
-        adresse = self.db.query(Adresse).filter(
-            Adresse.adresseid == bestellung.adressid
-        ).first()
-
-        # Hole ALLE Positionen - hier ist der wichtige Teil!
-        positionen = self.db.query(Bestellposition).filter(
-            Bestellposition.bestellungid == bestellungid
-        ).all()
-
-        # Lade für jede Position das Gericht und den Preis
-        positionen_mit_details = []
-        gesamtpreis = 0
-
-        for pos in positionen:
-            gericht = self.db.query(Gericht).filter(
-                Gericht.gerichtid == pos.gerichtid
-            ).first()
-
-            preis = self.db.query(Preis).filter(
-                Preis.preisid == pos.preisid
-            ).first()
-
-            if gericht and preis:
-                zwischensumme = pos.menge * float(preis.betrag)
-                gesamtpreis += zwischensumme
-
-                positionen_mit_details.append(
-                    BestellpositionDetail(
-                        positionid=pos.positionid,
-                        menge=pos.menge,
-                        aenderungswunsch=pos.aenderungswunsch,
-                        gericht=GerichtDetail(
-                            gerichtid=gericht.gerichtid,
-                            name=gericht.name,
-                            beschreibung=gericht.beschreibung,
-                            kategorie=gericht.kategorie
-                        ),
-                        preis=PreisDetail(
-                            preisid=preis.preisid,
-                            betrag=float(preis.betrag)
-                        ),
-                        zwischensumme=zwischensumme
-                    )
-                )
+        dokument = self.snapshot_service.dokument(snapshot)
 
         # Baue Response
         return {
             "bestellungid": bestellung.bestellungid,
             "kundenid": bestellung.kundenid,
             "status": bestellung.status,
-            "restaurant": RestaurantDetail(
-                restaurantid=restaurant.restaurantid,
-                name=restaurant.name,
-                klassifizierung=restaurant.klassifizierung,
-                telefon=restaurant.telefon,
-                kuechenchef=restaurant.kuechenchef
-            ) if restaurant else None,
+            "restaurant": dokument["restaurant"],
 
             "lieferant": LieferantDetail(
                 lieferantid=lieferant.lieferantid,
@@ -165,17 +321,9 @@ class BestellungService:
                 vollstaendiger_name=f"{lieferant.vorname or ''} {lieferant.nachname or ''}".strip()
             ) if lieferant else None,
 
-            "lieferadresse": AdresseDetail(
-                adresseid=adresse.adresseid,
-                straße=adresse.straße,
-                hausnummer=adresse.hausnummer,
-                postleitzahl=adresse.postleitzahl,
-                ort=adresse.ort,
-                land=adresse.land,
-                vollstaendige_adresse=f"{adresse.straße} {adresse.hausnummer}, {adresse.postleitzahl} {adresse.ort}"
-            ) if adresse else None,
+            "lieferadresse": dokument["lieferadresse"],
 
-            "positionen": positionen_mit_details,
+            "positionen": dokument["positionen"],
 
-            "gesamtpreis": round(gesamtpreis, 2)
-        }
\ No newline at end of file
+            "gesamtpreis": dokument["gesamtpreis"]
+        }
@@ -0,0 +1,161 @@
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List, Optional
+
+from models.bestellungen import Bestellungen
+from models.bestellposition import Bestellposition
+from models.bestellung_snapshot import BestellungSnapshot
+from models.gericht import Gericht
+from models.preis import Preis
+from models.restaurant import Restaurant
+from models.adresse import Adresse
+
+
+class BestellungSnapshotService:
+    """
+    Unveränderliche Bestell-Dokumente, beim Checkout eingefroren.
+    Preise bleiben historisch korrekt, auch wenn Preis-Zeilen später geändert werden.
+    Status und Lieferant bleiben veränderlich und werden nicht eingefroren.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ===== SCHREIBEN (ohne Commit, in der Checkout-Transaktion) =====
+
+    def erstellen(self, bestellungid: int) -> Optional[BestellungSnapshot]:
+        """Bestellung mit Restaurant, Adresse und Positionen in einer Query lesen und einfrieren"""
+        return self.erstellen_bulk([bestellungid]).get(bestellungid)
+
+    def erstellen_bulk(self, bestellung_ids: List[int]) -> Dict[int, BestellungSnapshot]:
+        """Wie erstellen(), für beliebig viele Bestellungen mit 1 Query + 1 Insert"""
+        if not bestellung_ids:
+            return {}
+
+        self.db.flush()
+        rows = (
+            self.db.query(
+                Bestellungen.bestellungid,
+                Bestellungen.kundenid,
+                Restaurant.restaurantid,
+                Restaurant.name.label("restaurantname"),
+                Restaurant.klassifizierung,
+                Restaurant.telefon,
+                Restaurant.kuechenchef,
+                Adresse.adresseid,
+                Adresse.straße,
+                Adresse.hausnummer,
+                Adresse.postleitzahl,
+                Adresse.ort,
+                Adresse.land,
+                Bestellposition.positionid,
+                Bestellposition.menge,
+                Bestellposition.aenderungswunsch,
+                Gericht.gerichtid,
+                Gericht.name.label("gerichtname"),
+                Gericht.beschreibung,
+                Gericht.kategorie,
+                Preis.preisid,
+                Preis.betrag
+            )
+            .outerjoin(Restaurant, Restaurant.restaurantid == Bestellungen.restaurantid)
+            .outerjoin(Adresse, Adresse.adresseid == Bestellungen.adressid)
+            .outerjoin(Bestellposition, Bestellposition.bestellungid == Bestellungen.bestellungid)
+            .outerjoin(Gericht, Gericht.gerichtid == Bestellposition.gerichtid)
+            .outerjoin(Preis, Preis.preisid == Bestellposition.preisid)
+            .filter(Bestellungen.bestellungid.in_(bestellung_ids))
+            .order_by(Bestellungen.bestellungid, Bestellposition.positionid)
+            .all()
+        )
+        if not rows:
+            return {}
+
+        pro_bestellung = defaultdict(list)
+        for row in rows:
+            pro_bestellung[row.bestellungid].append(row)
+
+        jetzt = datetime.now(timezone.utc)
+        werte = [self._werte(bestellung_rows, jetzt) for bestellung_rows in pro_bestellung.values()]
+
+        # Einmal geschrieben, nie überschrieben
+        self.db.execute(insert(BestellungSnapshot).values(werte).on_conflict_do_nothing())
+        return {w["bestellungid"]: BestellungSnapshot(**w) for w in werte}
+
+    @staticmethod
+    def _werte(rows, jetzt: datetime) -> dict:
+        kopf = rows[0]
+        positionen = []
+        gesamtpreis = 0.0
+        for row in rows:
+            if row.positionid is None or row.gerichtid is None or row.preisid is None:
+                continue
+            betrag = float(row.betrag or 0)
+            zwischensumme = row.menge * betrag
+            gesamtpreis += zwischensumme
+            positionen.append({
+                "positionid": row.positionid,
+                "menge": row.menge,
+                "aenderungswunsch": row.aenderungswunsch,
+                "gericht": {
+                    "gerichtid": row.gerichtid,
+                    "name": row.gerichtname,
+                    "beschreibung": row.beschreibung,
+                    "kategorie": row.kategorie
+                },
+                "preis": {"preisid": row.preisid, "betrag": betrag},
+                "zwischensumme": zwischensumme
+            })
+
+        dokument = {
+            "restaurant": {
+                "restaurantid": kopf.restaurantid,
+                "name": kopf.restaurantname,
+                "klassifizierung": kopf.klassifizierung,
+                "telefon": kopf.telefon,
+                "kuechenchef": kopf.kuechenchef
+            } if kopf.restaurantid else None,
+            "lieferadresse": {
+                "adresseid": kopf.adresseid,
+                "straße": kopf.straße,
+                "hausnummer": kopf.hausnummer,
+                "postleitzahl": kopf.postleitzahl,
+                "ort": kopf.ort,
+                "land": kopf.land,
+                "vollstaendige_adresse": f"{kopf.straße} {kopf.hausnummer}, {kopf.postleitzahl} {kopf.ort}"
+            } if kopf.adresseid else None,
+            "positionen": positionen,
+            "gesamtpreis": round(gesamtpreis, 2)
+        }
+
+        return {
+            "bestellungid": kopf.bestellungid,
+            "kundenid": kopf.kundenid,
+            "restaurantid": kopf.restaurantid,
+            "gesamtpreis": round(gesamtpreis, 2),
+            "anzahl_positionen": sum(p["menge"] for p in positionen),
+            "dokument": json.dumps(dokument, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            "erstellt_am": jetzt
+        }
+
+    # ===== LESEN =====
+
+    @staticmethod
+    def dokument(snapshot: BestellungSnapshot) -> dict:
+        return json.loads(snapshot.dokument)
+
+    def get_or_create(self, bestellungid: int) -> Optional[BestellungSnapshot]:
+        """
+        Snapshot lesen; Bestellungen von vor Einführung der Snapshots werden beim
+        ersten Abruf mit den dann gültigen Daten eingefroren
+        """
+        snapshot = self.db.get(BestellungSnapshot, bestellungid)
+        if snapshot:
+            return snapshot
+
+        snapshot = self.erstellen(bestellungid)
+        if snapshot:
+            self.db.commit()
+        return snapshot
@@ -0,0 +1,328 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select, update
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional, List, Dict
+
+from models.bewertung import Bewertung
+from models.bewertungkritiker import Bewertungkritiker
+from models.bewertung_aggregat import BewertungAggregatGericht, BewertungAggregatRestaurant
+from models.gericht import Gericht
+from models.menue import Menue
+from models.restaurant import Restaurant
+
+STERNE = (1, 2, 3, 4, 5)
+ZAEHLER = (
+    "anzahl_kunden", "summe_kunden", "anzahl_kritiker", "summe_kritiker",
+    "sterne_1", "sterne_2", "sterne_3", "sterne_4", "sterne_5"
+)
+
+
+def leere_bewertungen() -> dict:
+    """Aggregat für Restaurants ohne (aktive) Bewertungen"""
+    return {
+        "durchschnitt_gesamt": 0.0,
+        "anzahl_gesamt": 0,
+        "anzahl_kunden": 0,
+        "anzahl_kritiker": 0,
+        "durchschnitt_kunden": None,
+        "durchschnitt_kritiker": None
+    }
+
+
+class BewertungAggregatService:
+    """
+    Pflegt die vorberechneten Bewertungs-Aggregate pro Gericht und Restaurant.
+
+    Die Pflege-Methoden committen NICHT, sie laufen in der Transaktion des
+    aufrufenden Services (BewertungService, BewertungkritikerService, GerichtService).
+    Das Restaurant-Aggregat enthält nur Bewertungen aktiver Gerichte.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ===== LESEN =====
+
+    def get_fuer_restaurants(self, restaurant_ids: List[int]) -> Dict[int, dict]:
+        """Aggregierte Bewertungen für mehrere Restaurants (1 Query, PK-Lookup)"""
+        if not restaurant_ids:
+            return {}
+
+        rows = (
+            self.db.query(BewertungAggregatRestaurant)
+            .filter(BewertungAggregatRestaurant.restaurantid.in_(restaurant_ids))
+            .all()
+        )
+        by_id = {row.restaurantid: row for row in rows}
+        return {rest_id: self.als_dict(by_id.get(rest_id)) for rest_id in restaurant_ids}
+
+    def get_fuer_restaurant(self, restaurant_id: int, mit_verteilung: bool = False) -> dict:
+        """Aggregierte Bewertungen für ein Restaurant"""
+        row = self.db.get(BewertungAggregatRestaurant, restaurant_id)
+        return self.als_dict(row, mit_verteilung)
+
+    def get_fuer_gericht(self, gericht_id: int, mit_verteilung: bool = False) -> dict:
+        """Aggregierte Bewertungen für ein Gericht"""
+        row = self.db.get(BewertungAggregatGericht, gericht_id)
+        return self.als_dict(row, mit_verteilung)
+
+    @staticmethod
+    def als_dict(row, mit_verteilung: bool = False) -> dict:
+        result = leere_bewertungen()
+        if mit_verteilung:
+            result["min_rating"] = row.min_rating if row else None
+            result["max_rating"] = row.max_rating if row else None
+            result["verteilung"] = {
+                stern: (getattr(row, f"sterne_{stern}") if row else 0) for stern in STERNE
+            }
+
+        if not row:
+            return result
+
+        anzahl_kunden = row.anzahl_kunden
+        anzahl_kritiker = row.anzahl_kritiker
+        anzahl_gesamt = anzahl_kunden + anzahl_kritiker
+        durchschnitt_kunden = row.summe_kunden / anzahl_kunden if anzahl_kunden > 0 else None
+        durchschnitt_kritiker = row.summe_kritiker / anzahl_kritiker if anzahl_kritiker > 0 else None
+        durchschnitt_gesamt = (
+            (row.summe_kunden + row.summe_kritiker) / anzahl_gesamt if anzahl_gesamt > 0 else 0.0
+        )
+
+        result.update({
+            "durchschnitt_gesamt": round(durchschnitt_gesamt, 2),
+            "anzahl_gesamt": anzahl_gesamt,
+            "anzahl_kunden": anzahl_kunden,
+            "anzahl_kritiker": anzahl_kritiker,
+            "durchschnitt_kunden": round(durchschnitt_kunden, 2) if durchschnitt_kunden else None,
+            "durchschnitt_kritiker": round(durchschnitt_kritiker, 2) if durchschnitt_kritiker else None
+        })
+        return result
+
+    # ===== INKREMENTELLE PFLEGE =====
+
+    def bewertung_hinzugefuegt(self, gerichtid: Optional[int], rating: Optional[int], quelle: str):
+        """quelle: 'kunden' oder 'kritiker'"""
+        self._anwenden(gerichtid, rating, quelle, 1)
+
+    def bewertung_entfernt(self, gerichtid: Optional[int], rating: Optional[int], quelle: str):
+        self._anwenden(gerichtid, rating, quelle, -1)
+
+    def bewertung_geaendert(self, quelle: str,
+                            alt_gerichtid: Optional[int], alt_rating: Optional[int],
+                            neu_gerichtid: Optional[int], neu_rating: Optional[int]):
+        if alt_gerichtid == neu_gerichtid and alt_rating == neu_rating:
+            return
+        self._anwenden(alt_gerichtid, alt_rating, quelle, -1)
+        self._anwenden(neu_gerichtid, neu_rating, quelle, 1)
+
+    def _anwenden(self, gerichtid: Optional[int], rating: Optional[int], quelle: str, delta: int):
+        if gerichtid is None or rating is None:
+            return
+
+        gericht = (
+            self.db.query(Gericht.ist_aktiv, Menue.restaurantid)
+            .outerjoin(Menue, Gericht.menuid == Menue.menuid)
+            .filter(Gericht.gerichtid == gerichtid)
+            .first()
+        )
+        restaurantid = gericht.restaurantid if gericht else None
+
+        self._delta_schreiben(
+            BewertungAggregatGericht,
+            {"gerichtid": gerichtid, "restaurantid": restaurantid},
+            BewertungAggregatGericht.gerichtid == gerichtid,
+            rating, quelle, delta
+        )
+
+        if restaurantid is not None and gericht.ist_aktiv:
+            self._delta_schreiben(
+                BewertungAggregatRestaurant,
+                {"restaurantid": restaurantid},
+                BewertungAggregatRestaurant.restaurantid == restaurantid,
+                rating, quelle, delta
+            )
+
+    def _delta_schreiben(self, model, schluessel: dict, bedingung, rating: int, quelle: str, delta: int):
+        """
+        Atomares Inkrement in SQL (col = col + delta), damit parallele Requests
+        sich nicht gegenseitig überschreiben. Min/Max folgen aus dem Histogramm.
+        """
+        self.db.execute(insert(model).values(**schluessel).on_conflict_do_nothing())
+
+        werte = {
+            f"anzahl_{quelle}": getattr(model, f"anzahl_{quelle}") + delta,
+            f"summe_{quelle}": getattr(model, f"summe_{quelle}") + delta * rating,
+        }
+
+        neue_sterne = {}
+        for stern in STERNE:
+            spalte = getattr(model, f"sterne_{stern}")
+            neue_sterne[stern] = spalte + delta if stern == rating else spalte
+        if rating in STERNE:
+            werte[f"sterne_{rating}"] = neue_sterne[rating]
+
+        werte["min_rating"] = case(*[(neue_sterne[s] > 0, s) for s in STERNE], else_=None)
+        werte["max_rating"] = case(*[(neue_sterne[s] > 0, s) for s in reversed(STERNE)], else_=None)
+
+        self.db.execute(
+            update(model)
+            .where(bedingung)
+            .values(**werte)
+            .execution_options(synchronize_session=False)
+        )
+
+    def gericht_geaendert(self, gerichtid: int, alt_restaurantid: Optional[int] = None):
+        """
+        Nach Deaktivierung oder Menü-Wechsel eines Gerichts: Restaurant-Zuordnung
+        des Gericht-Aggregats nachziehen und betroffene Restaurants neu summieren.
+        """
+        self.db.flush()
+        neu_restaurantid = (
+            self.db.query(Menue.restaurantid)
+            .join(Gericht, Gericht.menuid == Menue.menuid)
+            .filter(Gericht.gerichtid == gerichtid)
+            .scalar()
+        )
+
+        self.db.execute(
+            update(BewertungAggregatGericht)
+            .where(BewertungAggregatGericht.gerichtid == gerichtid)
+            .values(restaurantid=neu_restaurantid)
+            .execution_options(synchronize_session=False)
+        )
+
+        for restaurantid in {alt_restaurantid, neu_restaurantid}:
+            if restaurantid is not None:
+                self.restaurant_neu_summieren(restaurantid)
+
+    def menue_verschoben(self, menuid: int, alt_restaurantid: Optional[int], neu_restaurantid: Optional[int]):
+        """
+        Nach Wechsel eines Menüs in ein anderes Restaurant: Gericht-Aggregate aller
+        Gerichte des Menüs umhängen (1 Update) und beide Restaurants neu summieren.
+        """
+        self.db.flush()
+        self.db.execute(
+            update(BewertungAggregatGericht)
+            .where(BewertungAggregatGericht.gerichtid.in_(
+                select(Gericht.gerichtid).where(Gericht.menuid == menuid)
+            ))
+            .values(restaurantid=neu_restaurantid)
+            .execution_options(synchronize_session=False)
+        )
+
+        for restaurantid in {alt_restaurantid, neu_restaurantid}:
+            if restaurantid is not None:
+                self.restaurant_neu_summieren(restaurantid)
+
+    def restaurant_neu_summieren(self, restaurant_id: int):
+        """Restaurant-Aggregat aus den Gericht-Aggregaten aktiver Gerichte bilden (1 Query)"""
+        self.db.flush()
+        summen = (
+            self.db.query(*[
+                func.coalesce(func.sum(getattr(BewertungAggregatGericht, spalte)), 0)
+                for spalte in ZAEHLER
+            ])
+            .join(Gericht, Gericht.gerichtid == BewertungAggregatGericht.gerichtid)
+            .filter(BewertungAggregatGericht.restaurantid == restaurant_id)
+            .filter(Gericht.ist_aktiv == True)
+            .one()
+        )
+        werte = {spalte: int(wert) for spalte, wert in zip(ZAEHLER, summen)}
+        werte.update(self._min_max(werte))
+
+        self.db.execute(
+            insert(BewertungAggregatRestaurant)
+            .values(restaurantid=restaurant_id, **werte)
+            .on_conflict_do_update(index_elements=["restaurantid"], set_=werte)
+        )
+
+    @staticmethod
+    def _min_max(werte: dict) -> dict:
+        vorhanden = [stern for stern in STERNE if werte.get(f"sterne_{stern}", 0) > 0]
+        return {
+            "min_rating": min(vorhanden) if vorhanden else None,
+            "max_rating": max(vorhanden) if vorhanden else None
+        }
+
+    # ===== REBUILD =====
+
+    def rebuild(self) -> dict:
+        """
+        Alle Aggregate aus den Rohdaten neu aufbauen (Drift-Abgleich).
+        Ein gruppierter Query pro Bewertungstabelle, danach Bulk-Insert.
+        """
+        self.db.query(BewertungAggregatRestaurant).delete(synchronize_session=False)
+        self.db.query(BewertungAggregatGericht).delete(synchronize_session=False)
+
+        gerichte: Dict[int, dict] = {}
+        for quelle, model in (("kunden", Bewertung), ("kritiker", Bewertungkritiker)):
+            rows = (
+                self.db.query(
+                    model.gerichtid,
+                    func.count(model.rating),
+                    func.coalesce(func.sum(model.rating), 0),
+                    *[func.count().filter(model.rating == stern) for stern in STERNE]
+                )
+                .filter(model.gerichtid.isnot(None), model.rating.isnot(None))
+                .group_by(model.gerichtid)
+                .all()
+            )
+            for gerichtid, anzahl, summe, *sterne in rows:
+                werte = gerichte.setdefault(gerichtid, {spalte: 0 for spalte in ZAEHLER})
+                werte[f"anzahl_{quelle}"] += anzahl
+                werte[f"summe_{quelle}"] += int(summe)
+                for stern, anzahl_stern in zip(STERNE, sterne):
+                    werte[f"sterne_{stern}"] += anzahl_stern
+
+        if not gerichte:
+            self._leere_restaurants_anlegen()
+            self.db.commit()
+            return {"gerichte": 0, "restaurants": 0}
+
+        zuordnung = {
+            row.gerichtid: row
+            for row in (
+                self.db.query(Gericht.gerichtid, Gericht.ist_aktiv, Menue.restaurantid)
+                .outerjoin(Menue, Gericht.menuid == Menue.menuid)
+                .filter(Gericht.gerichtid.in_(gerichte.keys()))
+                .all()
+            )
+        }
+
+        gericht_rows = []
+        restaurants: Dict[int, dict] = {}
+        for gerichtid, werte in gerichte.items():
+            gericht = zuordnung.get(gerichtid)
+            if not gericht:
+                continue  # Bewertung auf nicht (mehr) existierendes Gericht
+            restaurantid = gericht.restaurantid
+            gericht_rows.append({
+                "gerichtid": gerichtid, "restaurantid": restaurantid, **werte, **self._min_max(werte)
+            })
+
+            if restaurantid is not None and gericht.ist_aktiv:
+                summe = restaurants.setdefault(restaurantid, {spalte: 0 for spalte in ZAEHLER})
+                for spalte in ZAEHLER:
+                    summe[spalte] += werte[spalte]
+
+        restaurant_rows = [
+            {"restaurantid": restaurantid, **werte, **self._min_max(werte)}
+            for restaurantid, werte in restaurants.items()
+        ]
+
+        if gericht_rows:
+            self.db.execute(insert(BewertungAggregatGericht), gericht_rows)
+        if restaurant_rows:
+            self.db.execute(insert(BewertungAggregatRestaurant), restaurant_rows)
+        self._leere_restaurants_anlegen()
+
+        self.db.commit()
+        return {"gerichte": len(gericht_rows), "restaurants": len(restaurant_rows)}
+
+    def _leere_restaurants_anlegen(self):
+        """Jedes Restaurant hat eine Aggregat-Zeile (Restaurant-Liste sortiert ohne Outer Join)"""
+        self.db.execute(
+            insert(BewertungAggregatRestaurant)
+            .from_select(["restaurantid"], select(Restaurant.restaurantid))
+            .on_conflict_do_nothing()
+        )
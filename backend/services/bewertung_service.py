@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from models.bewertung import Bewertung
+from services.bewertung_aggregat_service import BewertungAggregatService
 from typing import List, Optional
 
 class BewertungService:
     def __init__(self, db: Session):
         self.db = db
+        self.aggregat_service = BewertungAggregatService(db)
     
     def get_all(self) -> list[type[Bewertung]]:
         return self.db.query(Bewertung).all()
@@ -21,6 +23,7 @@ class BewertungService:
     def create(self, bewertung_data: dict) -> Bewertung:
         bewertung = Bewertung(**bewertung_data)
         self.db.add(bewertung)
+        self.aggregat_service.bewertung_hinzugefuegt(bewertung.gerichtid, bewertung.rating, "kunden")
         self.db.commit()
         self.db.refresh(bewertung)
         return bewertung
@@ -29,10 +32,16 @@ class BewertungService:
         bewertung = self.get_by_id(bewertungid)
         if not bewertung:
             return None
+
+        alt_gerichtid, alt_rating = bewertung.gerichtid, bewertung.rating
         
         for key, value in update_data.items():
             if value is not None:  # Only update fields that are provided
                 setattr(bewertung, key, value)
+
+        self.aggregat_service.bewertung_geaendert(
+            "kunden", alt_gerichtid, alt_rating, bewertung.gerichtid, bewertung.rating
+        )
         
         self.db.commit()
         self.db.refresh(bewertung)
@@ -42,6 +51,7 @@ class BewertungService:
         bewertung = self.get_by_id(bewertungid)
         if not bewertung:
             return False
+        self.aggregat_service.bewertung_entfernt(bewertung.gerichtid, bewertung.rating, "kunden")
         self.db.delete(bewertung)
         self.db.commit()
         return True
\ No newline at end of file
@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from models.bewertungkritiker import Bewertungkritiker
+from services.bewertung_aggregat_service import BewertungAggregatService
 from typing import List, Optional
 
 class BewertungkritikerService:
     def __init__(self, db: Session):
         self.db = db
+        self.aggregat_service = BewertungAggregatService(db)
 
     def get_all(self) -> List[Bewertungkritiker]:
         # KORRIGIERT: Filter 'is_active' entfernt
@@ -18,29 +20,41 @@ class BewertungkritikerService:
     def create(self, bewertungkritiker_data: dict) -> Bewertungkritiker:
         bewertungkritiker = Bewertungkritiker(**bewertungkritiker_data)
         self.db.add(bewertungkritiker)
+        self.aggregat_service.bewertung_hinzugefuegt(
+            bewertungkritiker.gerichtid, bewertungkritiker.rating, "kritiker"
+        )
         self.db.commit()
         self.db.refresh(bewertungkritiker)
         return bewertungkritiker
 
-    def update(self, bewertungkritiker_id: int, update_data: dict) -> Optional[Bewertungkritiker]:
+    def update(self, bewertungkritiker_id: int, update_data: dict, kritikerid: Optional[int] = None) -> Optional[Bewertungkritiker]:
+        """kritikerid gesetzt: nur eigene Bewertungen, fremde verhalten sich wie nicht vorhanden"""
         bewertungkritiker = self.get_by_id(bewertungkritiker_id)
-        if not bewertungkritiker:
+        if not bewertungkritiker or (kritikerid is not None and bewertungkritiker.kritikerid != kritikerid):
             return None
 
+        alt_gerichtid, alt_rating = bewertungkritiker.gerichtid, bewertungkritiker.rating
+
         for key, value in update_data.items():
             if value is not None:
                 setattr(bewertungkritiker, key, value)
 
+        self.aggregat_service.bewertung_geaendert(
+            "kritiker", alt_gerichtid, alt_rating, bewertungkritiker.gerichtid, bewertungkritiker.rating
+        )
+
         self.db.commit()
         self.db.refresh(bewertungkritiker)
         return bewertungkritiker
 
-    def delete(self, bewertungkritiker_id: int) -> bool:
+    def delete(self, bewertungkritiker_id: int, kritikerid: Optional[int] = None) -> bool:
         bewertungkritiker = self.get_by_id(bewertungkritiker_id)
-        if not bewertungkritiker:
+        if not bewertungkritiker or (kritikerid is not None and bewertungkritiker.kritikerid != kritikerid):
             return False
 
-
+        self.aggregat_service.bewertung_entfernt(
+            bewertungkritiker.gerichtid, bewertungkritiker.rating, "kritiker"
+        )
         self.db.delete(bewertungkritiker)
 
         self.db.commit()
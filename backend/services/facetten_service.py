@@ -0,0 +1,214 @@
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
+from typing import Dict, List, Optional
+
+from models.gericht import Gericht
+from models.menue import Menue
+from models.restaurant import Restaurant
+from models.preis import Preis
+from models.label import Label
+from models.labelGericht import LabelGericht
+from models.kochstil import Kochstil
+from models.kochstilrestaurant import KochstilRestaurant
+from utils.facet_index import FacetIndex, UND, ODER
+
+FACETTEN = ("label", "kategorie", "kochstil", "preis")
+
+# (schlüssel, von inkl., bis exkl.) in Euro
+PREIS_STUFEN = (
+    ("bis_8", 0, 8),
+    ("8_12", 8, 12),
+    ("12_20", 12, 20),
+    ("ab_20", 20, None),
+)
+
+FACETTEN_MAX_ALTER = int(os.getenv("FACETTEN_MAX_ALTER", "300"))
+
+_index = FacetIndex(FACETTEN)
+_namen: Dict[str, Dict[int, str]] = {"label": {}, "kochstil": {}}
+_aufgebaut_am: Optional[float] = None
+
+
+def preis_stufe(betrag) -> Optional[str]:
+    if betrag is None:
+        return None
+    betrag = float(betrag)
+    for schluessel, von, bis in PREIS_STUFEN:
+        if betrag >= von and (bis is None or betrag < bis):
+            return schluessel
+    return None
+
+
+class FacettenService:
+    """
+    Kombinierbare Filter über aktive Gerichte (Label, Kategorie, Kochstil des Restaurants,
+    Preisstufe des aktuell gültigen Preises) mit Trefferzahlen pro Facettenwert.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ===== LADEN (4 Queries, optional auf Gerichte/Restaurants eingeschränkt) =====
+
+    def _laden(self, gericht_ids: Optional[List[int]] = None, restaurant_id: Optional[int] = None):
+        query = (
+            self.db.query(
+                Gericht.gerichtid,
+                Gericht.name,
+                Gericht.kategorie,
+                Restaurant.restaurantid,
+                Restaurant.name.label("restaurantname")
+            )
+            .join(Menue, Gericht.menuid == Menue.menuid)
+            .join(Restaurant, Menue.restaurantid == Restaurant.restaurantid)
+            .filter(Gericht.ist_aktiv == True)
+        )
+        if gericht_ids is not None:
+            query = query.filter(Gericht.gerichtid.in_(gericht_ids))
+        if restaurant_id is not None:
+            query = query.filter(Restaurant.restaurantid == restaurant_id)
+        gerichte = query.order_by(Gericht.gerichtid).all()
+        if not gerichte:
+            return []
+
+        ids = [g.gerichtid for g in gerichte]
+        restaurant_ids = {g.restaurantid for g in gerichte}
+
+        labels = defaultdict(set)
+        for gerichtid, labelid in (
+            self.db.query(LabelGericht.gerichtid, LabelGericht.labelid)
+            .filter(LabelGericht.gerichtid.in_(ids))
+        ):
+            labels[gerichtid].add(labelid)
+
+        kochstile = defaultdict(set)
+        for restaurantid, stilid in (
+            self.db.query(KochstilRestaurant.restaurantid, KochstilRestaurant.stilid)
+            .filter(KochstilRestaurant.restaurantid.in_(restaurant_ids))
+        ):
+            kochstile[restaurantid].add(stilid)
+
+        jetzt = datetime.now()
+        preise = dict(
+            self.db.query(Preis.gerichtid, func.min(Preis.betrag))
+            .filter(
+                Preis.gerichtid.in_(ids),
+                Preis.istaktiv == True,
+                or_(Preis.gueltigvon.is_(None), Preis.gueltigvon <= jetzt),
+                or_(Preis.gueltigbis.is_(None), Preis.gueltigbis > jetzt)
+            )
+            .group_by(Preis.gerichtid)
+            .all()
+        )
+
+        docs = []
+        for g in gerichte:
+            betrag = preise.get(g.gerichtid)
+            stufe = preis_stufe(betrag)
+            payload = {
+                "gerichtid": g.gerichtid,
+                "name": g.name,
+                "kategorie": g.kategorie,
+                "restaurantid": g.restaurantid,
+                "restaurantname": g.restaurantname,
+                "preis": float(betrag) if betrag is not None else None
+            }
+            docs.append((g.gerichtid, payload, {
+                "label": labels[g.gerichtid],
+                "kategorie": [g.kategorie] if g.kategorie else [],
+                "kochstil": kochstile[g.restaurantid],
+                "preis": [stufe] if stufe else []
+            }))
+        return docs
+
+    def _namen_laden(self):
+        _namen["label"] = dict(self.db.query(Label.labelid, Label.labelname).all())
+        _namen["kochstil"] = dict(self.db.query(Kochstil.stilid, Kochstil.kochstil).all())
+
+    # ===== AUFBAU =====
+
+    def aufbauen(self) -> int:
+        global _aufgebaut_am
+        _index.replace_all(self._laden())
+        self._namen_laden()
+        _aufgebaut_am = time.monotonic()
+        return len(_index)
+
+    def _sicherstellen(self):
+        # Auch wegen gueltigvon/gueltigbis: Preisstufen ändern sich ohne Schreibzugriff
+        if _aufgebaut_am is None or time.monotonic() - _aufgebaut_am > FACETTEN_MAX_ALTER:
+            self.aufbauen()
+
+    # ===== INKREMENTELLE UPDATES (nach Commit aufrufen) =====
+
+    def gericht_aktualisieren(self, gerichtid: Optional[int]):
+        if _aufgebaut_am is None or gerichtid is None:
+            return
+        docs = self._laden(gericht_ids=[gerichtid])
+        if docs:
+            _index.upsert(*docs[0])
+        else:
+            _index.remove(gerichtid)
+
+    def restaurant_aktualisieren(self, restaurantid: int):
+        if _aufgebaut_am is None:
+            return
+        for doc in self._laden(restaurant_id=restaurantid):
+            _index.upsert(*doc)
+
+    def gericht_entfernen(self, gerichtid: int):
+        _index.remove(gerichtid)
+
+    def namen_aktualisieren(self):
+        if _aufgebaut_am is not None:
+            self._namen_laden()
+
+    # ===== ABFRAGE =====
+
+    def filtern(
+            self,
+            label_ids: Optional[List[int]] = None,
+            label_modus: str = UND,
+            kategorien: Optional[List[str]] = None,
+            kochstil_ids: Optional[List[int]] = None,
+            preis_stufen: Optional[List[str]] = None,
+            limit: int = 20,
+            offset: int = 0
+    ) -> dict:
+        """
+        Innerhalb einer Facette ODER (Labels wahlweise UND), zwischen Facetten UND.
+        Returns: {"total", "items", "facetten": {facette: [{"wert", "name", "anzahl"}]}}
+        """
+        if label_modus not in (UND, ODER):
+            raise ValueError(f"Ungültiger label_modus: {label_modus}")
+        unbekannt = set(preis_stufen or ()) - {s for s, _, _ in PREIS_STUFEN}
+        if unbekannt:
+            raise ValueError(f"Unbekannte Preisstufe: {', '.join(sorted(unbekannt))}")
+
+        self._sicherstellen()
+        total, items, zaehlungen = _index.query({
+            "label": (label_ids, label_modus),
+            "kategorie": (kategorien, ODER),
+            "kochstil": (kochstil_ids, ODER),
+            "preis": (preis_stufen, ODER),
+        }, limit=limit, offset=offset)
+
+        reihenfolge = {s: i for i, (s, _, _) in enumerate(PREIS_STUFEN)}
+        facetten = {}
+        for facette, werte in zaehlungen.items():
+            namen = _namen.get(facette, {})
+            eintraege = [
+                {"wert": str(wert), "name": namen.get(wert) or str(wert), "anzahl": anzahl}
+                for wert, anzahl in werte.items()
+            ]
+            if facette == "preis":
+                eintraege.sort(key=lambda e: reihenfolge[e["wert"]])
+            else:
+                eintraege.sort(key=lambda e: (-e["anzahl"], e["name"]))
+            facetten[facette] = eintraege
+
+        return {"total": total, "items": items, "facetten": facetten}
@@ -1,13 +1,20 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from models.gericht import Gericht
-from models.restaurant import Restaurant
-from models.menue import Menue
-from typing import Optional, List
+from services.bewertung_aggregat_service import BewertungAggregatService
+from services.menue_snapshot_service import MenueSnapshotService
+from services.gericht_suche_service import GerichtSucheService
+from services.autocomplete_service import AutocompleteService
+from services.facetten_service import FacettenService
+from typing import Optional
 
 class GerichtService:
     def __init__(self, db: Session):
         self.db = db
+        self.aggregat_service = BewertungAggregatService(db)
+        self.snapshot_service = MenueSnapshotService(db)
+        self.such_service = GerichtSucheService(db)
+        self.autocomplete_service = AutocompleteService(db)
+        self.facetten_service = FacettenService(db)
 
     def get_all(self) -> list[type[Gericht]]:
         return (
@@ -42,21 +49,42 @@ class GerichtService:
     def create(self, gericht_data: dict) -> Gericht:
         new_gericht = Gericht(**gericht_data)
         self.db.add(new_gericht)
+        self.snapshot_service.invalidieren_fuer_menue(new_gericht.menuid)
         self.db.commit()
         self.db.refresh(new_gericht)
+        self.such_service.gericht_aktualisieren(new_gericht.gerichtid)
+        self.autocomplete_service.gericht_aktualisieren(new_gericht.gerichtid)
+        self.facetten_service.gericht_aktualisieren(new_gericht.gerichtid)
         return new_gericht
 
     def update(self, gerichtid: int, gericht_data: dict) -> Optional[Gericht]:
-        gericht = self.get_by_id(gerichtid)
+        # Ohne ist_aktiv-Filter: auch inaktive Gerichte lassen sich bearbeiten/reaktivieren
+        gericht = self.db.get(Gericht, gerichtid)
         if not gericht:
             return None
 
+        alt_menuid = gericht.menuid
+        alt_ist_aktiv = gericht.ist_aktiv
+        alt_restaurantid = gericht.menue.restaurantid if gericht.menue else None
+
         for key, value in gericht_data.items():
             if value is not None:
                 setattr(gericht, key, value)
 
+        # Bewertungs-Aggregat folgt dem Gericht in das neue Restaurant; bei De- und
+        # Reaktivierung neu summieren (nur aktive Gerichte zählen zum Restaurant)
+        if gericht.menuid != alt_menuid or gericht.ist_aktiv != alt_ist_aktiv:
+            self.aggregat_service.gericht_geaendert(gerichtid, alt_restaurantid)
+
+        self.snapshot_service.invalidieren(alt_restaurantid)
+        if gericht.menuid != alt_menuid:
+            self.snapshot_service.invalidieren_fuer_menue(gericht.menuid)
+
         self.db.commit()
         self.db.refresh(gericht)
+        self.such_service.gericht_aktualisieren(gerichtid)
+        self.autocomplete_service.gericht_aktualisieren(gerichtid)
+        self.facetten_service.gericht_aktualisieren(gerichtid)
         return gericht
 
     def deactivate(self, gerichtid: int) -> Optional[Gericht]:
@@ -68,49 +96,21 @@ class GerichtService:
             return gericht  # bereits deaktiviert
 
         gericht.ist_aktiv = False
+        # Bewertungen inaktiver Gerichte zählen nicht zum Restaurant
+        restaurantid = gericht.menue.restaurantid if gericht.menue else None
+        self.aggregat_service.gericht_geaendert(gerichtid, restaurantid)
+        self.snapshot_service.invalidieren(restaurantid)
         self.db.commit()
         self.db.refresh(gericht)
+        self.such_service.gericht_entfernen(gerichtid)
+        self.autocomplete_service.entfernen("gericht", gerichtid)
+        self.facetten_service.gericht_entfernen(gerichtid)
         return gericht
 
-    # NEU: Suche mit Restaurant-Info
-    def search_with_restaurant(self, query: str, limit: int = 20) -> List[dict]:
+    # Suche über den In-Memory-Index (statt ILIKE-Scan pro Tastendruck)
+    def search_with_restaurant(self, query: str, limit: int = 20, offset: int = 0) -> dict:
         """
-        Sucht Gerichte nach Name, Beschreibung oder Kategorie
-        und gibt Restaurant-Informationen mit zurück
+        Sucht Gerichte nach Name, Beschreibung, Kategorie oder Restaurantname
+        Relevanz-sortiert, tippfehlertolerant, mit Restaurant-Informationen
         """
-        search_pattern = f"%{query}%"
-
-        results = (
-            self.db.query(
-                Gericht.gerichtid,
-                Gericht.name,
-                Gericht.beschreibung,
-                Gericht.kategorie,
-                Restaurant.restaurantid,
-                Restaurant.name.label('restaurantname')
-            )
-            .join(Menue, Gericht.menuid == Menue.menuid)
-            .join(Restaurant, Menue.restaurantid == Restaurant.restaurantid)
-            .filter(
-                or_(
-                    Gericht.name.ilike(search_pattern),
-                    Gericht.beschreibung.ilike(search_pattern),
-                    Gericht.kategorie.ilike(search_pattern)
-                )
-            )
-            .filter(Gericht.ist_aktiv == True)
-            .limit(limit)
-            .all()
-        )
-
-        return [
-            {
-                "gerichtid": r.gerichtid,
-                "name": r.name,
-                "beschreibung": r.beschreibung,
-                "kategorie": r.kategorie,
-                "restaurantid": r.restaurantid,
-                "restaurantname": r.restaurantname
-            }
-            for r in results
-        ]
\ No newline at end of file
+        return self.such_service.suchen(query, limit=limit, offset=offset)
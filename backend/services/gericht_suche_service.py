@@ -0,0 +1,105 @@
+import os
+import time
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from models.gericht import Gericht
+from models.menue import Menue
+from models.restaurant import Restaurant
+from utils.search_index import InvertedIndex
+
+# Ein Index pro Prozess. Bei mehreren Workern sieht jeder Worker nur seine eigenen
+# inkrementellen Updates - deshalb zusätzlich periodischer Neuaufbau.
+SUCH_INDEX_MAX_ALTER = int(os.getenv("SUCH_INDEX_MAX_ALTER", "300"))
+
+_index = InvertedIndex({
+    "name": 3.0,
+    "kategorie": 2.0,
+    "restaurantname": 1.5,
+    "beschreibung": 1.0,
+})
+_aufgebaut_am: Optional[float] = None
+
+
+class GerichtSucheService:
+    """Volltextsuche über aktive Gerichte und Restaurantnamen aus dem In-Memory-Index"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _query(self):
+        return (
+            self.db.query(
+                Gericht.gerichtid,
+                Gericht.name,
+                Gericht.beschreibung,
+                Gericht.kategorie,
+                Restaurant.restaurantid,
+                Restaurant.name.label('restaurantname')
+            )
+            .join(Menue, Gericht.menuid == Menue.menuid)
+            .join(Restaurant, Menue.restaurantid == Restaurant.restaurantid)
+            .filter(Gericht.ist_aktiv == True)
+        )
+
+    @staticmethod
+    def _dokument(r):
+        payload = {
+            "gerichtid": r.gerichtid,
+            "name": r.name,
+            "beschreibung": r.beschreibung,
+            "kategorie": r.kategorie,
+            "restaurantid": r.restaurantid,
+            "restaurantname": r.restaurantname
+        }
+        return r.gerichtid, payload, payload
+
+    # ===== AUFBAU =====
+
+    def aufbauen(self) -> int:
+        """Index komplett aus der DB aufbauen (1 Query)"""
+        global _aufgebaut_am
+        _index.replace_all(self._dokument(r) for r in self._query().all())
+        _aufgebaut_am = time.monotonic()
+        return len(_index)
+
+    def _sicherstellen(self):
+        if _aufgebaut_am is None or time.monotonic() - _aufgebaut_am > SUCH_INDEX_MAX_ALTER:
+            self.aufbauen()
+
+    # ===== INKREMENTELLE UPDATES (nach Commit aufrufen) =====
+
+    def gericht_aktualisieren(self, gerichtid: int):
+        if _aufgebaut_am is None:
+            return
+        row = self._query().filter(Gericht.gerichtid == gerichtid).first()
+        if row:
+            _index.upsert(*self._dokument(row))
+        else:
+            _index.remove(gerichtid)
+
+    def gericht_entfernen(self, gerichtid: int):
+        _index.remove(gerichtid)
+
+    def menue_aktualisieren(self, menuid: int):
+        if _aufgebaut_am is None:
+            return
+        for row in self._query().filter(Menue.menuid == menuid).all():
+            _index.upsert(*self._dokument(row))
+
+    def restaurant_aktualisieren(self, restaurantid: int):
+        if _aufgebaut_am is None:
+            return
+        for row in self._query().filter(Restaurant.restaurantid == restaurantid).all():
+            _index.upsert(*self._dokument(row))
+
+    # ===== SUCHE =====
+
+    def suchen(self, query: str, limit: int = 20, offset: int = 0) -> dict:
+        """
+        Relevanz-sortierte Suche mit Tippfehler-Toleranz
+        Returns: {"total": int, "items": [...]}
+        """
+        self._sicherstellen()
+        total, items = _index.search(query, limit=limit, offset=offset)
+        return {"total": total, "items": items}
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_, event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Callable, Optional
+
+from models.idempotenz_schluessel import IdempotenzSchluessel
+
+# Wie lange eine gespeicherte Antwort für Wiederholungen gilt
+IDEMPOTENZ_TTL_SEKUNDEN = int(os.getenv("IDEMPOTENZ_TTL_SEKUNDEN", "86400"))
+# Nach dieser Zeit darf eine Reservierung übernommen werden, deren Aktion nie committet
+# hat (Absturz vorher). Ausgeführte Aktionen werden nie übernommen, und ein noch
+# laufender erster Request scheitert an seinem Commit, sobald er übernommen wurde.
+IDEMPOTENZ_SPERRE_SEKUNDEN = int(os.getenv("IDEMPOTENZ_SPERRE_SEKUNDEN", "60"))
+
+
+class IdempotenzKonflikt(Exception):
+    """Schlüssel schon mit anderem Body verwendet (422) oder erster Request läuft noch (409)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def fingerprint(endpunkt: str, anfrage: dict) -> str:
+    kanonisch = json.dumps(anfrage, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{endpunkt}\n{kanonisch}".encode("utf-8")).hexdigest()
+
+
+class IdempotenzService:
+    """
+    Idempotency-Keys für nicht-idempotente POSTs (Checkout, Artikel hinzufügen).
+    Der erste Request reserviert den Schlüssel, führt aus und speichert die Antwort;
+    Wiederholungen mit gleichem Schlüssel und Body bekommen diese Antwort zurück,
+    ohne Warenkorb oder Positionen erneut anzufassen.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ausfuehren(
+            self,
+            kundenid: int,
+            endpunkt: str,
+            schluessel: Optional[str],
+            anfrage: dict,
+            aktion: Callable[[], Any]
+    ) -> Any:
+        """
+        aktion() nur ausführen, wenn der Schlüssel neu ist. Ohne Schlüssel wie bisher.
+        Der Schlüssel wird im selben Commit wie die Aktion als ausgeführt markiert: ein
+        Absturz danach führt nie zu einer zweiten Ausführung. Wirft aktion() vor ihrem
+        Commit einen Fehler, wird die Reservierung freigegeben - der Client darf es mit
+        demselben Schlüssel erneut versuchen.
+        """
+        if not schluessel:
+            return aktion()
+
+        fp = fingerprint(endpunkt, anfrage)
+        reserviert_am = self._reservieren(kundenid, endpunkt, schluessel, fp)
+        if reserviert_am is None:
+            return self._gespeicherte_antwort(kundenid, endpunkt, schluessel, fp)
+
+        schluessel_filter = (
+            IdempotenzSchluessel.kundenid == kundenid,
+            IdempotenzSchluessel.endpunkt == endpunkt,
+            IdempotenzSchluessel.schluessel == schluessel,
+            IdempotenzSchluessel.erstellt_am == reserviert_am  # noch unsere Reservierung
+        )
+
+        def ausgefuehrt_markieren(session: Session):
+            # Im selben Commit wie die Aktion: entweder beides oder nichts
+            markiert = session.execute(
+                update(IdempotenzSchluessel)
+                .where(*schluessel_filter)
+                .values(ausgefuehrt=True)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not markiert:
+                raise IdempotenzKonflikt(409, "Request mit diesem Idempotency-Key wurde von einer Wiederholung übernommen")
+
+        event.listen(self.db, "before_commit", ausgefuehrt_markieren)
+        try:
+            antwort = aktion()
+        except Exception:
+            self.db.rollback()
+            self._freigeben(schluessel_filter)
+            raise
+        finally:
+            event.remove(self.db, "before_commit", ausgefuehrt_markieren)
+
+        self._abschliessen(schluessel_filter, antwort)
+        return antwort
+
+    # ===== INTERN =====
+
+    def _reservieren(self, kundenid: int, endpunkt: str, schluessel: str, fp: str) -> Optional[datetime]:
+        """
+        Schlüssel atomar belegen (INSERT ... ON CONFLICT). Abgelaufene Einträge und
+        verwaiste, nie ausgeführte Reservierungen werden dabei übernommen.
+        Returns: erstellt_am der eigenen Reservierung (dient als Kennung) oder None
+        """
+        jetzt = datetime.now(timezone.utc)
+        stmt = insert(IdempotenzSchluessel).values(
+            kundenid=kundenid,
+            endpunkt=endpunkt,
+            schluessel=schluessel,
+            fingerprint=fp,
+            status_code=None,
+            antwort=None,
+            ausgefuehrt=False,
+            erstellt_am=jetzt,
+            ablauf_am=jetzt + timedelta(seconds=IDEMPOTENZ_TTL_SEKUNDEN)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                IdempotenzSchluessel.kundenid,
+                IdempotenzSchluessel.endpunkt,
+                IdempotenzSchluessel.schluessel
+            ],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "status_code": None,
+                "antwort": None,
+                "ausgefuehrt": False,
+                "erstellt_am": stmt.excluded.erstellt_am,
+                "ablauf_am": stmt.excluded.ablauf_am
+            },
+            where=or_(
+                IdempotenzSchluessel.ablauf_am < jetzt,
+                and_(
+                    IdempotenzSchluessel.antwort.is_(None),
+                    IdempotenzSchluessel.ausgefuehrt.is_(False),
+                    IdempotenzSchluessel.erstellt_am < jetzt - timedelta(seconds=IDEMPOTENZ_SPERRE_SEKUNDEN)
+                )
+            )
+        ).returning(IdempotenzSchluessel.schluessel)
+
+        reserviert = self.db.execute(stmt).first() is not None
+        # Sofort committen: parallele Wiederholungen sehen die Reservierung
+        self.db.commit()
+        return jetzt if reserviert else None
+
+    def _gespeicherte_antwort(self, kundenid: int, endpunkt: str, schluessel: str, fp: str) -> Any:
+        eintrag = self.db.get(IdempotenzSchluessel, (kundenid, endpunkt, schluessel))
+        if eintrag is None:
+            # Zwischenzeitlich freigegeben (erster Request fehlgeschlagen)
+            raise IdempotenzKonflikt(409, "Request mit diesem Idempotency-Key wurde abgebrochen, bitte erneut senden")
+        if eintrag.fingerprint != fp:
+            raise IdempotenzKonflikt(422, "Idempotency-Key wurde bereits für eine andere Anfrage verwendet")
+        if eintrag.antwort is None and eintrag.ausgefuehrt:
+            # Aktion committet, Antwort nicht gespeichert (Absturz dazwischen) - nie wiederholen
+            raise IdempotenzKonflikt(409, "Request mit diesem Idempotency-Key wurde ausgeführt, Ergebnis bitte abfragen")
+        if eintrag.antwort is None:
+            raise IdempotenzKonflikt(409, "Request mit diesem Idempotency-Key wird noch verarbeitet")
+        return json.loads(eintrag.antwort)
+
+    def _abschliessen(self, schluessel_filter: tuple, antwort: Any):
+        self.db.query(IdempotenzSchluessel).filter(*schluessel_filter).update({
+            "status_code": 200,
+            "antwort": json.dumps(antwort, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        }, synchronize_session=False)
+        self.db.commit()
+
+    def _freigeben(self, schluessel_filter: tuple):
+        """Nur nie ausgeführte Reservierungen: ist die Aktion schon committet, bleibt der Schlüssel belegt"""
+        self.db.query(IdempotenzSchluessel).filter(
+            *schluessel_filter,
+            IdempotenzSchluessel.antwort.is_(None),
+            IdempotenzSchluessel.ausgefuehrt.is_(False)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+    # ===== WARTUNG =====
+
+    def abgelaufene_loeschen(self) -> int:
+        anzahl = self.db.query(IdempotenzSchluessel).filter(
+            IdempotenzSchluessel.ablauf_am < datetime.now(timezone.utc)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return anzahl
@@ -1,11 +1,17 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from models.kochstil import Kochstil
+from services.autocomplete_service import AutocompleteService
+from services.facetten_service import FacettenService
+from services.menue_snapshot_service import MenueSnapshotService
 
 #Kochstil = Cuisine = Italienisch, Asiatisch etc.
 class KochstilService:
     def __init__(self, db: Session):
         self.db = db
+        self.autocomplete_service = AutocompleteService(db)
+        self.facetten_service = FacettenService(db)
+        self.snapshot_service = MenueSnapshotService(db)
 
     def get_all(self) -> List[Kochstil]:
         return self.db.query(Kochstil).all()
@@ -18,6 +24,8 @@ class KochstilService:
         self.db.add(kochstil)
         self.db.commit()
         self.db.refresh(kochstil)
+        self.autocomplete_service.kochstil_aktualisieren(kochstil.stilid)
+        self.facetten_service.namen_aktualisieren()
         return kochstil
 
     def update(self, stil_id: int, update_data: dict) -> Optional[Kochstil]:
@@ -29,8 +37,11 @@ class KochstilService:
             if value is not None:
                 setattr(kochstil, key, value)
 
+        self.snapshot_service.invalidieren_fuer_kochstil(stil_id)
         self.db.commit()
         self.db.refresh(kochstil)
+        self.autocomplete_service.kochstil_aktualisieren(kochstil.stilid)
+        self.facetten_service.namen_aktualisieren()
         return kochstil
 
     def delete(self, stil_id: int) -> bool:
@@ -44,4 +55,5 @@ class KochstilService:
 
         self.db.delete(kochstil)
         self.db.commit()
+        self.autocomplete_service.entfernen("kochstil", stil_id)
         return True
\ No newline at end of file
@@ -1,12 +1,16 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from models.kochstilrestaurant import KochstilRestaurant
+from services.menue_snapshot_service import MenueSnapshotService
+from services.facetten_service import FacettenService
 
 class KochstilRestaurantService:
     """Service für Many-to-Many Beziehung zwischen Kochstil und Restaurant"""
 
     def __init__(self, db: Session):
         self.db = db
+        self.snapshot_service = MenueSnapshotService(db)
+        self.facetten_service = FacettenService(db)
 
     def assign_kochstil_to_restaurant(self, restaurant_id: int, stil_id: int) -> KochstilRestaurant:
         """Weise einem Restaurant einen Kochstil zu"""
@@ -24,8 +28,10 @@ class KochstilRestaurantService:
             stilid=stil_id
         )
         self.db.add(kochstil_restaurant)
+        self.snapshot_service.invalidieren(restaurant_id)
         self.db.commit()
         self.db.refresh(kochstil_restaurant)
+        self.facetten_service.restaurant_aktualisieren(restaurant_id)
         return kochstil_restaurant
 
     def remove_kochstil_from_restaurant(self, restaurant_id: int, stil_id: int) -> bool:
@@ -38,8 +44,10 @@ class KochstilRestaurantService:
         if not kochstil_restaurant:
             return False
 
+        self.snapshot_service.invalidieren(restaurant_id)
         self.db.delete(kochstil_restaurant)
         self.db.commit()
+        self.facetten_service.restaurant_aktualisieren(restaurant_id)
         return True
 
     def get_kochstil_by_restaurant(self, restaurant_id: int) -> List[KochstilRestaurant]:
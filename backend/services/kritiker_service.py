@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from models import Kritiker
 from models.kritiker import Kritiker
 from typing import List, Optional
+from core.security import principal_invalidieren
 
 class KritikerService:
     def __init__(self, db: Session):
@@ -22,26 +23,31 @@ class KritikerService:
         self.db.add(kritiker)
         self.db.commit()
         self.db.refresh(kritiker)
+        principal_invalidieren("kunde", kritiker.kundenid)  # Rolle wird "kritiker"
         return kritiker
     
     def update(self, kritiker_id: int, update_data: dict) -> Optional[Kritiker]:
         kritiker = self.get_by_id(kritiker_id)
         if not kritiker:
             return None
-        
+
+        alte_kundenid = kritiker.kundenid
         for key, value in update_data.items():
             if value is not None:  # Only update fields that are provided
                 setattr(kritiker, key, value)
         
         self.db.commit()
         self.db.refresh(kritiker)
+        principal_invalidieren("kunde", alte_kundenid)
+        principal_invalidieren("kunde", kritiker.kundenid)
         return kritiker
     
     def delete(self, kritiker_id: int) -> bool:
         kritiker = self.get_by_id(kritiker_id)
         if not kritiker:
             return False
+        kundenid = kritiker.kundenid
         self.db.delete(kritiker)
         self.db.commit()
-        self.db.refresh(kritiker)
+        principal_invalidieren("kunde", kundenid)
         return True
@@ -3,8 +3,9 @@ from typing import List, Optional
 
 from models import kunde
 from models.kunde import Kunde
-from core.security import get_password_hash, verify_password
+from core.security import get_password_hash, verify_password, principal_invalidieren
 from services.adresse_service import AdresseService
+from utils.email_norm import email_normalisieren
 
 
 
@@ -67,6 +68,8 @@ class KundeService:
 
         self.db.commit()
         self.db.refresh(kunde)
+        # is_active / is_admin / email können sich geändert haben
+        principal_invalidieren("kunde", kunden_id)
         return kunde
 
     def delete(self, kunden_id: int) -> bool:
@@ -77,13 +80,14 @@ class KundeService:
 
         self.db.delete(kunde)
         self.db.commit()
+        principal_invalidieren("kunde", kunden_id)
         return True
 
     # ===== AUTH METHODEN =====
 
     def get_by_email(self, email: str) -> Optional[Kunde]:
-        """Kunde nach E-Mail suchen (für Auth)"""
-        return self.db.query(Kunde).filter(Kunde.email == email).first()
+        """Kunde nach E-Mail suchen (für Auth) - Gleichheit auf der normalisierten, indizierten Spalte"""
+        return self.db.query(Kunde).filter(Kunde.email == email_normalisieren(email)).first()
 
     def create_with_password(self, kunde_data: dict) -> Kunde:
         """
@@ -130,7 +134,7 @@ class KundeService:
 
     def check_email_exists(self, email: str) -> bool:
         """Prüft ob E-Mail bereits existiert"""
-        return self.get_by_email(email) is not None
+        return self.db.query(Kunde.kundenid).filter(Kunde.email == email_normalisieren(email)).first() is not None
 
     def update_password(self, kunden_id: int, new_password: str) -> Optional[Kunde]:
         """
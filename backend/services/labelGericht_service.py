@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from models.labelGericht import LabelGericht
 from typing import List, Optional
+from services.facetten_service import FacettenService
 
 class LabelGerichtService:
     def __init__(self, db: Session):
         self.db = db
+        self.facetten_service = FacettenService(db)
 
     def get_all(self) -> List[type[LabelGericht]]:
         return self.db.query(LabelGericht).all()
@@ -20,9 +22,14 @@ class LabelGerichtService:
         self.db.add(new_label)
         self.db.commit()
         self.db.refresh(new_label)
+        self.facetten_service.gericht_aktualisieren(new_label.gerichtid)
         return new_label
 
     def delete(self, gerichtid: int, labelid: int) -> Optional[type[LabelGericht]]:
-        label = self.db.query(LabelGericht).filter(LabelGericht.labelid == labelid & LabelGericht.gerichtid == gerichtid).first()
+        label = self.db.query(LabelGericht).filter(LabelGericht.labelid == labelid, LabelGericht.gerichtid == gerichtid).first()
+        if not label:
+            return None
         self.db.delete(label)
-        self.db.commit()
\ No newline at end of file
+        self.db.commit()
+        self.facetten_service.gericht_aktualisieren(gerichtid)
+        return label
\ No newline at end of file
@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Session
 from models.label import Label
 from typing import List, Optional
+from services.autocomplete_service import AutocompleteService
+from services.facetten_service import FacettenService
 
 class LabelService:
     def __init__(self, db: Session):
         self.db = db
+        self.autocomplete_service = AutocompleteService(db)
+        self.facetten_service = FacettenService(db)
 
     def get_all(self) -> List[type[Label]]:
         return self.db.query(Label).all()
@@ -20,6 +24,8 @@ class LabelService:
         self.db.add(new_label)
         self.db.commit()
         self.db.refresh(new_label)
+        self.autocomplete_service.label_aktualisieren(new_label.labelid)
+        self.facetten_service.namen_aktualisieren()
         return new_label
 
     def update(self, labelid: int, update_data: dict) -> Optional[Label]:
@@ -33,6 +39,8 @@ class LabelService:
 
         self.db.commit()
         self.db.refresh(label)
+        self.autocomplete_service.label_aktualisieren(labelid)
+        self.facetten_service.namen_aktualisieren()
         return label
 
     def delete(self, labelid: int) -> Optional[Label]:
@@ -41,5 +49,5 @@ class LabelService:
             return None
         self.db.delete(label)
         self.db.commit()
-        self.db.refresh(label)
+        self.autocomplete_service.entfernen("label", labelid)
         return label
\ No newline at end of file
@@ -1,20 +1,27 @@
 from sqlalchemy.orm import Session
 from models.menue import Menue
+from services.menue_snapshot_service import MenueSnapshotService
+from services.gericht_suche_service import GerichtSucheService
+from services.bewertung_aggregat_service import BewertungAggregatService
 from typing import Optional
 
 class MenueService:
     def __init__(self, db: Session):
         self.db = db
+        self.snapshot_service = MenueSnapshotService(db)
+        self.such_service = GerichtSucheService(db)
+        self.aggregat_service = BewertungAggregatService(db)
 
     def get_all(self) -> list[type[Menue]]:
         return self.db.query(Menue).all()
 
     def get_by_id(self, menueid: int) -> Optional[Menue]:
-        return self.db.query(Menue).filter(Menue.menueid == menueid).first()
+        return self.db.query(Menue).filter(Menue.menuid == menueid).first()
 
     def create(self, menue_data: dict) -> Menue:
         new_menue = Menue(**menue_data)
         self.db.add(new_menue)
+        self.snapshot_service.invalidieren(new_menue.restaurantid)
         self.db.commit()
         self.db.refresh(new_menue)
         return new_menue
@@ -24,19 +31,30 @@ class MenueService:
         if not menue:
             return None
 
+        alt_restaurantid = menue.restaurantid
+
         for key, value in update_data.items():
             if value is not None:
                 setattr(menue, key, value)
 
+        # Bewertungen der Gerichte wandern mit ins neue Restaurant
+        if menue.restaurantid != alt_restaurantid:
+            self.aggregat_service.menue_verschoben(menueid, alt_restaurantid, menue.restaurantid)
+
+        for restaurantid in {alt_restaurantid, menue.restaurantid}:
+            self.snapshot_service.invalidieren(restaurantid)
+
         self.db.commit()
         self.db.refresh(menue)
+        if menue.restaurantid != alt_restaurantid:
+            self.such_service.menue_aktualisieren(menueid)
         return menue
 
     def delete(self, menueid: int) -> Optional[Menue]:
         menue = self.get_by_id(menueid)
         if not menue:
             return None
+        self.snapshot_service.invalidieren(menue.restaurantid)
         self.db.delete(menue)
         self.db.commit()
-        self.db.refresh(menue)
         return menue
\ No newline at end of file
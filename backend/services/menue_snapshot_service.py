@@ -0,0 +1,184 @@
+import json
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional, Tuple
+
+from models.restaurant import Restaurant
+from models.menue import Menue
+from models.gericht import Gericht
+from models.kochstilrestaurant import KochstilRestaurant
+from models.menue_snapshot import MenueSnapshot
+
+
+class MenueSnapshotService:
+    """
+    Versionierte, vorserialisierte Restaurant-Detail-Dokumente (Restaurant + Menü + Preise)
+
+    Schreibende Services rufen invalidieren*() in ihrer Transaktion auf, das erhöht
+    die Version und verwirft das Dokument. Der nächste Abruf rendert neu.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ===== LESEN =====
+
+    def get_or_build(self, restaurant_id: int) -> Optional[Tuple[int, bytes]]:
+        """
+        Liefert (version, json_bytes) - im Normalfall ein einziger PK-Lookup.
+        None wenn das Restaurant nicht existiert.
+        """
+        snapshot = self.db.get(MenueSnapshot, restaurant_id)
+        if snapshot and snapshot.dokument is not None:
+            return snapshot.version, snapshot.dokument
+
+        version = snapshot.version if snapshot else 1
+        dokument = self._rendern(restaurant_id)
+        if dokument is None:
+            return None
+
+        daten = json.dumps(dokument, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        jetzt = datetime.now(timezone.utc)
+
+        if snapshot:
+            # Nur speichern wenn zwischenzeitlich nicht invalidiert wurde
+            self.db.execute(
+                update(MenueSnapshot)
+                .where(
+                    MenueSnapshot.restaurantid == restaurant_id,
+                    MenueSnapshot.version == version
+                )
+                .values(dokument=daten, erstellt_am=jetzt)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            self.db.execute(
+                insert(MenueSnapshot)
+                .values(restaurantid=restaurant_id, version=version, dokument=daten, erstellt_am=jetzt)
+                .on_conflict_do_nothing()
+            )
+        self.db.commit()
+
+        return version, daten
+
+    @staticmethod
+    def etag(restaurant_id: int, version: int) -> str:
+        return f'"{restaurant_id}-{version}"'
+
+    def _rendern(self, restaurant_id: int) -> Optional[dict]:
+        """Restaurant mit Adresse, Kochstilen, Menüs, aktiven Gerichten und Preisen (5 Queries)"""
+        restaurant = (
+            self.db.query(Restaurant)
+            .options(
+                joinedload(Restaurant.adresse),
+                selectinload(Restaurant.kochstil).joinedload(KochstilRestaurant.kochstil),
+                selectinload(Restaurant.menue).selectinload(Menue.gericht).selectinload(Gericht.preis)
+            )
+            .filter(Restaurant.restaurantid == restaurant_id)
+            .first()
+        )
+
+        if not restaurant:
+            return None
+
+        return {
+            "restaurantid": restaurant.restaurantid,
+            "name": restaurant.name,
+            "klassifizierung": restaurant.klassifizierung,
+            "adresseid": restaurant.adresseid,
+            "telefon": restaurant.telefon,
+            "kuechenchef": restaurant.kuechenchef,
+            "email": restaurant.email,
+            "adresse": {
+                "adresseid": restaurant.adresse.adresseid,
+                "straße": restaurant.adresse.straße,
+                "hausnummer": restaurant.adresse.hausnummer,
+                "postleitzahl": restaurant.adresse.postleitzahl,
+                "ort": restaurant.adresse.ort,
+                "land": restaurant.adresse.land
+            } if restaurant.adresse else None,
+
+            "kochstil": [
+                {
+                    "stilid": kr.kochstil.stilid,
+                    "kochstil": kr.kochstil.kochstil,
+                } for kr in restaurant.kochstil
+            ],
+
+            "menue": [
+                {
+                    "menuid": menu.menuid,
+                    "name": menu.name,
+                    "restaurantid": menu.restaurantid,
+                    "gericht": [
+                        {
+                            "gerichtid": gericht.gerichtid,
+                            "menuid": gericht.menuid,
+                            "name": gericht.name,
+                            "beschreibung": gericht.beschreibung,
+                            "kategorie": gericht.kategorie,
+                            "preis": [
+                                {
+                                    "preisid": preis.preisid,
+                                    "betrag": float(preis.betrag) if preis.betrag else 0.0,
+                                    "gerichtid": preis.gerichtid,
+                                    "gueltigvon": preis.gueltigvon.isoformat() if preis.gueltigvon else None,
+                                    "gueltigbis": preis.gueltigbis.isoformat() if preis.gueltigbis else None,
+                                    "preistyp": preis.preistyp,
+                                    "istaktiv": preis.istaktiv
+                                } for preis in gericht.preis
+                            ]
+                        } for gericht in menu.gericht if gericht.ist_aktiv
+                    ]
+                } for menu in restaurant.menue
+            ]
+        }
+
+    # ===== INVALIDIERUNG (ohne Commit) =====
+
+    def invalidieren(self, restaurant_id: Optional[int]):
+        """Version erhöhen und Dokument verwerfen"""
+        if restaurant_id is None:
+            return
+
+        self.db.execute(
+            insert(MenueSnapshot)
+            .values(restaurantid=restaurant_id, version=1, dokument=None)
+            .on_conflict_do_update(
+                index_elements=["restaurantid"],
+                set_={"version": MenueSnapshot.version + 1, "dokument": None}
+            )
+        )
+
+    def invalidieren_fuer_menue(self, menuid: Optional[int]):
+        if menuid is None:
+            return
+        self.invalidieren(
+            self.db.query(Menue.restaurantid).filter(Menue.menuid == menuid).scalar()
+        )
+
+    def invalidieren_fuer_adresse(self, adresse_id: Optional[int]):
+        """Das Dokument enthält die Restaurant-Adresse"""
+        if adresse_id is None:
+            return
+        for (restaurant_id,) in self.db.query(Restaurant.restaurantid).filter(Restaurant.adresseid == adresse_id):
+            self.invalidieren(restaurant_id)
+
+    def invalidieren_fuer_kochstil(self, stil_id: Optional[int]):
+        """Das Dokument enthält die Kochstil-Namen aller verknüpften Restaurants"""
+        if stil_id is None:
+            return
+        for (restaurant_id,) in self.db.query(KochstilRestaurant.restaurantid).filter(KochstilRestaurant.stilid == stil_id):
+            self.invalidieren(restaurant_id)
+
+    def invalidieren_fuer_gericht(self, gerichtid: Optional[int]):
+        if gerichtid is None:
+            return
+        self.invalidieren(
+            self.db.query(Menue.restaurantid)
+            .join(Gericht, Gericht.menuid == Menue.menuid)
+            .filter(Gericht.gerichtid == gerichtid)
+            .scalar()
+        )
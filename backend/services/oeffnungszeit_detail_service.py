@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from models.oeffnungszeit_detail import OeffnungszeitDetail
 from typing import List, Optional, Any
 from sqlalchemy.exc import IntegrityError
+from services.oeffnungszeit_index_service import OeffnungszeitIndexService
 
 
 
@@ -43,6 +44,7 @@ class OeffnungszeitDetailService:
             self.db.add(new_detail)
             self.db.commit()
             self.db.refresh(new_detail)
+            OeffnungszeitIndexService.invalidieren()
             return new_detail
         except IntegrityError:
             self.db.rollback()
@@ -63,6 +65,7 @@ class OeffnungszeitDetailService:
         
         self.db.commit()
         self.db.refresh(detail)
+        OeffnungszeitIndexService.invalidieren()
         return detail
     
     def delete(self, detail_id: int) -> bool:
@@ -71,4 +74,5 @@ class OeffnungszeitDetailService:
             return False
         self.db.delete(detail)
         self.db.commit()
+        OeffnungszeitIndexService.invalidieren()
         return True
\ No newline at end of file
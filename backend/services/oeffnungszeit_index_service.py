@@ -0,0 +1,237 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, time as uhrzeit, timedelta
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from models.oeffnungszeit_vorlage import OeffnungszeitVorlage
+from models.oeffnungszeit_detail import OeffnungszeitDetail
+from models.restaurant_oeffnungszeit import RestaurantOeffnungszeit
+from utils.opening_hours_hash import generate_opening_hours_hash
+from utils.wochen_bitmap import SLOT_MINUTEN, wochen_bitmaps, tages_maske, tages_bits, naechster_slot, slot
+
+OEFFNUNGSZEIT_MAX_ALTER = int(os.getenv("OEFFNUNGSZEIT_MAX_ALTER", "300"))
+# So weit sucht der Resolver nach der nächsten Öffnung/Schließung (Tage ab heute)
+OEFFNUNGSZEIT_HORIZONT_TAGE = int(os.getenv("OEFFNUNGSZEIT_HORIZONT_TAGE", "14"))
+
+
+class Wochenplan(NamedTuple):
+    haupt: int
+    ueberhang: int
+    kombiniert: int
+
+
+class _Stand(NamedTuple):
+    # Hash der Details -> Wochenplan; Vorlagen mit gleichen Zeiten teilen sich ein Objekt
+    plaene: Dict[str, Wochenplan]
+    # restaurantid -> [(gueltig_von, gueltig_bis, hash_signatur)], neueste zuerst
+    zuordnungen: Dict[int, List[Tuple[date, Optional[date], str]]]
+
+
+_stand: Optional[_Stand] = None
+_aufgebaut_am: Optional[float] = None
+_veraltet = False
+_lock = threading.Lock()
+# Effektive Bitmap pro Restaurant für einen Kalendertag (ändert sich nur mit dem Datum)
+_tag: Tuple[Optional[date], Dict[int, int]] = (None, {})
+# restaurantid -> (berechnet_ab, gueltig_bis, status); gilt bis zum nächsten Wechsel
+_status: Dict[int, Tuple[datetime, datetime, dict]] = {}
+
+
+def _lokal(zeitpunkt: Optional[datetime]) -> datetime:
+    """Öffnungszeiten sind Wanduhrzeiten des Servers: aware Zeitpunkte dorthin umrechnen, naiv vergleichen"""
+    if zeitpunkt is None:
+        return datetime.now()
+    if zeitpunkt.tzinfo is not None:
+        return zeitpunkt.astimezone().replace(tzinfo=None)
+    return zeitpunkt
+
+
+class OeffnungszeitIndexService:
+    """
+    Öffnungszeiten aller Restaurants als Wochen-Bitmaps (5-Minuten-Slots × 7 Tage).
+    "Offen zum Zeitpunkt t" ist pro Restaurant ein Bit-Test; neu aufgebaut wird nur,
+    wenn sich Zuordnungen, Vorlagen oder Details ändern (bzw. nach MAX_ALTER, damit
+    Änderungen aus anderen Workern ankommen).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ===== AUFBAU (2 Queries) =====
+
+    def aufbauen(self) -> int:
+        global _stand, _aufgebaut_am, _veraltet, _tag, _status
+
+        details = defaultdict(list)
+        vorlagen = set()
+        for row in (
+            self.db.query(
+                OeffnungszeitVorlage.oeffnungszeitid,
+                OeffnungszeitDetail.wochentag,
+                OeffnungszeitDetail.oeffnungszeit,
+                OeffnungszeitDetail.schliessungszeit,
+                OeffnungszeitDetail.ist_geschlossen
+            )
+            .outerjoin(OeffnungszeitDetail, OeffnungszeitDetail.oeffnungszeitid == OeffnungszeitVorlage.oeffnungszeitid)
+        ):
+            vorlagen.add(row.oeffnungszeitid)
+            if row.wochentag is not None:
+                details[row.oeffnungszeitid].append({
+                    "wochentag": row.wochentag,
+                    "oeffnungszeit": row.oeffnungszeit,
+                    "schliessungszeit": row.schliessungszeit,
+                    "ist_geschlossen": row.ist_geschlossen
+                })
+
+        plaene: Dict[str, Wochenplan] = {}
+        schluessel: Dict[int, str] = {}
+        for vorlage_id in vorlagen:
+            # Schlüssel aus den eben geladenen Details, nicht die gespeicherte hash_signatur:
+            # die veraltet bei Detail-Änderungen und würde fremde Pläne teilen
+            hash_signatur = generate_opening_hours_hash(details[vorlage_id])
+            schluessel[vorlage_id] = hash_signatur
+            if hash_signatur not in plaene:
+                haupt, ueberhang = wochen_bitmaps(details[vorlage_id])
+                plaene[hash_signatur] = Wochenplan(haupt, ueberhang, haupt | ueberhang)
+
+        zuordnungen = defaultdict(list)
+        for row in self.db.query(
+            RestaurantOeffnungszeit.restaurantid,
+            RestaurantOeffnungszeit.oeffnungszeitid,
+            RestaurantOeffnungszeit.gueltig_von,
+            RestaurantOeffnungszeit.gueltig_bis
+        ):
+            if row.oeffnungszeitid in schluessel:
+                zuordnungen[row.restaurantid].append((row.gueltig_von, row.gueltig_bis, schluessel[row.oeffnungszeitid]))
+        for liste in zuordnungen.values():
+            liste.sort(key=lambda z: z[0] or date.min, reverse=True)
+
+        with _lock:
+            _stand = _Stand(plaene, dict(zuordnungen))
+            _tag = (None, {})
+            _status = {}
+            _aufgebaut_am = time.monotonic()
+            _veraltet = False
+        return len(zuordnungen)
+
+    def _sicherstellen(self) -> _Stand:
+        if _stand is None or _veraltet or time.monotonic() - _aufgebaut_am > OEFFNUNGSZEIT_MAX_ALTER:
+            self.aufbauen()
+        return _stand
+
+    @staticmethod
+    def invalidieren():
+        """Nach Commit aufrufen, wenn sich Zuordnungen, Vorlagen oder Details ändern"""
+        global _veraltet
+        _veraltet = True
+
+    # ===== AUFLÖSUNG =====
+
+    @staticmethod
+    def _plan_am(stand: _Stand, restaurantid: int, datum: date) -> Optional[Wochenplan]:
+        """Vorlage der am Datum gültigen Zuordnung (bei Überlappung die zuletzt begonnene)"""
+        for von, bis, hash_signatur in stand.zuordnungen.get(restaurantid, ()):
+            if (von is None or von <= datum) and (bis is None or bis >= datum):
+                return stand.plaene[hash_signatur]
+        return None
+
+    def _effektiv(self, stand: _Stand, restaurantid: int, datum: date) -> int:
+        """
+        Bitmap für Zeitpunkte an 'datum': eigene Slots der heute gültigen Vorlage plus
+        Überhang der gestern gültigen Vorlage (Öffnung über Mitternacht)
+        """
+        heute = self._plan_am(stand, restaurantid, datum)
+        gestern = self._plan_am(stand, restaurantid, datum - timedelta(days=1))
+        if heute is gestern:
+            return heute.kombiniert if heute else 0  # Normalfall: geteilte Bitmap, keine Kopie
+        bitmap = heute.haupt if heute else 0
+        if gestern:
+            bitmap |= gestern.ueberhang & tages_maske(datum.weekday())
+        return bitmap
+
+    def _tagesstand(self, datum: date) -> Dict[int, int]:
+        global _tag
+        stand = self._sicherstellen()
+        tag_datum, bitmaps = _tag
+        if tag_datum == datum:
+            return bitmaps
+        bitmaps = {rid: self._effektiv(stand, rid, datum) for rid in stand.zuordnungen}
+        with _lock:
+            if _stand is stand:
+                _tag = (datum, bitmaps)
+        return bitmaps
+
+    # ===== ABFRAGEN =====
+
+    def offen(self, zeitpunkt: Optional[datetime] = None) -> List[int]:
+        """IDs aller Restaurants, die zum Zeitpunkt (Standard: jetzt) geöffnet haben"""
+        zeitpunkt = _lokal(zeitpunkt)
+        slot_nr = slot(zeitpunkt)
+        return [
+            rid for rid, bitmap in self._tagesstand(zeitpunkt.date()).items()
+            if (bitmap >> slot_nr) & 1
+        ]
+
+    def ist_offen(self, restaurantid: int, zeitpunkt: Optional[datetime] = None) -> bool:
+        zeitpunkt = _lokal(zeitpunkt)
+        return bool((self._tagesstand(zeitpunkt.date()).get(restaurantid, 0) >> slot(zeitpunkt)) & 1)
+
+    # ===== NÄCHSTE ÖFFNUNG / SCHLIESSUNG =====
+
+    def _naechster_wechsel(self, stand: _Stand, restaurantid: int, ab: datetime, wert: bool,
+                           bis_datum: date) -> Optional[datetime]:
+        """Erster Slot-Beginn ab 'ab', an dem das Restaurant offen (wert=True) bzw. zu ist"""
+        datum = ab.date()
+        start = (ab.hour * 60 + ab.minute) // SLOT_MINUTEN
+        while datum <= bis_datum:
+            # Pro Tag die dort gültige Vorlage samt Überhang des Vortags
+            bits = tages_bits(self._effektiv(stand, restaurantid, datum), datum.weekday())
+            treffer = naechster_slot(bits, start, wert)
+            if treffer is not None:
+                return datetime.combine(datum, uhrzeit()) + timedelta(minutes=treffer * SLOT_MINUTEN)
+            datum += timedelta(days=1)
+            start = 0
+        return None
+
+    def _status_berechnen(self, stand: _Stand, restaurantid: int, zeitpunkt: datetime) -> Tuple[datetime, dict]:
+        bis_datum = zeitpunkt.date() + timedelta(days=OEFFNUNGSZEIT_HORIZONT_TAGE)
+        tag = self._effektiv(stand, restaurantid, zeitpunkt.date())
+        offen = bool((tag >> slot(zeitpunkt)) & 1)
+
+        erster = self._naechster_wechsel(stand, restaurantid, zeitpunkt, not offen, bis_datum)
+        zweiter = self._naechster_wechsel(stand, restaurantid, erster, offen, bis_datum) if erster else None
+        oeffnung, schliessung = (zweiter, erster) if offen else (erster, zweiter)
+
+        # Bis zum ersten Wechsel ändert sich nichts; ohne Wechsel bis zum Ende des Horizonts
+        gueltig_bis = erster or datetime.combine(bis_datum, uhrzeit())
+        return gueltig_bis, {
+            "ist_offen": offen,
+            "naechste_oeffnung": oeffnung,
+            "naechste_schliessung": schliessung
+        }
+
+    def status(self, restaurantids: Iterable[int], zeitpunkt: Optional[datetime] = None) -> Dict[int, dict]:
+        """
+        Offen/zu sowie nächste Öffnung und Schließung für mehrere Restaurants.
+        Berücksichtigt Gültigkeitszeiträume der Zuordnungen und Öffnung über Mitternacht;
+        Zeiten sind Slot-genau (5 Minuten). Ergebnisse werden bis zum nächsten Wechsel
+        gecacht, danach und nach jedem Neuaufbau des Index neu berechnet.
+        """
+        zeitpunkt = _lokal(zeitpunkt)
+        stand = self._sicherstellen()
+        cache = _status
+
+        ergebnis = {}
+        for rid in restaurantids:
+            eintrag = cache.get(rid)
+            if eintrag and eintrag[0] <= zeitpunkt < eintrag[1]:
+                ergebnis[rid] = eintrag[2]
+                continue
+            gueltig_bis, werte = self._status_berechnen(stand, rid, zeitpunkt)
+            if _stand is stand:
+                cache[rid] = (zeitpunkt, gueltig_bis, werte)
+            ergebnis[rid] = werte
+        return ergebnis
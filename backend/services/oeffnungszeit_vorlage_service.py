@@ -1,11 +1,18 @@
+from itertools import groupby
+from sqlalchemy import Integer, String, column, update, values
 from sqlalchemy.orm import Session
 
 from models import OeffnungszeitVorlage
 from models.oeffnungszeit_vorlage import OeffnungszeitVorlage
+from models.oeffnungszeit_detail import OeffnungszeitDetail
 from typing import List, Optional, Any
 from sqlalchemy.exc import IntegrityError
 
 from utils.opening_hours_hash import generate_opening_hours_hash
+from services.oeffnungszeit_index_service import OeffnungszeitIndexService
+
+
+HASH_BLOCKGROESSE = 1000
 
 
 class OeffnungszeitVorlageService:
@@ -55,6 +62,7 @@ class OeffnungszeitVorlageService:
         
         self.db.commit()
         self.db.refresh(vorlage)
+        OeffnungszeitIndexService.invalidieren()
         return vorlage
     
     def delete(self, oeffnungszeit_id: int) -> bool:
@@ -63,6 +71,7 @@ class OeffnungszeitVorlageService:
             return False
         self.db.delete(vorlage)
         self.db.commit()
+        OeffnungszeitIndexService.invalidieren()
         return True
 
     def find_by_hash(self, hash_signatur: str):
@@ -98,6 +107,7 @@ class OeffnungszeitVorlageService:
 
             self.db.commit()
             self.db.refresh(new_vorlage)
+            OeffnungszeitIndexService.invalidieren()
             return new_vorlage  # ✅ MUSS returnen!
 
         except Exception as e:
@@ -112,4 +122,72 @@ class OeffnungszeitVorlageService:
         """Get opening hours template with all details"""
         return self.db.query(OeffnungszeitVorlage).filter(
             OeffnungszeitVorlage.oeffnungszeitid == oeffnungszeit_id
-        ).first()
\ No newline at end of file
+        ).first()
+
+    def hashes_neu_berechnen(self, alle: bool = False) -> dict:
+        """
+        Hash-Signaturen aller Vorlagen in einem Durchlauf: Details in einer nach Vorlage
+        sortierten Query per Server-Cursor streamen, blockweise hashen und alle Änderungen
+        mit einem einzigen UPDATE ... FROM (VALUES ...) schreiben.
+
+        alle=False füllt nur fehlende Hashes, alle=True korrigiert auch veraltete.
+        Returns: {"geprueft", "updated", "duplikate"} - duplikate sind Gruppen von
+        Vorlagen mit identischen Öffnungszeiten (Kandidaten zum Zusammenführen).
+        """
+        zeilen = (
+            self.db.query(
+                OeffnungszeitDetail.oeffnungszeitid,
+                OeffnungszeitVorlage.hash_signatur,
+                OeffnungszeitDetail.wochentag,
+                OeffnungszeitDetail.oeffnungszeit,
+                OeffnungszeitDetail.schliessungszeit,
+                OeffnungszeitDetail.ist_geschlossen
+            )
+            .join(OeffnungszeitVorlage, OeffnungszeitVorlage.oeffnungszeitid == OeffnungszeitDetail.oeffnungszeitid)
+            .order_by(OeffnungszeitDetail.oeffnungszeitid)
+            .execution_options(stream_results=True)
+            .yield_per(HASH_BLOCKGROESSE)
+        )
+
+        geprueft = 0
+        aenderungen = []
+        gruppen: dict = {}
+        for vorlage_id, vorlage_zeilen in groupby(zeilen, key=lambda z: z.oeffnungszeitid):
+            vorlage_zeilen = list(vorlage_zeilen)
+            gespeichert = vorlage_zeilen[0].hash_signatur
+            hash_sig = generate_opening_hours_hash([
+                {
+                    "wochentag": z.wochentag,
+                    "oeffnungszeit": z.oeffnungszeit,
+                    "schliessungszeit": z.schliessungszeit,
+                    "ist_geschlossen": z.ist_geschlossen
+                } for z in vorlage_zeilen
+            ])
+            geprueft += 1
+            gruppen.setdefault(hash_sig, []).append(vorlage_id)
+            if hash_sig != gespeichert and (alle or not gespeichert):
+                aenderungen.append((vorlage_id, hash_sig))
+
+        if aenderungen:
+            neu = values(
+                column("oeffnungszeitid", Integer),
+                column("hash_signatur", String),
+                name="neu"
+            ).data(aenderungen)
+            self.db.execute(
+                update(OeffnungszeitVorlage)
+                .where(OeffnungszeitVorlage.oeffnungszeitid == neu.c.oeffnungszeitid)
+                .values(hash_signatur=neu.c.hash_signatur)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            OeffnungszeitIndexService.invalidieren()
+
+        return {
+            "geprueft": geprueft,
+            "updated": len(aenderungen),
+            "duplikate": [
+                {"hash_signatur": hash_sig, "oeffnungszeitids": ids}
+                for hash_sig, ids in gruppen.items() if len(ids) > 1
+            ]
+        }
@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Session
 from models.preis import Preis
+from services.menue_snapshot_service import MenueSnapshotService
+from services.facetten_service import FacettenService
 from typing import List, Optional
 
 class PreisService:
     def __init__(self, db: Session):
         self.db = db
+        self.snapshot_service = MenueSnapshotService(db)
+        self.facetten_service = FacettenService(db)
 
     def get_all(self) -> list[type[Preis]]:
         return self.db.query(Preis).all()
@@ -18,8 +22,10 @@ class PreisService:
     def create(self, preis_data: dict) -> Preis:
         new_preis = Preis(**preis_data)
         self.db.add(new_preis)
+        self.snapshot_service.invalidieren_fuer_gericht(new_preis.gerichtid)
         self.db.commit()
         self.db.refresh(new_preis)
+        self.facetten_service.gericht_aktualisieren(new_preis.gerichtid)
         return new_preis
 
     def update(self, preisid: int, update_data: dict) -> Optional[Preis]:
@@ -27,19 +33,27 @@ class PreisService:
         if not menue:
             return None
 
+        alt_gerichtid = menue.gerichtid
+
         for key, value in update_data.items():
             if value is not None:
                 setattr(menue, key, value)
 
+        for gerichtid in {alt_gerichtid, menue.gerichtid}:
+            self.snapshot_service.invalidieren_fuer_gericht(gerichtid)
+
         self.db.commit()
         self.db.refresh(menue)
+        for gerichtid in {alt_gerichtid, menue.gerichtid}:
+            self.facetten_service.gericht_aktualisieren(gerichtid)
         return menue
 
     def delete(self, preisid: int) -> Optional[Preis]:
-        preis = self.get_by_id(preisid)
+        preis = self.get_by_preis_id(preisid)
         if not preis:
             return None
+        self.snapshot_service.invalidieren_fuer_gericht(preis.gerichtid)
         self.db.delete(preis)
         self.db.commit()
-        self.db.refresh(preis)
+        self.facetten_service.gericht_aktualisieren(preis.gerichtid)
         return preis
\ No newline at end of file
@@ -3,6 +3,7 @@ from models import RestaurantOeffnungszeit, OeffnungszeitVorlage, OeffnungszeitD
 from typing import List, Optional, Any
 from datetime import date
 from sqlalchemy.exc import IntegrityError
+from services.oeffnungszeit_index_service import OeffnungszeitIndexService
 
 
 
@@ -52,6 +53,7 @@ class RestaurantOeffnungszeitService:
             self.db.add(new_assignment)
             self.db.commit()
             self.db.refresh(new_assignment)
+            OeffnungszeitIndexService.invalidieren()
             return new_assignment
         except IntegrityError:
             self.db.rollback()
@@ -74,6 +76,7 @@ class RestaurantOeffnungszeitService:
         
         self.db.commit()
         self.db.refresh(assignment)
+        OeffnungszeitIndexService.invalidieren()
         return assignment
     
     def delete(self, restaurant_id: int, oeffnungszeit_id: int, gueltig_von: date) -> bool:
@@ -82,6 +85,7 @@ class RestaurantOeffnungszeitService:
             return False
         self.db.delete(assignment)
         self.db.commit()
+        OeffnungszeitIndexService.invalidieren()
         return True
     
     def deactivate(self, restaurant_id: int, oeffnungszeit_id: int, gueltig_von: date) -> Optional[RestaurantOeffnungszeit]:
@@ -193,4 +197,5 @@ class RestaurantOeffnungszeitService:
 
         self.db.commit()
         self.db.refresh(assignment)
+        OeffnungszeitIndexService.invalidieren()
         return assignment
@@ -1,23 +1,158 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_
-from typing import Optional, List
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, and_, or_, select, cast, literal, null, union_all, Float, Text
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from typing import Optional, List, Dict
 from models.restaurant import Restaurant
+from models.adresse import Adresse
+from models.kochstilrestaurant import KochstilRestaurant
+from models.bewertung_aggregat import BewertungAggregatGericht, BewertungAggregatRestaurant
 from models.menue import Menue
 from models.gericht import Gericht
 from models.bewertung import Bewertung
-from models.bewertungkritiker import Bewertungkritiker
 from services.adresse_service import AdresseService
+from services.bewertung_aggregat_service import BewertungAggregatService
+from services.menue_snapshot_service import MenueSnapshotService
+from services.gericht_suche_service import GerichtSucheService
+from services.autocomplete_service import AutocompleteService
+from services.facetten_service import FacettenService
+from services.oeffnungszeit_index_service import OeffnungszeitIndexService
+from utils.pagination import encode_cursor, decode_cursor
+from core.security import principal_invalidieren
+from utils.email_norm import email_normalisieren
+
+SORTIERUNGEN = ("name", "rating")
 
 
 class RestaurantService:
     def __init__(self, db: Session):
         self.db = db
         self.adresse_service = AdresseService(db)
+        self.aggregat_service = BewertungAggregatService(db)
+        self.snapshot_service = MenueSnapshotService(db)
+        self.such_service = GerichtSucheService(db)
+        self.autocomplete_service = AutocompleteService(db)
+        self.facetten_service = FacettenService(db)
 
     def get_all(self) -> list[Restaurant]:
         """Alle Restaurants abrufen"""
         return self.db.query(Restaurant).all()
 
+    def get_all_with_kochstil(self) -> list[Restaurant]:
+        """Alle Restaurants mit Kochstilen (2 Queries statt 1 + 2N Lazy-Loads)"""
+        return (
+            self.db.query(Restaurant)
+            .options(selectinload(Restaurant.kochstil).joinedload(KochstilRestaurant.kochstil))
+            .all()
+        )
+
+    def get_seite(
+            self,
+            limit: int = 20,
+            cursor: Optional[str] = None,
+            sortierung: str = "name",
+            kochstil_ids: Optional[List[int]] = None,
+            postleitzahl: Optional[str] = None,
+            ort: Optional[str] = None,
+            min_bewertung: Optional[float] = None,
+            klassifizierung: Optional[str] = None,
+            nur_offen: bool = False
+    ) -> dict:
+        """
+        Eine Seite der Restaurant-Liste mit Keyset-Cursor und serverseitigen Filtern
+
+        Bewertungen kommen per Join aus bewertung_aggregat_restaurant (Sortierung nach
+        Bewertung über dessen gespeicherte Spalte durchschnitt), Kochstile per
+        selectinload - eine Seite kostet damit 2 Queries, unabhängig von der Katalog-Größe.
+
+        Raises:
+            ValueError: Bei unbekannter Sortierung oder ungültigem Cursor
+        """
+        if sortierung not in SORTIERUNGEN:
+            raise ValueError(f"Unbekannte Sortierung '{sortierung}', erlaubt: {', '.join(SORTIERUNGEN)}")
+
+        # Gespeicherter Durchschnitt (Migration 011, indiziert): Sortierung und Filter nach
+        # Bewertung laufen damit über den Index. Jedes Restaurant hat eine Aggregat-Zeile,
+        # dafür reicht ein Inner Join - nur den kann der Planer vom Index aus treiben.
+        durchschnitt = BewertungAggregatRestaurant.durchschnitt
+        nach_bewertung = sortierung == "rating" or min_bewertung is not None
+
+        query = (
+            self.db.query(Restaurant, BewertungAggregatRestaurant, durchschnitt.label("durchschnitt"))
+            .join(BewertungAggregatRestaurant,
+                  BewertungAggregatRestaurant.restaurantid == Restaurant.restaurantid,
+                  isouter=not nach_bewertung)
+            .options(selectinload(Restaurant.kochstil).joinedload(KochstilRestaurant.kochstil))
+        )
+
+        if kochstil_ids:
+            query = query.filter(Restaurant.restaurantid.in_(
+                select(KochstilRestaurant.restaurantid).where(KochstilRestaurant.stilid.in_(kochstil_ids))
+            ))
+
+        if postleitzahl or ort:
+            query = query.join(Adresse, Adresse.adresseid == Restaurant.adresseid)
+            if postleitzahl:
+                query = query.filter(Adresse.postleitzahl == postleitzahl.strip())
+            if ort:
+                query = query.filter(func.lower(Adresse.ort) == ort.strip().lower())
+
+        if klassifizierung:
+            query = query.filter(Restaurant.klassifizierung == klassifizierung)
+
+        if min_bewertung is not None:
+            query = query.filter(durchschnitt >= min_bewertung)
+
+        if nur_offen:
+            # Jetzt geöffnete Restaurants aus dem Öffnungszeiten-Index (ein Bit-Test pro Restaurant)
+            query = query.filter(Restaurant.restaurantid.in_(OeffnungszeitIndexService(self.db).offen()))
+
+        # Rating absteigend, Name aufsteigend - restaurantid als eindeutiger Tie-Breaker
+        if sortierung == "rating":
+            sort_spalte, absteigend = durchschnitt, True
+        else:
+            # coalesce: NULL-Namen würden im Keyset-Vergleich Zeilen überspringen/wiederholen
+            sort_spalte, absteigend = func.coalesce(Restaurant.name, ""), False
+
+        if cursor:
+            daten = decode_cursor(cursor)
+            try:
+                if daten["s"] != sortierung:
+                    raise ValueError("Cursor gehört zu einer anderen Sortierung")
+                wert, letzte_id = daten["k"]
+            except (KeyError, TypeError):
+                raise ValueError("Ungültiger Cursor")
+
+            weiter = sort_spalte < wert if absteigend else sort_spalte > wert
+            query = query.filter(or_(
+                weiter,
+                and_(sort_spalte == wert, Restaurant.restaurantid > letzte_id)
+            ))
+
+        rows = (
+            query
+            .order_by(sort_spalte.desc() if absteigend else sort_spalte.asc(), Restaurant.restaurantid.asc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            letzte = rows[-1]
+            wert = letzte.durchschnitt if sortierung == "rating" else (letzte.Restaurant.name or "")
+            next_cursor = encode_cursor({"s": sortierung, "k": [wert, letzte.Restaurant.restaurantid]})
+
+        return {
+            "items": [
+                (row.Restaurant, self.aggregat_service.als_dict(row.BewertungAggregatRestaurant))
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+
     def get_by_id(self, restaurant_id: int) -> Optional[Restaurant]:
         """Restaurant nach ID abrufen"""
         return self.db.query(Restaurant).filter(Restaurant.restaurantid == restaurant_id).first()
@@ -29,7 +164,7 @@ class RestaurantService:
             .options(
                 joinedload(Restaurant.adresse),
                 joinedload(Restaurant.kochstil),
-                joinedload(Restaurant.menue).joinedload(Menue.gericht)
+                joinedload(Restaurant.menue).joinedload(Menue.gericht).selectinload(Gericht.preis)
             )
             .filter(Restaurant.restaurantid == restaurant_id)
             .first()
@@ -41,6 +176,7 @@ class RestaurantService:
         self.db.add(restaurant)
         self.db.commit()
         self.db.refresh(restaurant)
+        self.autocomplete_service.restaurant_aktualisieren(restaurant.restaurantid)
         return restaurant
 
     def update(self, restaurant_id: int, update_data: dict):
@@ -75,8 +211,13 @@ class RestaurantService:
             if value is not None and hasattr(restaurant, key):
                 setattr(restaurant, key, value)
 
+        self.snapshot_service.invalidieren(restaurant_id)
         self.db.commit()
         self.db.refresh(restaurant)
+        self.such_service.restaurant_aktualisieren(restaurant_id)
+        self.autocomplete_service.restaurant_aktualisieren(restaurant_id)
+        self.facetten_service.restaurant_aktualisieren(restaurant_id)
+        principal_invalidieren("restaurant", restaurant_id)
         return restaurant
 
     def delete(self, restaurant_id: int) -> bool:
@@ -87,6 +228,9 @@ class RestaurantService:
 
         self.db.delete(restaurant)
         self.db.commit()
+        principal_invalidieren("restaurant", restaurant_id)
+        OeffnungszeitIndexService.invalidieren()
+        self.autocomplete_service.entfernen("restaurant", restaurant_id)
         return True
 
     def get_profile(self, restaurant_id: int) -> Optional[Restaurant]:
@@ -111,13 +255,18 @@ class RestaurantService:
         if adresse_data and restaurant.adresseid:
             self.adresse_service.update(restaurant.adresseid, adresse_data)
 
+        self.snapshot_service.invalidieren(restaurant_id)
         self.db.commit()
         self.db.refresh(restaurant)
+        self.such_service.restaurant_aktualisieren(restaurant_id)
+        self.autocomplete_service.restaurant_aktualisieren(restaurant_id)
+        self.facetten_service.restaurant_aktualisieren(restaurant_id)
+        principal_invalidieren("restaurant", restaurant_id)
         return restaurant
 
     def get_by_email(self, email: str) -> Optional[Restaurant]:
         """Restaurant nach E-Mail suchen (für Auth)"""
-        return self.db.query(Restaurant).filter(Restaurant.email == email).first()
+        return self.db.query(Restaurant).filter(Restaurant.email == email_normalisieren(email)).first()
 
     def create_with_password(self, restaurant_data: dict) -> Restaurant:
         """Restaurant mit gehashtem Passwort erstellen (für Registrierung)"""
@@ -125,6 +274,7 @@ class RestaurantService:
         self.db.add(restaurant)
         self.db.commit()
         self.db.refresh(restaurant)
+        self.autocomplete_service.restaurant_aktualisieren(restaurant.restaurantid)
         return restaurant
 
 
@@ -132,259 +282,140 @@ class RestaurantService:
 
     def get_bulk_bewertungen_aggregiert(self, restaurant_ids: List[int]) -> dict:
         """
-        🚀 OPTIMIERT: Aggregierte Bewertungen für MEHRERE Restaurants auf einmal
-        Reduziert N+1 Query Problem von O(n) auf O(1) - nur 3 Queries total!
+        Aggregierte Bewertungen für MEHRERE Restaurants auf einmal
+        Liest die vorberechneten Restaurant-Aggregate - 1 PK-Query statt Rohdaten-Scan
+        """
+        return self.aggregat_service.get_fuer_restaurants(restaurant_ids)
+
+    def get_restaurant_bewertungen_aggregiert(self, restaurant_id: int) -> dict:
+        """
+        Aggregierte Bewertungen für ein Restaurant inkl. Sterne-Verteilung
+        Kombiniert Kunden- und Kritiker-Bewertungen
+        """
+        return self.aggregat_service.get_fuer_restaurant(restaurant_id, mit_verteilung=True)
+
+
+    def get_highlights_bulk(self, restaurant_ids: List[int], limit: int = 5, kommentar_limit: int = 3) -> Dict[int, dict]:
+        """
+        Kritiker-Highlights UND Customer-Favorites für mehrere Restaurants in EINEM Round Trip
+
+        Durchschnitte kommen aus bewertung_aggregat_gericht, Top-N pro Restaurant per
+        row_number(), Kommentar-Samples per row_number() pro Gericht + array_agg.
+        Nur Gerichte mit mind. 4 Sternen im Schnitt.
         """
         if not restaurant_ids:
             return {}
 
-        # 1. Alle Gerichte für ALLE Restaurants auf einmal holen (1 Query)
-        gerichte_mapping = (
-            self.db.query(
-                Menue.restaurantid,
-                Gericht.gerichtid
+        agg = BewertungAggregatGericht
+
+        def top_gerichte(quelle: str):
+            anzahl = getattr(agg, f"anzahl_{quelle}")
+            durchschnitt = cast(getattr(agg, f"summe_{quelle}"), Float) / func.nullif(anzahl, 0)
+            return (
+                select(
+                    agg.restaurantid,
+                    agg.gerichtid,
+                    Gericht.name,
+                    Gericht.beschreibung,
+                    Gericht.kategorie,
+                    durchschnitt.label("durchschnitt"),
+                    anzahl.label("anzahl"),
+                    func.row_number().over(
+                        partition_by=agg.restaurantid,
+                        order_by=(durchschnitt.desc(), agg.gerichtid)
+                    ).label("rang")
+                )
+                .join(Gericht, Gericht.gerichtid == agg.gerichtid)
+                .where(
+                    agg.restaurantid.in_(restaurant_ids),
+                    Gericht.ist_aktiv == True,
+                    anzahl > 0,
+                    durchschnitt >= 4.0
+                )
+                .subquery(f"top_{quelle}")
             )
-            .join(Gericht, Gericht.menuid == Menue.menuid)
-            .filter(Menue.restaurantid.in_(restaurant_ids))
-            .filter(Gericht.ist_aktiv == True)
-            .all()
-        )
 
-        # Mapping: restaurant_id -> [gericht_ids]
-        restaurant_gerichte = {}
-        all_gericht_ids = set()
-        for rest_id, gericht_id in gerichte_mapping:
-            if rest_id not in restaurant_gerichte:
-                restaurant_gerichte[rest_id] = []
-            restaurant_gerichte[rest_id].append(gericht_id)
-            all_gericht_ids.add(gericht_id)
-
-        if not all_gericht_ids:
-            # Keine Gerichte gefunden -> leere Bewertungen für alle
-            return {
-                rest_id: {
-                    "durchschnitt_gesamt": 0.0,
-                    "anzahl_gesamt": 0,
-                    "anzahl_kunden": 0,
-                    "anzahl_kritiker": 0,
-                    "durchschnitt_kunden": None,
-                    "durchschnitt_kritiker": None
-                }
-                for rest_id in restaurant_ids
-            }
+        kunden_top = top_gerichte("kunden")
+        kritiker_top = top_gerichte("kritiker")
 
-        # 2. ALLE Kunden-Bewertungen auf einmal holen (1 Query)
-        kunden_bewertungen = (
-            self.db.query(
+        kommentare_rang = (
+            select(
                 Bewertung.gerichtid,
-                Bewertung.rating
+                Bewertung.kommentar,
+                func.row_number().over(
+                    partition_by=Bewertung.gerichtid,
+                    order_by=(Bewertung.rating.desc(), Bewertung.bewertungid)
+                ).label("rang")
             )
-            .filter(Bewertung.gerichtid.in_(all_gericht_ids))
-            .all()
+            .where(
+                Bewertung.gerichtid.in_(select(kunden_top.c.gerichtid).where(kunden_top.c.rang <= limit)),
+                Bewertung.kommentar.isnot(None),
+                Bewertung.kommentar != ''
+            )
+            .subquery("kommentare_rang")
         )
-
-        # 3. ALLE Kritiker-Bewertungen auf einmal holen (1 Query)
-        kritiker_bewertungen = (
-            self.db.query(
-                Bewertungkritiker.gerichtid,
-                Bewertungkritiker.rating
+        kommentare = (
+            select(
+                kommentare_rang.c.gerichtid,
+                func.array_agg(
+                    aggregate_order_by(kommentare_rang.c.kommentar, kommentare_rang.c.rang)
+                ).label("kommentare")
             )
-            .filter(Bewertungkritiker.gerichtid.in_(all_gericht_ids))
-            .all()
+            .where(kommentare_rang.c.rang <= kommentar_limit)
+            .group_by(kommentare_rang.c.gerichtid)
+            .subquery("kommentare")
         )
 
-        # 4. Bewertungen pro Restaurant aggregieren (in Python, kein DB-Query!)
-        result = {}
-        for rest_id in restaurant_ids:
-            gericht_ids = restaurant_gerichte.get(rest_id, [])
-
-            if not gericht_ids:
-                result[rest_id] = {
-                    "durchschnitt_gesamt": 0.0,
-                    "anzahl_gesamt": 0,
-                    "anzahl_kunden": 0,
-                    "anzahl_kritiker": 0,
-                    "durchschnitt_kunden": None,
-                    "durchschnitt_kritiker": None
-                }
-                continue
-
-            # Filter Bewertungen für dieses Restaurant
-            rest_kunden = [b.rating for b in kunden_bewertungen if b.gerichtid in gericht_ids]
-            rest_kritiker = [b.rating for b in kritiker_bewertungen if b.gerichtid in gericht_ids]
-
-            anzahl_kunden = len(rest_kunden)
-            anzahl_kritiker = len(rest_kritiker)
-            durchschnitt_kunden = sum(rest_kunden) / anzahl_kunden if anzahl_kunden > 0 else None
-            durchschnitt_kritiker = sum(rest_kritiker) / anzahl_kritiker if anzahl_kritiker > 0 else None
-
-            # Gesamt-Durchschnitt
-            alle_ratings = rest_kunden + rest_kritiker
-            durchschnitt_gesamt = sum(alle_ratings) / len(alle_ratings) if alle_ratings else 0.0
-
-            result[rest_id] = {
-                "durchschnitt_gesamt": round(durchschnitt_gesamt, 2),
-                "anzahl_gesamt": anzahl_kunden + anzahl_kritiker,
-                "anzahl_kunden": anzahl_kunden,
-                "anzahl_kritiker": anzahl_kritiker,
-                "durchschnitt_kunden": round(durchschnitt_kunden, 2) if durchschnitt_kunden else None,
-                "durchschnitt_kritiker": round(durchschnitt_kritiker, 2) if durchschnitt_kritiker else None
-            }
-
-        return result
-
-    def get_restaurant_bewertungen_aggregiert(self, restaurant_id: int) -> dict:
-        """
-        Aggregierte Bewertungen für ein Restaurant
-        Kombiniert Kunden- und Kritiker-Bewertungen
-        """
-        # 1. Hole alle Gerichte des Restaurants
-        gericht_ids = (
-            self.db.query(Gericht.gerichtid)
-            .join(Menue, Gericht.menuid == Menue.menuid)
-            .filter(Menue.restaurantid == restaurant_id)
-            .filter(Gericht.ist_aktiv == True)
-            .all()
-        )
-        gericht_ids = [g[0] for g in gericht_ids]
-
-        if not gericht_ids:
-            return {
-                "durchschnitt_gesamt": 0.0,
-                "anzahl_gesamt": 0,
-                "anzahl_kunden": 0,
-                "anzahl_kritiker": 0,
-                "durchschnitt_kunden": None,
-                "durchschnitt_kritiker": None
-            }
+        def spalten(top, typ: str):
+            return [
+                literal(typ).label("typ"), top.c.restaurantid, top.c.gerichtid, top.c.name,
+                top.c.beschreibung, top.c.kategorie, top.c.durchschnitt, top.c.anzahl, top.c.rang
+            ]
 
-        # 2. Kunden-Bewertungen aggregieren
-        kunden_stats = (
-            self.db.query(
-                func.avg(Bewertung.rating).label('durchschnitt'),
-                func.count(Bewertung.bewertungid).label('anzahl')
-            )
-            .filter(Bewertung.gerichtid.in_(gericht_ids))
-            .first()
+        favoriten = (
+            select(*spalten(kunden_top, "kunden"), kommentare.c.kommentare)
+            .select_from(kunden_top.outerjoin(kommentare, kommentare.c.gerichtid == kunden_top.c.gerichtid))
+            .where(kunden_top.c.rang <= limit)
         )
-
-        # 3. Kritiker-Bewertungen aggregieren
-        kritiker_stats = (
-            self.db.query(
-                func.avg(Bewertungkritiker.rating).label('durchschnitt'),
-                func.count(Bewertungkritiker.bewertungkritikerid).label('anzahl')
-            )
-            .filter(Bewertungkritiker.gerichtid.in_(gericht_ids))
-            .first()
+        highlights = (
+            select(*spalten(kritiker_top, "kritiker"), cast(null(), ARRAY(Text)).label("kommentare"))
+            .where(kritiker_top.c.rang <= limit)
         )
 
-        anzahl_kunden = kunden_stats.anzahl or 0
-        anzahl_kritiker = kritiker_stats.anzahl or 0
-        durchschnitt_kunden = float(kunden_stats.durchschnitt) if kunden_stats.durchschnitt else None
-        durchschnitt_kritiker = float(kritiker_stats.durchschnitt) if kritiker_stats.durchschnitt else None
-
-        # 4. Gesamt-Durchschnitt berechnen
-        alle_ratings = []
-        if durchschnitt_kunden:
-            alle_ratings.extend([durchschnitt_kunden] * anzahl_kunden)
-        if durchschnitt_kritiker:
-            alle_ratings.extend([durchschnitt_kritiker] * anzahl_kritiker)
-
-        durchschnitt_gesamt = sum(alle_ratings) / len(alle_ratings) if alle_ratings else 0.0
-
-        return {
-            "durchschnitt_gesamt": round(durchschnitt_gesamt, 2),
-            "anzahl_gesamt": anzahl_kunden + anzahl_kritiker,
-            "anzahl_kunden": anzahl_kunden,
-            "anzahl_kritiker": anzahl_kritiker,
-            "durchschnitt_kunden": round(durchschnitt_kunden, 2) if durchschnitt_kunden else None,
-            "durchschnitt_kritiker": round(durchschnitt_kritiker, 2) if durchschnitt_kritiker else None
-        }
-
-
-    def get_kritiker_highlights(self, restaurant_id: int, limit: int = 5) -> List[dict]:
-        """
-        Top Gerichte mit höchsten Kritiker-Bewertungen (mind. 4 Sterne)
-        """
-        results = (
-            self.db.query(
-                Gericht.gerichtid,
-                Gericht.name,
-                Gericht.beschreibung,
-                Gericht.kategorie,
-                func.avg(Bewertungkritiker.rating).label('durchschnitt'),
-                func.count(Bewertungkritiker.bewertungkritikerid).label('anzahl')
-            )
-            .join(Menue, Gericht.menuid == Menue.menuid)
-            .join(Bewertungkritiker, Bewertungkritiker.gerichtid == Gericht.gerichtid)
-            .filter(Menue.restaurantid == restaurant_id)
-            .filter(Gericht.ist_aktiv == True)
-            .group_by(Gericht.gerichtid, Gericht.name, Gericht.beschreibung, Gericht.kategorie)
-            .having(func.avg(Bewertungkritiker.rating) >= 4.0)
-            .order_by(func.avg(Bewertungkritiker.rating).desc())
-            .limit(limit)
-            .all()
-        )
+        rows = self.db.execute(union_all(favoriten, highlights)).all()
 
-        return [
-            {
+        result = {rest_id: {"kritiker_highlights": [], "customer_favorites": []} for rest_id in restaurant_ids}
+        for r in sorted(rows, key=lambda row: row.rang):
+            eintrag = {
                 "gerichtid": r.gerichtid,
                 "name": r.name,
                 "beschreibung": r.beschreibung,
                 "kategorie": r.kategorie,
-                "durchschnitt": round(float(r.durchschnitt), 2),
-                "anzahl_bewertungen": r.anzahl
             }
-            for r in results
-        ]
+            if r.typ == "kunden":
+                eintrag.update({
+                    "durchschnitt_kunden": round(float(r.durchschnitt), 2),
+                    "anzahl_bewertungen": r.anzahl,
+                    "beispiel_kommentare": list(r.kommentare or [])
+                })
+                result[r.restaurantid]["customer_favorites"].append(eintrag)
+            else:
+                eintrag.update({
+                    "durchschnitt": round(float(r.durchschnitt), 2),
+                    "anzahl_bewertungen": r.anzahl
+                })
+                result[r.restaurantid]["kritiker_highlights"].append(eintrag)
 
+        return result
+
+    def get_kritiker_highlights(self, restaurant_id: int, limit: int = 5) -> List[dict]:
+        """
+        Top Gerichte mit höchsten Kritiker-Bewertungen (mind. 4 Sterne)
+        """
+        return self.get_highlights_bulk([restaurant_id], limit)[restaurant_id]["kritiker_highlights"]
 
     def get_customer_favorites(self, restaurant_id: int, limit: int = 5) -> List[dict]:
         """
         Top Gerichte mit höchsten Kunden-Bewertungen inkl. Kommentar-Samples (mind. 4 Sterne)
         """
-        # Top-Gerichte ermitteln
-        results = (
-            self.db.query(
-                Gericht.gerichtid,
-                Gericht.name,
-                Gericht.beschreibung,
-                Gericht.kategorie,
-                func.avg(Bewertung.rating).label('durchschnitt'),
-                func.count(Bewertung.bewertungid).label('anzahl')
-            )
-            .join(Menue, Gericht.menuid == Menue.menuid)
-            .join(Bewertung, Bewertung.gerichtid == Gericht.gerichtid)
-            .filter(Menue.restaurantid == restaurant_id)
-            .filter(Gericht.ist_aktiv == True)
-            .group_by(Gericht.gerichtid, Gericht.name, Gericht.beschreibung, Gericht.kategorie)
-            .having(func.avg(Bewertung.rating) >= 4.0)
-            .order_by(func.avg(Bewertung.rating).desc())
-            .limit(limit)
-            .all()
-        )
-
-        favorites = []
-        for r in results:
-            # Hole 2-3 Beispiel-Kommentare für dieses Gericht
-            kommentare = (
-                self.db.query(Bewertung.kommentar)
-                .filter(Bewertung.gerichtid == r.gerichtid)
-                .filter(Bewertung.kommentar.isnot(None))
-                .filter(Bewertung.kommentar != '')
-                .order_by(Bewertung.rating.desc())
-                .limit(3)
-                .all()
-            )
-
-            favorites.append({
-                "gerichtid": r.gerichtid,
-                "name": r.name,
-                "beschreibung": r.beschreibung,
-                "kategorie": r.kategorie,
-                "durchschnitt_kunden": round(float(r.durchschnitt), 2),
-                "anzahl_bewertungen": r.anzahl,
-                "beispiel_kommentare": [k[0] for k in kommentare]
-            })
-
-        return favorites
\ No newline at end of file
+        return self.get_highlights_bulk([restaurant_id], limit)[restaurant_id]["customer_favorites"]
@@ -1,16 +1,23 @@
 import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
 
 from models import Restaurant
 from models.bestellungen import Bestellungen
 from models.bestellposition import Bestellposition
 from models.gericht import Gericht
 from models.preis import Preis
+from services.autocomplete_service import AutocompleteService
+from services.bestellung_snapshot_service import BestellungSnapshotService
+from services.bestellung_event_service import BestellungEventService
 from typing import Optional, List, Dict
 
 class WarenkorbService:
     def __init__(self, db: Session):
         self.db = db
+        self.autocomplete_service = AutocompleteService(db)
+        self.bestellung_snapshot_service = BestellungSnapshotService(db)
 
     # ===== Get Cart (without creating) =====
     def get_cart(self, kundenid: int) -> Optional[Bestellungen]:
@@ -23,70 +30,117 @@ class WarenkorbService:
         ).first()
 
     # ===== Get or Create Cart =====
-    def get_or_create_cart(self, kundenid: int) -> Bestellungen:
+    def get_or_create_cart(self, kundenid: int, commit: bool = True, sperren: bool = False) -> Bestellungen:
         """
         Get active cart for customer, or create new one if none exists
-        """
-        # Find existing cart (status = "Warenkorb")
-        cart = self.db.query(Bestellungen).filter(
-            Bestellungen.kundenid == kundenid,
-            Bestellungen.status == "warenkorb"
-        ).first()
 
-        if not cart:
-            # Create new cart
-            cart = Bestellungen(
+        Reads with a plain SELECT on the partial unique index ux_bestellung_warenkorb_kunde
+        (migration 004); only a missing cart is inserted with ON CONFLICT DO NOTHING, so
+        concurrent requests can never create a second cart and reads never write.
+        Pass commit=False when the caller commits its own changes anyway, sperren=True
+        on write paths (SELECT ... FOR UPDATE serialises concurrent changes to one cart).
+        """
+        cart = self._cart_laden(kundenid, sperren)
+        if cart:
+            if commit:
+                self.db.commit()
+            return cart
+
+        stmt = (
+            insert(Bestellungen)
+            .values(
                 kundenid=kundenid,
                 status="warenkorb",
                 restaurantid=None,  # Will be set when first item added
                 lieferantid=None,   # Will be set later
                 adressid=None,   # Will be set at checkout
             )
-            self.db.add(cart)
+            .on_conflict_do_nothing(
+                index_elements=[Bestellungen.kundenid],
+                index_where=text("status = 'warenkorb'")
+            )
+            .returning(Bestellungen)
+        )
+        cart = self.db.scalars(stmt, execution_options={"populate_existing": True}).one_or_none()
+        if cart is None:
+            # Parallel angelegt - der andere Request hat gewonnen
+            cart = self._cart_laden(kundenid, sperren)
+
+        if commit:
             self.db.commit()
-            self.db.refresh(cart)
 
         return cart
 
+    def _cart_laden(self, kundenid: int, sperren: bool) -> Optional[Bestellungen]:
+        query = self.db.query(Bestellungen).filter(
+            Bestellungen.kundenid == kundenid,
+            Bestellungen.status == "warenkorb"
+        )
+        if sperren:
+            query = query.with_for_update()
+        return query.first()
+
     # ===== Get Cart Items =====
     def get_cart_items(self, kundenid: int) -> Dict:
         """
         Get all items in customer's cart with full details
         """
-        cart = self.get_or_create_cart(kundenid)
-        # Get all positions with gericht and preis details
-        positions = self.db.query(Bestellposition).filter(
-            Bestellposition.bestellungid == cart.bestellungid
-        ).all()
+        bestellungid = self.get_or_create_cart(kundenid, commit=False).bestellungid
+        self.db.commit()
+        return self._cart_response(bestellungid)
+
+    def _cart_response(self, bestellungid: int) -> Dict:
+        """
+        Cart with positions, dish, price and restaurant name from one joined query
+        """
+        rows = (
+            self.db.query(
+                Bestellungen.bestellungid,
+                Bestellungen.restaurantid,
+                Restaurant.name.label("restaurantname"),
+                Bestellposition.positionid,
+                Bestellposition.menge,
+                Bestellposition.aenderungswunsch,
+                Gericht.gerichtid,
+                Gericht.name,
+                Gericht.beschreibung,
+                Preis.betrag
+            )
+            .outerjoin(Restaurant, Restaurant.restaurantid == Bestellungen.restaurantid)
+            .outerjoin(Bestellposition, Bestellposition.bestellungid == Bestellungen.bestellungid)
+            .outerjoin(Gericht, Gericht.gerichtid == Bestellposition.gerichtid)
+            .outerjoin(Preis, Preis.preisid == Bestellposition.preisid)
+            .filter(Bestellungen.bestellungid == bestellungid)
+            .order_by(Bestellposition.positionid)
+            .all()
+        )
 
         items = []
         subtotal = 0.0
 
-        for position in positions:
-            gericht = position.gericht
-            preis = position.preis
+        for row in rows:
+            if row.positionid is None:
+                continue  # empty cart: single row without position
 
-            item_total = float(preis.betrag) * position.menge
+            preis = float(row.betrag or 0)
+            item_total = preis * row.menge
             subtotal += item_total
 
             items.append({
-                "positionid": position.positionid,
-                "gerichtid": gericht.gerichtid,
-                "name": gericht.name,
-                "beschreibung": gericht.beschreibung,
-                "preis": float(preis.betrag),
-                "menge": position.menge,
-                "aenderungswunsch": position.aenderungswunsch,
+                "positionid": row.positionid,
+                "gerichtid": row.gerichtid,
+                "name": row.name,
+                "beschreibung": row.beschreibung,
+                "preis": preis,
+                "menge": row.menge,
+                "aenderungswunsch": row.aenderungswunsch,
                 "item_total": item_total
             })
-        if cart.restaurantid:
-            restaurantname = self.db.query(Restaurant).filter(Restaurant.restaurantid == cart.restaurantid).first().name
-        else: restaurantname = None
 
         return {
-            "bestellungid": cart.bestellungid,
-            "restaurantid": cart.restaurantid,
-            "restaurantname": restaurantname,
+            "bestellungid": bestellungid,
+            "restaurantid": rows[0].restaurantid if rows else None,
+            "restaurantname": rows[0].restaurantname if rows else None,
             "items": items,
             "subtotal": subtotal,
             "item_count": sum(item['menge'] for item in items)
@@ -98,7 +152,7 @@ class WarenkorbService:
         """
         Add item to cart (or update quantity if already exists)
         """
-        cart = self.get_or_create_cart(kundenid)
+        cart = self.get_or_create_cart(kundenid, commit=False, sperren=True)
 
         item_count = self.db.query(Bestellposition).filter(
             Bestellposition.bestellungid == cart.bestellungid
@@ -106,7 +160,6 @@ class WarenkorbService:
 
         if item_count == 0:
             cart.restaurantid = restaurantid
-            self.db.commit()
 
         # Check if same restaurant (can't mix restaurants in one order)
         elif cart.restaurantid != restaurantid:
@@ -135,8 +188,9 @@ class WarenkorbService:
             )
             self.db.add(position)
 
+        bestellungid = cart.bestellungid
         self.db.commit()
-        return self.get_cart_items(kundenid)
+        return self._cart_response(bestellungid)
 
     # ===== Update Item Quantity =====
     def update_quantity(self, kundenid: int, positionid: int, menge: int) -> Dict:
@@ -171,8 +225,9 @@ class WarenkorbService:
             # Cart is empty - reset restaurant ID
             cart.restaurantid = None
 
+        bestellungid = cart.bestellungid
         self.db.commit()
-        return self.get_cart_items(kundenid)
+        return self._cart_response(bestellungid)
 
     # ===== Update Special Request =====
     def update_special_request(self, kundenid: int, positionid: int,
@@ -180,7 +235,9 @@ class WarenkorbService:
         """
         Update special request/notes for an item
         """
-        cart = self.get_or_create_cart(kundenid)
+        cart = self.get_cart(kundenid)
+        if not cart:
+            raise ValueError("No cart found")
 
         position = self.db.query(Bestellposition).filter(
             Bestellposition.positionid == positionid,
@@ -191,9 +248,10 @@ class WarenkorbService:
             raise ValueError("Item not found in cart")
 
         position.aenderungswunsch = aenderungswunsch
+        bestellungid = cart.bestellungid
         self.db.commit()
 
-        return self.get_cart_items(kundenid)
+        return self._cart_response(bestellungid)
 
     # ===== Remove Item =====
     def remove_item(self, kundenid: int, positionid: int) -> Dict:
@@ -225,9 +283,88 @@ class WarenkorbService:
             # Cart is empty - reset restaurant ID
             cart.restaurantid = None
 
+        bestellungid = cart.bestellungid
         self.db.commit()
 
-        return self.get_cart_items(kundenid)
+        return self._cart_response(bestellungid)
+
+    # ===== Batch Update =====
+    def apply_operations(self, kundenid: int, operationen: List[Dict]) -> Dict:
+        """
+        Apply several cart operations atomically (one transaction, one commit)
+
+        Supported ops (dicts with key "op"):
+          add      - restaurantid, gerichtid, preisid, menge, aenderungswunsch
+          quantity - positionid, menge (<= 0 removes the position)
+          notes    - positionid, aenderungswunsch
+          remove   - positionid
+        Any invalid op rolls back the whole batch (ValueError).
+        """
+        try:
+            cart = self.get_or_create_cart(kundenid, commit=False, sperren=True)
+
+            positionen = {
+                p.positionid: p for p in self.db.query(Bestellposition).filter(
+                    Bestellposition.bestellungid == cart.bestellungid
+                )
+            }
+            neue: List[Bestellposition] = []
+
+            for nr, operation in enumerate(operationen, start=1):
+                art = operation.get("op")
+                aktive = list(positionen.values()) + neue
+
+                if art == "add":
+                    if not aktive:
+                        cart.restaurantid = operation["restaurantid"]
+                    elif cart.restaurantid != operation["restaurantid"]:
+                        raise ValueError(f"Operation {nr}: Cannot add items from different restaurants to cart")
+
+                    existing = next((
+                        p for p in aktive
+                        if p.gerichtid == operation["gerichtid"] and p.preisid == operation["preisid"]
+                    ), None)
+                    if existing:
+                        existing.menge += operation.get("menge", 1)
+                        if operation.get("aenderungswunsch"):
+                            existing.aenderungswunsch = operation["aenderungswunsch"]
+                    else:
+                        position = Bestellposition(
+                            bestellungid=cart.bestellungid,
+                            gerichtid=operation["gerichtid"],
+                            preisid=operation["preisid"],
+                            menge=operation.get("menge", 1),
+                            aenderungswunsch=operation.get("aenderungswunsch")
+                        )
+                        self.db.add(position)
+                        neue.append(position)
+                    continue
+
+                position = positionen.get(operation.get("positionid"))
+                if not position:
+                    raise ValueError(f"Operation {nr}: Item not found in cart")
+
+                if art == "quantity" and operation["menge"] > 0:
+                    position.menge = operation["menge"]
+                elif art in ("quantity", "remove"):
+                    self.db.delete(position)
+                    del positionen[position.positionid]
+                elif art == "notes":
+                    position.aenderungswunsch = operation["aenderungswunsch"]
+                else:
+                    raise ValueError(f"Operation {nr}: Unknown operation '{art}'")
+
+            if not positionen and not neue:
+                # Cart is empty - reset restaurant ID
+                cart.restaurantid = None
+
+            bestellungid = cart.bestellungid
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return self._cart_response(bestellungid)
 
     # ===== Clear Cart =====
     def clear_cart(self, kundenid: int) -> Dict:
@@ -257,7 +394,9 @@ class WarenkorbService:
         """
         Convert cart to actual order
         """
-        cart = self.get_or_create_cart(kundenid)
+        cart = self.get_cart(kundenid)
+        if not cart:
+            raise ValueError("Cart is empty")
 
         # Validate cart has items
         item_count = self.db.query(Bestellposition).filter(
@@ -272,7 +411,12 @@ class WarenkorbService:
         cart.adressid = adressid
         cart.lieferantid = lieferantid
 
+        # Freeze lines, unit prices, restaurant and address in the same transaction
+        self.bestellung_snapshot_service.erstellen(cart.bestellungid)
+
         self.db.commit()
         self.db.refresh(cart)
+        self.autocomplete_service.bestellung_gezaehlt(cart.bestellungid)
+        BestellungEventService.veroeffentlichen(cart, "neu")
 
         return cart
\ No newline at end of file
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from utils.wochen_bitmap import ist_offen, slot, wochen_bitmaps, wochentag_index
+
+# 2026-10-19 ist ein Montag
+MONTAG = datetime(2026, 10, 19, 10, 0)
+DIENSTAG = datetime(2026, 10, 20, 10, 0)
+SONNTAG = datetime(2026, 10, 25, 10, 0)
+
+
+def _detail(wochentag, auf, zu, geschlossen=False):
+    return {"wochentag": wochentag, "oeffnungszeit": auf, "schliessungszeit": zu, "ist_geschlossen": geschlossen}
+
+
+def test_wochentag_1_ist_montag_7_ist_sonntag():
+    assert wochentag_index(1) == MONTAG.weekday()
+    assert wochentag_index(7) == SONNTAG.weekday()
+
+
+def test_montag_detail_gilt_am_montag():
+    haupt, _ = wochen_bitmaps([_detail(1, "09:00", "17:00")])
+    assert ist_offen(haupt, slot(MONTAG))
+    assert not ist_offen(haupt, slot(DIENSTAG))
+
+
+def test_sonntag_detail_gilt_am_sonntag():
+    haupt, _ = wochen_bitmaps([_detail(7, "09:00", "17:00")])
+    assert ist_offen(haupt, slot(SONNTAG))
+    assert not ist_offen(haupt, slot(MONTAG))
+
+
+def test_sonntag_ueber_mitternacht_ragt_in_den_montag():
+    haupt, ueberhang = wochen_bitmaps([_detail(7, "22:00", "02:00")])
+    assert ist_offen(haupt, slot(datetime(2026, 10, 25, 23, 0)))
+    assert ist_offen(ueberhang, slot(datetime(2026, 10, 26, 1, 0)))
+    assert not ist_offen(ueberhang, slot(datetime(2026, 10, 26, 2, 0)))
+
+
+def test_geschlossener_tag():
+    haupt, ueberhang = wochen_bitmaps([_detail(1, "09:00", "17:00", geschlossen=True)])
+    assert haupt == 0 and ueberhang == 0
@@ -0,0 +1,8 @@
+from typing import Optional
+
+
+def email_normalisieren(email: Optional[str]) -> Optional[str]:
+    """Kanonische Form für Speicherung und Suche: getrimmt und kleingeschrieben"""
+    if email is None:
+        return None
+    return email.strip().lower()
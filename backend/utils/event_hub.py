@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from typing import Dict, Hashable, Optional, Set
+
+
+class Abo:
+    """Ein verbundener Client: eigene Queue im Event-Loop des Streams"""
+
+    def __init__(self, schluessel: Hashable, loop: asyncio.AbstractEventLoop, queue_groesse: int):
+        self.schluessel = schluessel
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_groesse)
+        self.ueberlaufen = False
+
+    def _zustellen(self, event: Optional[dict]):
+        """Läuft im Event-Loop des Abos. None = Stream beenden (Client zu langsam)"""
+        if self.ueberlaufen:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client hinkt hinterher: Stream schließen, er setzt per Cursor wieder auf
+            self.ueberlaufen = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventHub:
+    """
+    In-Process Fan-Out: Events pro Schlüssel (z.B. Restaurant) an alle Abonnenten.
+    publish() ist thread-sicher und darf aus synchronen Endpoints (Threadpool) kommen.
+    Kein Puffer: wer nach einem Abbruch fortsetzen will, holt Verpasstes aus der DB.
+    """
+
+    def __init__(self, queue_groesse: int = 100):
+        self._lock = threading.Lock()
+        self._queue_groesse = queue_groesse
+        self._abos: Dict[Hashable, Set[Abo]] = {}
+        self._letzte_id = 0
+
+    def publish(self, schluessel: Hashable, daten: dict, event_id: Optional[int] = None) -> int:
+        """Event verteilen; ohne event_id wird fortlaufend nummeriert"""
+        with self._lock:
+            if event_id is None:
+                event_id = self._letzte_id + 1
+            self._letzte_id = max(self._letzte_id, event_id)
+            event = {"id": event_id, **daten}
+
+            for abo in self._abos.get(schluessel, ()):
+                abo.loop.call_soon_threadsafe(abo._zustellen, event)
+        return event_id
+
+    def subscribe(self, schluessel: Hashable) -> Abo:
+        """Abo anlegen (im laufenden Event-Loop aufrufen)"""
+        abo = Abo(schluessel, asyncio.get_running_loop(), self._queue_groesse)
+        with self._lock:
+            self._abos.setdefault(schluessel, set()).add(abo)
+        return abo
+
+    def unsubscribe(self, abo: Abo):
+        with self._lock:
+            abos = self._abos.get(abo.schluessel)
+            if abos is not None:
+                abos.discard(abo)
+                if not abos:
+                    del self._abos[abo.schluessel]
+
+    def anzahl_abos(self) -> int:
+        with self._lock:
+            return sum(len(abos) for abos in self._abos.values())
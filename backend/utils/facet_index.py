@@ -0,0 +1,159 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+UND = "und"
+ODER = "oder"
+
+
+def _positionen(bitmap: int, offset: int, limit: int) -> List[int]:
+    """Positionen der gesetzten Bits in aufsteigender Reihenfolge (nur die angefragte Seite)"""
+    ergebnis = []
+    index = 0
+    while bitmap and len(ergebnis) < limit:
+        niedrigstes = bitmap & -bitmap
+        if index >= offset:
+            ergebnis.append(niedrigstes.bit_length() - 1)
+        bitmap ^= niedrigstes
+        index += 1
+    return ergebnis
+
+
+class FacetIndex:
+    """
+    Facetten-Index mit einer Bitmap pro Facettenwert (Python-int als Bitset).
+    Jedes Dokument bekommt eine feste Bit-Position; Filter sind AND/OR auf den
+    Bitmaps, Zählungen sind Popcounts - unabhängig von der Anzahl der Filter.
+    """
+
+    def __init__(self, facetten: Iterable[str]):
+        self._facetten = tuple(facetten)
+        self._lock = threading.RLock()
+        self._leeren()
+
+    def _leeren(self):
+        self._position: Dict[int, int] = {}
+        self._ids: List[Optional[int]] = []
+        self._payloads: List[Optional[dict]] = []
+        self._werte: List[Optional[Dict[str, set]]] = []
+        self._bitmaps: Dict[str, Dict[Hashable, int]] = {f: defaultdict(int) for f in self._facetten}
+        self._alle = 0
+
+    def __len__(self) -> int:
+        return len(self._position)
+
+    # ===== PFLEGE =====
+
+    def replace_all(self, docs: Iterable[Tuple[int, dict, Dict[str, Iterable[Hashable]]]]):
+        """Neuaufbau aus (doc_id, payload, {facette: werte}); wird atomar getauscht"""
+        neu = FacetIndex(self._facetten)
+        for doc_id, payload, werte in docs:
+            neu._upsert_locked(doc_id, payload, werte)
+
+        with self._lock:
+            self._position = neu._position
+            self._ids = neu._ids
+            self._payloads = neu._payloads
+            self._werte = neu._werte
+            self._bitmaps = neu._bitmaps
+            self._alle = neu._alle
+
+    def upsert(self, doc_id: int, payload: dict, werte: Dict[str, Iterable[Hashable]]):
+        with self._lock:
+            self._upsert_locked(doc_id, payload, werte)
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            pos = self._position.pop(doc_id, None)
+            if pos is None:
+                return
+            self._bits_loeschen(pos)
+            self._ids[pos] = None
+            self._payloads[pos] = None
+            self._werte[pos] = None
+
+    def _upsert_locked(self, doc_id: int, payload: dict, werte: Dict[str, Iterable[Hashable]]):
+        pos = self._position.get(doc_id)
+        if pos is None:
+            pos = len(self._ids)
+            self._position[doc_id] = pos
+            self._ids.append(doc_id)
+            self._payloads.append(None)
+            self._werte.append(None)
+        else:
+            self._bits_loeschen(pos)
+
+        bit = 1 << pos
+        normiert = {f: set(werte.get(f) or ()) for f in self._facetten}
+        for facette, facettenwerte in normiert.items():
+            for wert in facettenwerte:
+                self._bitmaps[facette][wert] |= bit
+        self._payloads[pos] = payload
+        self._werte[pos] = normiert
+        self._alle |= bit
+
+    def _bits_loeschen(self, pos: int):
+        bit = 1 << pos
+        for facette, facettenwerte in (self._werte[pos] or {}).items():
+            for wert in facettenwerte:
+                bitmap = self._bitmaps[facette][wert] & ~bit
+                if bitmap:
+                    self._bitmaps[facette][wert] = bitmap
+                else:
+                    del self._bitmaps[facette][wert]
+        self._alle &= ~bit
+
+    # ===== ABFRAGE =====
+
+    def _facetten_maske(self, facette: str, werte: Iterable[Hashable], modus: str) -> int:
+        bitmaps = self._bitmaps[facette]
+        if modus == UND:
+            maske = self._alle
+            for wert in werte:
+                maske &= bitmaps.get(wert, 0)
+            return maske
+        maske = 0
+        for wert in werte:
+            maske |= bitmaps.get(wert, 0)
+        return maske
+
+    def query(
+            self,
+            auswahl: Dict[str, Tuple[Iterable[Hashable], str]],
+            limit: int = 20,
+            offset: int = 0
+    ) -> Tuple[int, List[dict], Dict[str, Dict[Hashable, int]]]:
+        """
+        auswahl: {facette: (werte, "und"|"oder")} - leere Werte = keine Einschränkung.
+        Zwischen Facetten gilt AND. Die Zählung einer ODER-Facette ignoriert ihre eigene
+        Auswahl (sonst würden die Alternativen auf 0 fallen), UND-Facetten zählen innerhalb
+        des aktuellen Ergebnisses.
+        Returns: (Gesamtanzahl, Payloads der Seite, {facette: {wert: anzahl}})
+        """
+        with self._lock:
+            masken = {}
+            for facette, (werte, modus) in auswahl.items():
+                werte = list(werte or ())
+                if werte:
+                    masken[facette] = (self._facetten_maske(facette, werte, modus), modus)
+
+            ergebnis = self._alle
+            for maske, _ in masken.values():
+                ergebnis &= maske
+
+            zaehlungen = {}
+            for facette in self._facetten:
+                basis = ergebnis
+                if facette in masken and masken[facette][1] != UND:
+                    basis = self._alle
+                    for andere, (maske, _) in masken.items():
+                        if andere != facette:
+                            basis &= maske
+                zaehlungen[facette] = {
+                    wert: anzahl
+                    for wert, bitmap in self._bitmaps[facette].items()
+                    if (anzahl := (bitmap & basis).bit_count())
+                }
+
+            items = [self._payloads[pos] for pos in _positionen(ergebnis, offset, limit)]
+            return ergebnis.bit_count(), items, zaehlungen
@@ -0,0 +1,21 @@
+import base64
+import json
+
+
+def encode_cursor(data: dict) -> str:
+    """Kodiert Keyset-Werte als opaken, URL-sicheren Cursor"""
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Dekodiert einen Cursor aus encode_cursor, ValueError bei ungültigem Cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Ungültiger Cursor")
+
+    if not isinstance(data, dict):
+        raise ValueError("Ungültiger Cursor")
+    return data
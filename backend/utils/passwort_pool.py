@@ -0,0 +1,131 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional
+
+from passlib.context import CryptContext
+
+# Im Worker-Prozess angelegt; dieses Modul importiert bewusst nichts aus dem Backend,
+# damit "spawn"-Worker schlank starten
+_pwd_context: Optional[CryptContext] = None
+
+
+def _context() -> CryptContext:
+    global _pwd_context
+    if _pwd_context is None:
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+
+def _hash(password: str) -> str:
+    return _context().hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return _context().verify(password, password_hash)
+
+
+class PasswortPoolUeberlastet(Exception):
+    """Warteschlange voll oder Zeitlimit überschritten"""
+
+
+class PasswortPool:
+    """
+    Eigener, begrenzter Prozess-Pool für bcrypt. Hashen/Prüfen belegt so keine
+    CPU im Webserver-Prozess, und mehr als groesse + queue_groesse Auth-Requests
+    warten nie gleichzeitig - der Rest wird nach queue_timeout abgewiesen, statt
+    den Request-Threadpool für andere Endpoints zu blockieren.
+    """
+
+    def __init__(self, groesse: int, queue_groesse: int, queue_timeout: float, timeout: float):
+        self.groesse = groesse
+        self.queue_groesse = queue_groesse
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self._plaetze = threading.BoundedSemaphore(groesse + queue_groesse)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._aktiv = 0
+        self._erledigt = 0
+        self._abgewiesen = 0
+        self._timeouts = 0
+        self._dauer_summe = 0.0
+        self._dauer_max = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn statt fork: der Webserver-Prozess hat Threads und offene DB-Verbindungen
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.groesse,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _ausfuehren(self, funktion, *args):
+        if not self._plaetze.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._abgewiesen += 1
+            raise PasswortPoolUeberlastet("Passwort-Pool ausgelastet")
+
+        start = time.perf_counter()
+        with self._lock:
+            self._aktiv += 1
+        try:
+            future = self._pool().submit(funktion, *args)
+        except BaseException:
+            self._platz_freigeben()
+            raise
+        # Platz erst freigeben, wenn der Worker wirklich fertig ist: cancel() stoppt keinen
+        # laufenden Task, sonst stauten sich nach Timeouts Aufträge in der Executor-Queue
+        future.add_done_callback(lambda _: self._platz_freigeben())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise PasswortPoolUeberlastet("Zeitlimit beim Passwort-Hashing überschritten")
+        finally:
+            dauer = time.perf_counter() - start
+            with self._lock:
+                self._erledigt += 1
+                self._dauer_summe += dauer
+                self._dauer_max = max(self._dauer_max, dauer)
+
+    def _platz_freigeben(self):
+        with self._lock:
+            self._aktiv -= 1
+        self._plaetze.release()
+
+    def hash(self, password: str) -> str:
+        return self._ausfuehren(_hash, password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._ausfuehren(_verify, password, password_hash)
+
+    def metriken(self) -> dict:
+        """
+        Auslastung: aktiv = belegte Plätze (laufend + wartend, inkl. nach Timeout noch
+        laufender Aufträge); auslastung > 1 heißt, es wird gewartet
+        """
+        with self._lock:
+            return {
+                "groesse": self.groesse,
+                "queue_groesse": self.queue_groesse,
+                "aktiv": self._aktiv,
+                "wartend": max(0, self._aktiv - self.groesse),
+                "auslastung": round(self._aktiv / self.groesse, 2),
+                "erledigt": self._erledigt,
+                "abgewiesen": self._abgewiesen,
+                "timeouts": self._timeouts,
+                "dauer_avg_ms": round(1000 * self._dauer_summe / self._erledigt, 1) if self._erledigt else 0.0,
+                "dauer_max_ms": round(1000 * self._dauer_max, 1)
+            }
+
+    def beenden(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
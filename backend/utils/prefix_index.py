@@ -0,0 +1,125 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.search_index import normalize, tokenize
+
+# Sehr kurze Prefixe ("p", "pi") treffen große Teile des Index: deren Rangliste wird
+# einmal über alle Treffer gebildet und zwischengespeichert. Text-Änderungen verwerfen
+# den Cache, Popularitäts-Änderungen nicht - die Rangliste veraltet nur mit dem Alter
+KURZ_PREFIX = 2
+KURZ_VORRAT = 25  # gespeicherte Länge der Rangliste (= max. limit der API)
+KURZ_MAX_ALTER = 30.0  # Sekunden
+
+
+class PrefixIndex:
+    """
+    Typeahead-Index als sortiertes Array aus (schlüssel, typ, id) mit Binärsuche.
+    Jeder Eintrag ist unter dem ganzen Text und unter jedem Wort auffindbar,
+    Vorschläge werden nach Popularität sortiert.
+    """
+
+    def __init__(self, kurz_max_alter: float = KURZ_MAX_ALTER):
+        self._lock = threading.RLock()
+        self._kurz_max_alter = kurz_max_alter
+        self._keys: List[Tuple[str, str, int]] = []
+        self._eintraege: Dict[Tuple[str, int], dict] = {}
+        # (prefix, typen) -> (erstellt, [(typ, id)] nach Popularität), nur für kurze Prefixe
+        self._kurz: Dict[Tuple[str, Optional[frozenset]], Tuple[float, List[Tuple[str, int]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._eintraege)
+
+    @staticmethod
+    def _schluessel(text: str) -> set:
+        schluessel = {normalize(text).strip()}
+        schluessel.update(token for token in tokenize(text) if len(token) >= 2)
+        schluessel.discard("")
+        return schluessel
+
+    # ===== PFLEGE =====
+
+    def replace_all(self, eintraege: Iterable[dict]):
+        """Neuaufbau aus Dicts mit mind. typ, id, text, popularitaet"""
+        keys = []
+        neue_eintraege = {}
+        for eintrag in eintraege:
+            schluessel = (eintrag["typ"], eintrag["id"])
+            neue_eintraege[schluessel] = dict(eintrag)
+            keys.extend((key, *schluessel) for key in self._schluessel(eintrag["text"]))
+        keys.sort()
+
+        with self._lock:
+            self._keys = keys
+            self._eintraege = neue_eintraege
+            self._kurz = {}
+
+    def upsert(self, eintrag: dict):
+        with self._lock:
+            alt = self._eintraege.get((eintrag["typ"], eintrag["id"]))
+            if alt and "popularitaet" not in eintrag:
+                eintrag = {**eintrag, "popularitaet": alt["popularitaet"]}
+            self._remove_locked(eintrag["typ"], eintrag["id"])
+            self._kurz.clear()
+            self._eintraege[(eintrag["typ"], eintrag["id"])] = dict(eintrag)
+            for key in self._schluessel(eintrag["text"]):
+                insort(self._keys, (key, eintrag["typ"], eintrag["id"]))
+
+    def remove(self, typ: str, id: int):
+        with self._lock:
+            self._remove_locked(typ, id)
+            self._kurz.clear()
+
+    def _remove_locked(self, typ: str, id: int):
+        alt = self._eintraege.pop((typ, id), None)
+        if not alt:
+            return
+        for key in self._schluessel(alt["text"]):
+            pos = bisect_left(self._keys, (key, typ, id))
+            if pos < len(self._keys) and self._keys[pos] == (key, typ, id):
+                del self._keys[pos]
+
+    def add_popularitaet(self, typ: str, id: int, delta: int):
+        with self._lock:
+            eintrag = self._eintraege.get((typ, id))
+            if eintrag:
+                eintrag["popularitaet"] = eintrag.get("popularitaet", 0) + delta
+
+    # ===== ABFRAGE =====
+
+    def top_k(self, prefix: str, k: int = 8, typen: Optional[Iterable[str]] = None) -> List[dict]:
+        prefix = normalize(prefix).strip()
+        if not prefix:
+            return []
+        typen = set(typen) if typen else None
+
+        kurz = len(prefix) <= KURZ_PREFIX and k <= KURZ_VORRAT
+        cache_schluessel = (prefix, frozenset(typen) if typen else None)
+
+        with self._lock:
+            if kurz:
+                gespeichert = self._kurz.get(cache_schluessel)
+                if gespeichert and time.monotonic() - gespeichert[0] <= self._kurz_max_alter:
+                    return [dict(self._eintraege[s]) for s in gespeichert[1][:k]]
+
+            # Alle Treffer des Prefix-Bereichs, erst danach nach Popularität ranken -
+            # ein Abschneiden in alphabetischer Reihenfolge verlöre beliebte Einträge
+            start = bisect_left(self._keys, (prefix,))
+            gesehen = set()
+            for pos in range(start, len(self._keys)):
+                key, typ, id = self._keys[pos]
+                if not key.startswith(prefix):
+                    break
+                if typen is None or typ in typen:
+                    gesehen.add((typ, id))
+
+            treffer = [self._eintraege[schluessel] for schluessel in gesehen]
+            beste = heapq.nsmallest(
+                KURZ_VORRAT if kurz else k, treffer,
+                key=lambda e: (-e.get("popularitaet", 0), len(e["text"]), e["text"], e["typ"], e["id"])
+            )
+            if kurz:
+                self._kurz[cache_schluessel] = (time.monotonic(), [(e["typ"], e["id"]) for e in beste])
+            return [dict(e) for e in beste[:k]]
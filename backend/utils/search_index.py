@@ -0,0 +1,181 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict, Counter
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+PREFIX_FAKTOR = 0.8      # "pizz" -> "pizza"
+FUZZY_FAKTOR = 0.6       # "piza" -> "pizza" (multipliziert mit Trigramm-Ähnlichkeit)
+FUZZY_MIN_AEHNLICHKEIT = 0.4
+MAX_ERWEITERUNGEN = 50   # max. Tokens pro Prefix-/Fuzzy-Erweiterung
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text or "").casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def trigrams(token: str) -> set:
+    """Trigramme wie pg_trgm: zwei Leerzeichen vorne, eins hinten"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class InvertedIndex:
+    """
+    Thread-sicherer In-Memory-Index: Token -> {doc_id: Gewicht} plus Trigramm -> Tokens
+    für Tippfehler-Toleranz. Dokumente bestehen aus gewichteten Textfeldern und einem
+    beliebigen Payload-Dict, das bei Treffern zurückgegeben wird.
+    """
+
+    def __init__(self, field_weights: Dict[str, float]):
+        self._weights = field_weights
+        self._lock = threading.RLock()
+        self._docs: Dict[int, dict] = {}
+        self._doc_tokens: Dict[int, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._trigrams: Dict[str, set] = defaultdict(set)
+        self._sorted_tokens: List[str] = []
+        self._sorted_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ===== PFLEGE =====
+
+    def replace_all(self, docs: Iterable[Tuple[int, dict, dict]]):
+        """Kompletter Neuaufbau aus (doc_id, felder, payload); wird atomar getauscht"""
+        neu = InvertedIndex(self._weights)
+        for doc_id, fields, payload in docs:
+            neu._upsert_locked(doc_id, fields, payload)
+        neu._sorted_tokens = sorted(neu._postings)
+
+        with self._lock:
+            self._docs = neu._docs
+            self._doc_tokens = neu._doc_tokens
+            self._postings = neu._postings
+            self._trigrams = neu._trigrams
+            self._sorted_tokens = neu._sorted_tokens
+            self._sorted_dirty = False
+
+    def upsert(self, doc_id: int, fields: dict, payload: dict):
+        with self._lock:
+            self._remove_locked(doc_id)
+            self._upsert_locked(doc_id, fields, payload)
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _upsert_locked(self, doc_id: int, fields: dict, payload: dict):
+        token_gewichte: Dict[str, float] = {}
+        for feld, gewicht in self._weights.items():
+            for token in set(tokenize(fields.get(feld))):
+                token_gewichte[token] = token_gewichte.get(token, 0.0) + gewicht
+
+        self._docs[doc_id] = payload
+        self._doc_tokens[doc_id] = token_gewichte
+        for token, gewicht in token_gewichte.items():
+            if token not in self._postings:
+                for tri in trigrams(token):
+                    self._trigrams[tri].add(token)
+                self._sorted_dirty = True
+            self._postings[token][doc_id] = gewicht
+
+    def _remove_locked(self, doc_id: int):
+        token_gewichte = self._doc_tokens.pop(doc_id, None)
+        self._docs.pop(doc_id, None)
+        if not token_gewichte:
+            return
+
+        for token in token_gewichte:
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self._postings[token]
+                for tri in trigrams(token):
+                    tokens = self._trigrams.get(tri)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._trigrams[tri]
+                self._sorted_dirty = True
+
+    # ===== SUCHE =====
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[dict]]:
+        """
+        Alle Query-Tokens müssen (exakt, als Prefix oder unscharf) treffen.
+        Sortierung nach Score absteigend, dann doc_id - stabil für Pagination.
+        Returns: (Gesamtanzahl Treffer, Payloads der Seite inkl. 'score')
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return 0, []
+
+        with self._lock:
+            if self._sorted_dirty:
+                self._sorted_tokens = sorted(self._postings)
+                self._sorted_dirty = False
+
+            scores: Dict[int, float] = {}
+            for i, q in enumerate(query_tokens):
+                token_scores = self._match_token(q)
+                if i == 0:
+                    scores = token_scores
+                else:
+                    scores = {
+                        doc_id: score + token_scores[doc_id]
+                        for doc_id, score in scores.items()
+                        if doc_id in token_scores
+                    }
+                if not scores:
+                    return 0, []
+
+            ranking = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            seite = ranking[offset:offset + limit]
+            return len(ranking), [
+                {**self._docs[doc_id], "score": round(score, 3)} for doc_id, score in seite
+            ]
+
+    def _match_token(self, q: str) -> Dict[int, float]:
+        """Bester Match-Score pro Dokument für ein Query-Token"""
+        kandidaten: Dict[str, float] = {}
+
+        if q in self._postings:
+            kandidaten[q] = 1.0
+
+        if len(q) >= 2:
+            start = bisect_left(self._sorted_tokens, q)
+            for token in self._sorted_tokens[start:start + MAX_ERWEITERUNGEN]:
+                if not token.startswith(q):
+                    break
+                kandidaten.setdefault(token, PREFIX_FAKTOR)
+
+        if len(q) >= 3:
+            q_tri = trigrams(q)
+            gemeinsam = Counter()
+            for tri in q_tri:
+                gemeinsam.update(self._trigrams.get(tri, ()))
+            for token, anzahl in gemeinsam.most_common(MAX_ERWEITERUNGEN):
+                aehnlichkeit = anzahl / (len(q_tri) + len(trigrams(token)) - anzahl)
+                if aehnlichkeit >= FUZZY_MIN_AEHNLICHKEIT:
+                    score = FUZZY_FAKTOR * aehnlichkeit
+                    if score > kandidaten.get(token, 0.0):
+                        kandidaten[token] = score
+
+        treffer: Dict[int, float] = {}
+        for token, faktor in kandidaten.items():
+            for doc_id, gewicht in self._postings[token].items():
+                score = gewicht * faktor
+                if score > treffer.get(doc_id, 0.0):
+                    treffer[doc_id] = score
+        return treffer
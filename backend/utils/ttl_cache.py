@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-sicherer LRU-Cache mit Ablaufzeit pro Eintrag.
+    Beim Überschreiten von max_eintraege fliegt der am längsten nicht genutzte Eintrag.
+    """
+
+    def __init__(self, max_eintraege: int, ttl: float):
+        self.max_eintraege = max_eintraege
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._daten: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, schluessel: Hashable) -> Optional[Any]:
+        with self._lock:
+            eintrag = self._daten.get(schluessel)
+            if eintrag is None:
+                self.misses += 1
+                return None
+            wert, ablauf = eintrag
+            if ablauf <= time.monotonic():
+                del self._daten[schluessel]
+                self.misses += 1
+                return None
+            self._daten.move_to_end(schluessel)
+            self.hits += 1
+            return wert
+
+    def set(self, schluessel: Hashable, wert: Any, ttl: Optional[float] = None):
+        """ttl überschreibt die Standard-Lebensdauer (z.B. Restlaufzeit eines Tokens)"""
+        ablauf = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._daten[schluessel] = (wert, ablauf)
+            self._daten.move_to_end(schluessel)
+            while len(self._daten) > self.max_eintraege:
+                self._daten.popitem(last=False)
+
+    def delete(self, schluessel: Hashable):
+        with self._lock:
+            self._daten.pop(schluessel, None)
+
+    def clear(self):
+        with self._lock:
+            self._daten.clear()
+
+    def __len__(self) -> int:
+        return len(self._daten)
+
+    def metriken(self) -> dict:
+        with self._lock:
+            anfragen = self.hits + self.misses
+            return {
+                "eintraege": len(self._daten),
+                "max_eintraege": self.max_eintraege,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / anfragen, 3) if anfragen else 0.0
+            }
@@ -0,0 +1,88 @@
+from datetime import datetime, time
+from typing import Iterable, Optional, Tuple, Union
+
+# Eine Woche in 5-Minuten-Slots, Montag 00:00 = Bit 0. Intern zählen Tage wie datetime.weekday()
+# (0=Montag); OeffnungszeitDetail.wochentag ist 1=Montag ... 7=Sonntag (siehe wochentag_index)
+SLOT_MINUTEN = 5
+SLOTS_PRO_TAG = 24 * 60 // SLOT_MINUTEN
+SLOTS_PRO_WOCHE = 7 * SLOTS_PRO_TAG
+_TAG = (1 << SLOTS_PRO_TAG) - 1
+
+
+def wochentag_index(wochentag: int) -> int:
+    """OeffnungszeitDetail.wochentag (1=Montag ... 7=Sonntag) -> datetime.weekday() (0=Montag)"""
+    return (wochentag - 1) % 7
+
+
+def _minuten(wert: Union[time, str, None]) -> Optional[int]:
+    if wert is None:
+        return None
+    if isinstance(wert, str):
+        stunden, minuten = wert[:5].split(":")
+        return int(stunden) * 60 + int(minuten)
+    return wert.hour * 60 + wert.minute
+
+
+def _bereich(start: int, ende: int) -> int:
+    """Bits [start, ende) mit Umlauf über Sonntag -> Montag"""
+    if ende <= SLOTS_PRO_WOCHE:
+        return ((1 << (ende - start)) - 1) << start
+    return _bereich(start, SLOTS_PRO_WOCHE) | _bereich(0, ende - SLOTS_PRO_WOCHE)
+
+
+def wochen_bitmaps(details: Iterable) -> Tuple[int, int]:
+    """
+    Öffnungszeit-Details (Objekte oder Dicts mit wochentag, oeffnungszeit,
+    schliessungszeit, ist_geschlossen) als Bitmaps über die Woche.
+    Schließzeit <= Öffnungszeit heißt über Mitternacht in den Folgetag
+    (22:00-02:00, 18:00-00:00). Angebrochene Slots zählen als geöffnet.
+
+    Returns: (haupt, ueberhang) - haupt enthält die Slots am eigenen Wochentag,
+    ueberhang die nach Mitternacht in den Folgetag ragenden Slots. Getrennt, weil
+    der Überhang zur Vorlage des Vortags gehört, wenn die Vorlage am Folgetag wechselt.
+    """
+    haupt = ueberhang = 0
+    for detail in details:
+        get = detail.get if isinstance(detail, dict) else lambda feld: getattr(detail, feld)
+        if get("ist_geschlossen") or get("wochentag") is None:
+            continue
+        auf, zu = _minuten(get("oeffnungszeit")), _minuten(get("schliessungszeit"))
+        if auf is None or zu is None:
+            continue
+        if zu <= auf:
+            zu += 24 * 60
+
+        basis = wochentag_index(get("wochentag")) * SLOTS_PRO_TAG
+        start = basis + auf // SLOT_MINUTEN
+        ende = basis + -(-zu // SLOT_MINUTEN)
+        tagesende = basis + SLOTS_PRO_TAG
+        haupt |= _bereich(start, min(ende, tagesende))
+        if ende > tagesende:
+            ueberhang |= _bereich(tagesende, ende)
+    return haupt, ueberhang
+
+
+def tages_maske(wochentag: int) -> int:
+    """Alle Slots eines Wochentags"""
+    return _TAG << (wochentag * SLOTS_PRO_TAG)
+
+
+def tages_bits(bitmap: int, wochentag: int) -> int:
+    """Slots eines Wochentags aus der Wochen-Bitmap, Bit 0 = 00:00"""
+    return (bitmap >> (wochentag * SLOTS_PRO_TAG)) & _TAG
+
+
+def naechster_slot(bits: int, ab: int, wert: bool) -> Optional[int]:
+    """Erster Slot >= ab innerhalb eines Tages, dessen Bit 'wert' hat (None: keiner mehr)"""
+    rest = (bits if wert else ~bits & _TAG) >> ab
+    if not rest:
+        return None
+    return ab + (rest & -rest).bit_length() - 1
+
+
+def slot(zeitpunkt: datetime) -> int:
+    return zeitpunkt.weekday() * SLOTS_PRO_TAG + (zeitpunkt.hour * 60 + zeitpunkt.minute) // SLOT_MINUTEN
+
+
+def ist_offen(bitmap: int, slot_nr: int) -> bool:
+    return (bitmap >> slot_nr) & 1 == 1
@@ -2,7 +2,6 @@ import React, {useEffect, useState} from 'react';
 import styled from 'styled-components';
 import colors from '../theme/colors';
 import bestellungService from '../services/bestellungService';
-import restaurantService from '../services/restaurantService';
 import { useAuth } from '../context/AuthContext';
 
 
@@ -137,6 +136,8 @@ const InfoValue = styled.div` font-size: 1.1rem; font-weight: 500; color: ${colo
 const TotalPrice = styled.div` background: ${colors.gradients.accent}; color: white; padding: 15px; border-radius: 10px; text-align: center; font-size: 1.4rem; font-weight: bold; margin-top: 20px; `;
 const EmptyState = styled.div` text-align: center; padding: 50px; color: ${colors.text.light}; `;
 
+const ABGESCHLOSSEN = ['zugestellt', 'storniert'];
+
 // --- HAUPTKOMPONENTE ---
 function Bestellhistorie() {
     const [bestellungen, setBestellungen] = useState([]);
@@ -144,6 +145,7 @@ function Bestellhistorie() {
     const [loading, setLoading] = useState(false);
     const [selectedBestellung, setSelectedBestellung] = useState(null);
     const [modalLoading, setModalLoading] = useState(false);
+    const [nextCursor, setNextCursor] = useState(null);
     const { user } = useAuth();
     const kundenId = user?.user_id;
 
@@ -163,6 +165,18 @@ function Bestellhistorie() {
         }
     }, []);
 
+    const ladeSeite = async (cursor = null) => {
+        const seite = await bestellungService.getHistorie(kundenId, {
+            cursor,
+            status: ABGESCHLOSSEN
+        });
+        const eintraege = seite.items
+            .filter(b => b.restaurantid != null)
+            .map(b => ({ ...b, restaurantName: b.restaurantname || 'Restaurant' }));
+        setNextCursor(seite.has_more ? seite.next_cursor : null);
+        return eintraege;
+    };
+
     const handleSearch = async () => {
         if (!kundenId) {
             setStatusMsg('Bitte geben Sie eine Kunden-ID ein.');
@@ -173,60 +187,29 @@ function Bestellhistorie() {
         setStatusMsg('Lade Historie...');
 
         try {
-            const data = await bestellungService.getByKunde(kundenId);
-            const relevante = data.filter(b => (b.status === 'zugestellt' || b.status === 'storniert') &&
-                b.restaurantid != null);
-
-            if (relevante.length === 0) {
+            // Restaurantname und Gesamtpreis kommen direkt mit - keine Abfrage pro Bestellung
+            const eintraege = await ladeSeite();
+            if (eintraege.length === 0) {
                 setStatusMsg('Keine abgeschlossenen Bestellungen gefunden.');
-                setBestellungen([]);
-                return;
             }
-
-            const restaurantIds = [...new Set(relevante.map(b => b.restaurantid))];
-            const nameMap = {};
-
-            await Promise.all(restaurantIds.map(async (id) => {
-                try {
-                    const res = await restaurantService.getById(id);
-                    nameMap[id] = res?.data?.name || res?.name || 'Restaurant';
-                } catch { nameMap[id] = 'Restaurant'; }
-            }));
-
-            // Hole auch die Details für jede Bestellung, um den Gesamtpreis zu bekommen
-            const bestellungenMitDetails = await Promise.all(relevante.map(async (b) => {
-                try {
-                    const details = await bestellungService.getDetails(b.bestellungid);
-
-                    // Berechne Gesamtpreis aus Positionen, falls nicht vorhanden
-                    let gesamtpreis = details.gesamtpreis || b.gesamtpreis;
-                    if (!gesamtpreis && details.positionen && details.positionen.length > 0) {
-                        gesamtpreis = details.positionen.reduce((sum, pos) => {
-                            return sum + (pos.zwischensumme || 0);
-                        }, 0);
-                    }
-
-                    return {
-                        ...b,
-                        restaurantName: nameMap[b.restaurantid],
-                        gesamtpreis: gesamtpreis
-                    };
-                } catch (err) {
-                    console.error(`Fehler bei Bestellung ${b.bestellungid}:`, err);
-                    return {
-                        ...b,
-                        restaurantName: nameMap[b.restaurantid]
-                    };
-                }
-            }));
-
-            setBestellungen(bestellungenMitDetails);
+            setBestellungen(eintraege);
         } catch (err) {
             console.error(err);
             setStatusMsg('Fehler beim Abrufen der Daten.');
         } finally { setLoading(false); }
     };
 
+    const handleMehrLaden = async () => {
+        if (!nextCursor) return;
+        setLoading(true);
+        try {
+            const eintraege = await ladeSeite(nextCursor);
+            setBestellungen(prev => [...prev, ...eintraege]);
+        } catch (err) {
+            console.error(err);
+        } finally { setLoading(false); }
+    };
+
     const handleOrderClick = async (bestellung) => {
         // Behalte die ursprünglichen Daten
         const originalData = {
@@ -285,6 +268,13 @@ function Bestellhistorie() {
                             </OrderHeader>
                         </OrderCard>
                     ))}
+                    {nextCursor && (
+                        <div style={{ textAlign: 'center', marginTop: '10px' }}>
+                            <Button onClick={handleMehrLaden} disabled={loading}>
+                                {loading ? 'Lade...' : 'Ältere Bestellungen laden'}
+                            </Button>
+                        </div>
+                    )}
                 </>
             ) : (
                 <EmptyState>{statusMsg}</EmptyState>
@@ -0,0 +1,18 @@
+// services/autocompleteService.js
+import apiClient from '../api/apiClient';
+
+const autocompleteService = {
+    /**
+     * Prefix-Vorschläge für die Suchleiste (nach Beliebtheit sortiert)
+     * GET /autocomplete?q=...&limit=...&typ=gericht&typ=restaurant
+     * typen: optional ['gericht', 'restaurant', 'kochstil', 'label']
+     */
+    suggest: async (query, limit = 8, typen = []) => {
+        return await apiClient.get('/api/autocomplete/', {
+            params: { q: query, limit, typ: typen },
+            paramsSerializer: { indexes: null }
+        });
+    },
+};
+
+export default autocompleteService;
@@ -25,10 +25,43 @@ const bestellungService = {
     return await apiClient.get(`/api/bestellungen/${bestellungId}/total`);
   },
 
+  /**
+   * Gesamtpreise mehrerer Bestellungen auf einmal -> { bestellungid: summe }
+   * GET /api/bestellungen/totals?ids=1&ids=2
+   */
+  getTotals: async (bestellungIds) => {
+    return await apiClient.get('/api/bestellungen/totals', {
+      params: { ids: bestellungIds },
+      paramsSerializer: { indexes: null }
+    });
+  },
+
+  /**
+   * Details mehrerer Bestellungen auf einmal
+   * GET /api/bestellungen/details?ids=1&ids=2
+   */
+  getDetailsBulk: async (bestellungIds) => {
+    return await apiClient.get('/api/bestellungen/details', {
+      params: { ids: bestellungIds },
+      paramsSerializer: { indexes: null }
+    });
+  },
+
   getByKunde: async (kundeId) => {
       return await apiClient.get(`/api/bestellungen/kunde/${kundeId}`);
   },
 
+  /**
+   * Bestellhistorie seitenweise (neueste zuerst) inkl. Restaurantname und Gesamtpreis
+   * GET /api/bestellungen/kunde/{id}/historie?limit=&cursor=&status=
+   */
+  getHistorie: async (kundeId, { limit = 20, cursor = null, status = [] } = {}) => {
+      return await apiClient.get(`/api/bestellungen/kunde/${kundeId}/historie`, {
+          params: { limit, cursor: cursor || undefined, status },
+          paramsSerializer: { indexes: null }
+      });
+  },
+
   // NEU: Hole Details für eine Bestellung
     getDetails: async (bestellungId) => {
         try {
@@ -51,6 +84,33 @@ const bestellungService = {
         }
     },
 
+  /**
+   * Änderungen seit einem Cursor (change_seq), aufsteigend
+   * GET /api/bestellungen/restaurant/{id}/aenderungen?seit=...
+   * Gibt { items, cursor, has_more } zurück.
+   */
+  getAenderungen: async (restaurantId, { seit = 0, status = [], limit = 100 } = {}) => {
+      return await apiClient.get(`/api/bestellungen/restaurant/${restaurantId}/aenderungen`, {
+          params: { seit, status, limit },
+          paramsSerializer: { indexes: null }
+      });
+  },
+
+  /**
+   * Live-Updates der Bestellungen eines Restaurants (Server-Sent Events)
+   * GET /api/bestellungen/restaurant/{id}/stream
+   * onEvent(event) für 'neu'/'geaendert', onReset() wenn die Liste neu geladen werden muss.
+   * Gibt eine Funktion zum Beenden zurück.
+   */
+  subscribeRestaurant: (restaurantId, onEvent, onReset = () => {}) => {
+      const source = new EventSource(
+          `${apiClient.defaults.baseURL}/api/bestellungen/restaurant/${restaurantId}/stream`
+      );
+      source.addEventListener('bestellung', (e) => onEvent(JSON.parse(e.data)));
+      source.addEventListener('reset', () => onReset());
+      return () => source.close();
+  },
+
   /**
    * Neue Warenkorb erstellen
    * POST /api/bestellungen
@@ -19,8 +19,9 @@ const bewertungkritikerService = {
   },
 
   /**
-   * Neue Kritiker-Bewertung erstellen
+   * Neue Kritiker-Bewertung erstellen (nur mit Kritiker-Login)
    * POST /api/bewertungkritikers
+   * { gerichtid, rating } - die kritikerid kommt aus dem Token
    */
   create: async (bewertungkritikerData) => {
     return await apiClient.post('/api/bewertungkritikers', bewertungkritikerData);
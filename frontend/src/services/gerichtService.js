@@ -57,6 +57,18 @@ const gerichtService = {
     searchGerichte: async (query) => {
         return await apiClient.get(`/api/gericht/search?q=${encodeURIComponent(query)}`);
     },
+
+    /**
+     * Gerichte kombiniert filtern, inkl. Trefferzahlen pro Facettenwert
+     * GET /gericht/facetten?label=1&label=2&kategorie=Pizza&kochstil=3&preis=8_12
+     * filter: { label: [], label_modus: 'und'|'oder', kategorie: [], kochstil: [], preis: [], limit, offset }
+     */
+    getFacetten: async (filter = {}) => {
+        return await apiClient.get('/api/gericht/facetten', {
+            params: filter,
+            paramsSerializer: { indexes: null }
+        });
+    },
 };
 
 export default gerichtService;
\ No newline at end of file
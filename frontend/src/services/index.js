@@ -3,6 +3,7 @@
 // Ermöglicht einfacheren Import: import { restaurantService, kundeService } from './services'
 
 export { default as adresseService } from './adresseService';
+export { default as autocompleteService } from './autocompleteService';
 export { default as bestellungService } from './bestellungService';
 export { default as bestellpositionService } from './bestellpositionService';
 export { default as bewertungService } from './bewertungService';
@@ -10,6 +10,15 @@ const restaurantService = {
         return await apiClient.get('/api/restaurants');
     },
 
+    /**
+     * Eine Seite der Restaurant-Liste mit Filtern abrufen
+     * GET /api/restaurants/seite?limit=&cursor=&sortierung=&kochstil=&postleitzahl=&ort=&min_bewertung=&klassifizierung=
+     * Antwort: { items, next_cursor, has_more } - next_cursor als cursor für die nächste Seite übergeben
+     */
+    getPage: async (params = {}) => {
+        return await apiClient.get('/api/restaurants/seite', { params, paramsSerializer: { indexes: null } });
+    },
+
     /**
      * Ein Restaurant nach ID abrufen (mit Menü und Adresse)
      * GET /api/restaurants/{id}
@@ -100,6 +109,29 @@ const restaurantService = {
     getCustomerFavorites: async (restaurantId) => {
         return await apiClient.get(`/api/restaurants/${restaurantId}/customer-favorites`);
     },
+
+    /**
+     * Kritiker-Highlights und Customer-Favorites für mehrere Restaurants (Listen-Karten)
+     * GET /api/restaurants/highlights?ids=1&ids=2&limit=3
+     */
+    getHighlightsBulk: async (restaurantIds, limit = 3) => {
+        return await apiClient.get('/api/restaurants/highlights', {
+            params: { ids: restaurantIds, limit },
+            paramsSerializer: { indexes: null },
+        });
+    },
+
+    /**
+     * Offen/zu und nächste Öffnung/Schließung für mehrere Restaurants (Listen-Karten)
+     * GET /api/restaurants/oeffnungsstatus?ids=1&ids=2
+     * Antwort: { [restaurantid]: { ist_offen, naechste_oeffnung, naechste_schliessung } }
+     */
+    getOeffnungsstatusBulk: async (restaurantIds) => {
+        return await apiClient.get('/api/restaurants/oeffnungsstatus', {
+            params: { ids: restaurantIds },
+            paramsSerializer: { indexes: null },
+        });
+    },
 };
 
 export default restaurantService;
\ No newline at end of file
@@ -1,6 +1,9 @@
 // services/warenkorbService.js
 import apiClient from '../api/apiClient';
 
+const idempotencyHeaders = (idempotencyKey) =>
+    idempotencyKey ? { headers: { 'Idempotency-Key': idempotencyKey } } : undefined;
+
 export const warenkorbService = {
     // Get cart
     getCart: async (kundenid) => {
@@ -10,9 +13,9 @@ export const warenkorbService = {
         return response;
     },
 
-    // Add item
-    addItem: async (kundenid, item) => {
-        const response = await apiClient.post(`/api/warenkorb/${kundenid}/items`, item);
+    // Add item - pass the same idempotencyKey when retrying, the server then returns the first result
+    addItem: async (kundenid, item, idempotencyKey = null) => {
+        const response = await apiClient.post(`/api/warenkorb/${kundenid}/items`, item, idempotencyHeaders(idempotencyKey));
         return response;
     },
 
@@ -40,15 +43,30 @@ export const warenkorbService = {
         return response;
     },
 
+    // Apply several changes at once, e.g.
+    // [{ op: 'quantity', positionid: 1, menge: 2 }, { op: 'remove', positionid: 3 }]
+    applyBatch: async (kundenid, operationen, idempotencyKey = null) => {
+        const response = await apiClient.post(
+            `/api/warenkorb/${kundenid}/items/batch`,
+            { operationen },
+            idempotencyHeaders(idempotencyKey)
+        );
+        return response;
+    },
+
     // Clear cart
     clearCart: async (kundenid) => {
         const response = await apiClient.delete(`/api/warenkorb/${kundenid}/clear`);
         return response;
     },
 
-    // Checkout
-    checkout: async (kundenid, checkoutData) => {
-        const response = await apiClient.post(`/api/warenkorb/${kundenid}/checkout`, checkoutData);
+    // Checkout - one key per checkout attempt, reused for retries
+    checkout: async (kundenid, checkoutData, idempotencyKey = null) => {
+        const response = await apiClient.post(
+            `/api/warenkorb/${kundenid}/checkout`,
+            checkoutData,
+            idempotencyHeaders(idempotencyKey)
+        );
         return response;
     }
 };
\ No newline at end of file